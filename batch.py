@@ -0,0 +1,251 @@
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import main
+from exporters import DEFAULT_CSV_CHUNK_ROWS, EXPORT_FORMATS
+from fetcher import DEFAULT_MAX_WORKERS, configure_shared_client
+from http_client import DEFAULT_BURST, DEFAULT_REQUESTS_PER_SECOND
+from records import compute_season_records, format_record
+from response_cache import ResponseCache
+from rolling_stats import DEFAULT_EWMA_ALPHA, DEFAULT_WINDOWS, compute_season_rolling_stats
+from score_store import ScoreStore
+
+REPORT_COLUMNS = ['League', 'Season', 'Rank', 'Team_Name', 'Owner_Name', 'Total_Points', 'Average_Points',
+                  'Weeks_Played', 'Rolling_Average', 'Record', 'All_Play_Record']
+
+def load_manifest(manifest_path):
+    """Load a batch manifest and resolve every league to its own league_ids map.
+
+    A manifest looks like league_data.json with a 'leagues' list instead of a
+    single 'league_ids' map. Each league entry has a 'name' and either inline
+    'league_ids' or a 'config' path to a league_data.json-style file. Every
+    league also gets a unique 'slug' for its output files, so leagues whose
+    names match (or match once sanitized) don't overwrite each other.
+    """
+    manifest = main.load_json(manifest_path)
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+
+    leagues = []
+    slugs = set()
+    for index, entry in enumerate(manifest.get('leagues', [])):
+        league = dict(entry)
+        if 'config' in league:
+            config = main.load_json(os.path.join(manifest_dir, league['config']))
+            league.setdefault('league_ids', config.get('league_ids', {}))
+        league.setdefault('name', f"league_{index + 1}")
+        league['slug'] = _unique_slug(_safe_name(league['name']), slugs)
+        leagues.append(league)
+
+    return {
+        'api': manifest.get('api', {}),
+        'settings': manifest.get('settings', {}),
+        'leagues': leagues
+    }
+
+def _safe_name(name):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('_') or 'league'
+
+def _unique_slug(slug, taken):
+    # Compared case-insensitively since output may land on a case-insensitive filesystem
+    candidate, suffix = slug, 1
+    while candidate.lower() in taken:
+        suffix += 1
+        candidate = f"{slug}_{suffix}"
+    taken.add(candidate.lower())
+    return candidate
+
+def split_rate_limit(settings, processes):
+    """Settings whose HTTP rate limit and burst are each process's share of the configured ones.
+
+    Every worker process runs its own token bucket, so without splitting
+    N workers together would send N times the requests Sleeper allows.
+    """
+    http_settings = dict(settings.get('http', {}))
+    processes = max(1, processes)
+    http_settings['requests_per_second'] = (http_settings.get('requests_per_second', DEFAULT_REQUESTS_PER_SECOND)
+                                            / processes)
+    http_settings['burst'] = max(1, http_settings.get('burst', DEFAULT_BURST) // processes)
+    return {**settings, 'http': http_settings}
+
+def analyze_league(league, api, settings, formats=(), output_dir='.'):
+    """Run fetch, summarize, rolling stats and export for one league; returns report rows"""
+    base_url = api.get('base_url', main.DEFAULT_BASE_URL)
+    max_workers = settings.get('max_concurrent_requests', DEFAULT_MAX_WORKERS)
+    # Every worker points at the same on-disk cache directory
+    cache = ResponseCache.from_config(settings)
+    configure_shared_client(settings, max_workers)
+
+    store = ScoreStore()
+    all_season_data = main.fetch_all_season_data(league['league_ids'], base_url, max_workers, cache, store)
+    if not all_season_data:
+        raise RuntimeError("No data could be fetched from any season")
+
+    rolling_settings = settings.get('rolling', {})
+    windows = tuple(rolling_settings.get('windows', DEFAULT_WINDOWS))
+    rolling_by_season = compute_season_rolling_stats(
+        all_season_data, windows, rolling_settings.get('ewma_alpha', DEFAULT_EWMA_ALPHA)
+    )
+    records_by_season = compute_season_records(all_season_data)
+
+    rows = []
+    for season_data in all_season_data:
+        year = season_data['year']
+        team_stats = main.calculate_season_summary(season_data['weekly_scores'])
+        rolling_data = rolling_by_season[year]
+        sorted_teams = sorted(team_stats.items(), key=lambda x: x[1]['total_points'], reverse=True)
+
+        for rank, (roster_id, stats) in enumerate(sorted_teams, 1):
+            rolling_averages = rolling_data.get(roster_id, {}).get('rolling_averages', {})
+            latest = rolling_averages[max(rolling_averages)]['average'] if rolling_averages else 0
+            record = records_by_season[year].get(roster_id, {})
+            rows.append({
+                'League': league['name'],
+                'Season': year,
+                'Rank': rank,
+                'Team_Name': stats['team_name'],
+                'Owner_Name': stats['owner_name'],
+                'Total_Points': round(stats['total_points'], 2),
+                'Average_Points': round(stats['average_points'], 2),
+                'Weeks_Played': stats['weeks_played'],
+                'Rolling_Average': round(latest, 2),
+                'Record': format_record(record.get('wins', 0), record.get('losses', 0), record.get('ties', 0)),
+                'All_Play_Record': format_record(record.get('all_play_wins', 0), record.get('all_play_losses', 0),
+                                                 record.get('all_play_ties', 0))
+            })
+
+    exported_files = {}
+    if formats:
+        basename = os.path.join(output_dir, f"{league.get('slug') or _safe_name(league['name'])}_scores")
+        export_settings = settings.get('export', {})
+        exported_files = main.export_multi_year(
+            store, rolling_by_season, windows, formats,
+            export_settings.get('csv_chunk_rows', DEFAULT_CSV_CHUNK_ROWS), basename, records_by_season
+        )
+
+    return {
+        'seasons': [season_data['year'] for season_data in all_season_data],
+        'records': len(store),
+        'rows': rows,
+        'exported_files': exported_files
+    }
+
+def run_league(league, api, settings, formats=(), output_dir='.', quiet=True):
+    """Process-pool entry point: never raises, so one bad league can't abort the batch"""
+    start = time.perf_counter()
+    result = {'name': league['name'], 'slug': league.get('slug'), 'ok': False}
+    try:
+        output = io.StringIO() if quiet else sys.stdout
+        with contextlib.redirect_stdout(output):
+            result.update(analyze_league(league, api, settings, formats, output_dir))
+        result['ok'] = True
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+def run_batch(manifest, workers=None, formats=(), output_dir='.'):
+    """Run every league in the manifest across a process pool, reporting progress as they finish"""
+    leagues = manifest['leagues']
+    os.makedirs(output_dir, exist_ok=True)
+    results = []
+
+    processes = max(1, min(workers or os.cpu_count(), len(leagues)))
+    # The workers share one request rate between them
+    settings = split_rate_limit(manifest['settings'], processes)
+
+    print(f"🏈 Running {len(leagues)} leagues across {processes} processes...")
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = {
+            executor.submit(run_league, league, manifest['api'], settings, formats, output_dir): league
+            for league in leagues
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            league = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died (e.g. killed); record it and carry on
+                result = {'name': league['name'], 'slug': league.get('slug'), 'ok': False,
+                          'error': f"{type(e).__name__}: {e}", 'seconds': 0}
+            results.append(result)
+
+            if result['ok']:
+                print(f"   [{done}/{len(leagues)}] ✅ {result['name']}: {len(result['seasons'])} seasons, "
+                      f"{result['records']} records ({result['seconds']:.1f}s)")
+            else:
+                print(f"   [{done}/{len(leagues)}] ❌ {result['name']}: {result['error']}")
+
+    # Keep the report in manifest order regardless of completion order
+    order = {league.get('slug'): i for i, league in enumerate(leagues)}
+    results.sort(key=lambda result: order.get(result['slug'], len(order)))
+    return results
+
+def write_batch_report(results, output_dir='.'):
+    """Merge every league's standings into one cross-league CSV plus a JSON run summary"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    csv_path = os.path.join(output_dir, f"batch_report_{timestamp}.csv")
+    json_path = os.path.join(output_dir, f"batch_report_{timestamp}.json")
+
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)
+        writer.writeheader()
+        for result in results:
+            writer.writerows(result.get('rows', []))
+
+    summary = {
+        'leagues': len(results),
+        'succeeded': sum(1 for result in results if result['ok']),
+        'failed': [{'name': result['name'], 'error': result['error']} for result in results if not result['ok']],
+        'exported_files': {result.get('slug') or result['name']: result['exported_files']
+                           for result in results if result['ok']}
+    }
+    with open(json_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    return csv_path, json_path
+
+def display_cross_league_leaders(results, top=10):
+    """Print the best single-season averages across every league"""
+    rows = [row for result in results if result['ok'] for row in result['rows']]
+    rows.sort(key=lambda row: row['Average_Points'], reverse=True)
+
+    print("\n" + "="*80)
+    print("CROSS-LEAGUE LEADERS (by average points per season)")
+    print("="*80)
+    print(f"{'Rank':<4} {'League':<20} {'Season':<6} {'Team':<25} {'Avg':<6}")
+    print("-" * 70)
+    for i, row in enumerate(rows[:top], 1):
+        print(f"{i:<4} {row['League'][:19]:<20} {row['Season']:<6} {row['Team_Name'][:24]:<25} "
+              f"{row['Average_Points']:<6.1f}")
+
+def main_batch(argv=None):
+    parser = argparse.ArgumentParser(description="Run the analyzer for every league in a manifest")
+    parser.add_argument('manifest', help="JSON manifest with a 'leagues' list")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--format', dest='formats', action='append', choices=EXPORT_FORMATS,
+                        help="per-league export format (repeat for several; default: no per-league export)")
+    parser.add_argument('--output-dir', default='batch_output')
+    args = parser.parse_args(argv)
+
+    manifest = load_manifest(args.manifest)
+    results = run_batch(manifest, args.workers, tuple(args.formats or ()), args.output_dir)
+    display_cross_league_leaders(results)
+
+    csv_path, json_path = write_batch_report(results, args.output_dir)
+    failed = sum(1 for result in results if not result['ok'])
+    print(f"\n📁 Cross-league report: {csv_path}")
+    print(f"📁 Run summary: {json_path}")
+    print(f"✅ {len(results) - failed} leagues succeeded, ❌ {failed} failed")
+    return results
+
+if __name__ == "__main__":
+    main_batch()
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LEAGUE_PATH = re.compile(r'^/v1/league/(\d+)/(rosters|users|matchups|transactions)(?:/(\d+))?$')
+
+class FakeSleeperServer(ThreadingHTTPServer):
+    """Local stand-in for api.sleeper.app serving a synthetic league.
+
+    latency (seconds, +/- jitter) is added to every request and error_rate
+    is the fraction of requests answered with a 500 (or 429 when
+    throttle_rate hits). Responses carry ETags and honour If-None-Match.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, league, host='127.0.0.1', port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, throttle_rate=0.0, nfl_state=None, seed=None):
+        super().__init__((host, port), FakeSleeperHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.request_count = 0
+        self.bytes_sent = 0
+
+        last_year = max(int(year) for year in league['league_ids']) if league['league_ids'] else 0
+        self.nfl_state = nfl_state or {'season': str(last_year + 1), 'week': 1}
+        self.payloads = {'/v1/state/nfl': self._encode(self.nfl_state)}
+        if 'players' in league:
+            self.payloads['/v1/players/nfl'] = self._encode(league['players'])
+        for league_id, season in league['seasons'].items():
+            base = f'/v1/league/{league_id}'
+            if 'league' in season:
+                self.payloads[base] = self._encode(season['league'])
+            self.payloads[f'{base}/rosters'] = self._encode(season['rosters'])
+            self.payloads[f'{base}/users'] = self._encode(season['users'])
+            for week, matchups in season['matchups'].items():
+                self.payloads[f'{base}/matchups/{week}'] = self._encode(matchups)
+            for week, transactions in season.get('transactions', {}).items():
+                self.payloads[f'{base}/transactions/{week}'] = self._encode(transactions)
+
+    @staticmethod
+    def _encode(data):
+        body = json.dumps(data).encode('utf-8')
+        return body, f'"{hashlib.md5(body).hexdigest()}"'
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/v1'
+
+    def roll(self):
+        with self.rng_lock:
+            self.request_count += 1
+            delay = max(self.latency + self.rng.uniform(-self.jitter, self.jitter), 0.0)
+            outcome = self.rng.random()
+        return delay, outcome
+
+class FakeSleeperHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b'', etag=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+            self.server.bytes_sent += len(body)
+
+    def do_GET(self):
+        server = self.server
+        delay, outcome = server.roll()
+        if delay:
+            time.sleep(delay)
+
+        if outcome < server.throttle_rate:
+            return self._send(429, b'{"error": "rate limited"}')
+        if outcome < server.throttle_rate + server.error_rate:
+            return self._send(500, b'{"error": "injected failure"}')
+
+        payload = server.payloads.get(self.path)
+        if payload is None:
+            match = LEAGUE_PATH.match(self.path)
+            # Sleeper answers unknown weeks with an empty list
+            if match and match.group(3):
+                return self._send(200, b'[]')
+            return self._send(404, b'null')
+
+        body, etag = payload
+        if self.headers.get('If-None-Match') == etag:
+            return self._send(304, etag=etag)
+        self._send(200, body, etag)
+
+def start_server(league, **kwargs):
+    """Start a FakeSleeperServer on a background thread; returns the server (use .base_url, .shutdown())"""
+    server = FakeSleeperServer(league, **kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
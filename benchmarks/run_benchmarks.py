@@ -0,0 +1,182 @@
+"""Time each stage of the analysis pipeline against a synthetic league.
+
+Usage: python benchmarks/run_benchmarks.py --teams 12 --weeks 17 --seasons 10 --latency 0.02
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from exporters import export_column_names, export_seasons, season_export_columns
+from fetcher import create_session, fetch_seasons
+from http_client import HttpClient, TokenBucket
+from records import compute_records
+from rolling_stats import DEFAULT_WINDOWS
+from score_store import ScoreStore
+
+from fake_sleeper_server import start_server
+from synthetic_league import generate_league, record_count
+
+def run_stage(results, name, records, func, track_memory=True):
+    """Run func once, recording wall time, throughput and peak traced memory"""
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    value = func()
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if track_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    results.append({
+        'stage': name,
+        'seconds': elapsed,
+        'records': records,
+        'records_per_second': records / elapsed if elapsed > 0 else float('inf'),
+        'peak_memory_mb': peak / (1024 * 1024)
+    })
+    return value
+
+def run_benchmarks(args):
+    league = generate_league(args.teams, args.weeks, args.seasons, args.players, args.seed)
+    records = record_count(league)
+    server = start_server(league, latency=args.latency, jitter=args.jitter,
+                          error_rate=args.error_rate, seed=args.seed)
+    base_url = server.base_url
+    results = []
+    track = not args.no_memory
+
+    try:
+        seasons = [(int(year), league_id, args.weeks) for year, league_id in sorted(league['league_ids'].items())]
+        rate_limiter = TokenBucket(args.rate, args.rate) if args.rate else None
+        client = HttpClient(create_session(args.workers), max_retries=args.retries,
+                            backoff_base=0.05, rate_limiter=rate_limiter)
+        raw = run_stage(results, 'fetch', records,
+                        lambda: fetch_seasons(seasons, base_url, args.workers, client), track)
+    finally:
+        server.shutdown()
+
+    def organize():
+        season_data = []
+        for year, _, weeks in seasons:
+            team_mapping = main.get_team_names_mapping(raw[year]['users'], raw[year]['rosters'])
+            season_data.append({
+                'year': year,
+                'weekly_scores': main.organize_weekly_scores(raw[year]['matchups'], team_mapping),
+                'team_mapping': team_mapping,
+                'weeks_fetched': weeks
+            })
+        return season_data
+
+    def build_store():
+        store = ScoreStore()
+        for year, _, _ in seasons:
+            team_mapping = main.get_team_names_mapping(raw[year]['users'], raw[year]['rosters'])
+            store.add_season(year, raw[year]['matchups'], team_mapping)
+        return store
+
+    season_data = run_stage(results, 'organize_weekly_scores', records, organize, track)
+    store = run_stage(results, 'score_store', records, build_store, track)
+
+    rolling = run_stage(results, 'calculate_rolling_averages', records, lambda: {
+        season['year']: main.calculate_rolling_averages(season['weekly_scores']) for season in season_data
+    }, track)
+    run_stage(results, 'rolling_stats_store', records, lambda: {
+        year: main.calculate_rolling_averages(store.season_view(year)) for year in store.seasons()
+    }, track)
+    run_stage(results, 'season_summary', records, lambda: [
+        main.calculate_season_summary(store.season_view(year)) for year in store.seasons()
+    ], track)
+    run_stage(results, 'records', records, lambda: {
+        year: compute_records(store.season_view(year)) for year in store.seasons()
+    }, track)
+    run_stage(results, 'combine_multi_year_data', records,
+              lambda: main.combine_multi_year_data(season_data), track)
+
+    column_names = export_column_names(DEFAULT_WINDOWS)
+    with tempfile.TemporaryDirectory() as out_dir:
+        def export(export_format):
+            tables = {
+                str(year): season_export_columns(year, store.season_view(year), rolling[year], DEFAULT_WINDOWS)
+                for year in store.seasons()
+            }
+            return export_seasons(tables, column_names, (export_format,),
+                                  basename=os.path.join(out_dir, 'bench'))
+
+        for export_format in args.formats:
+            run_stage(results, f'export_{export_format}', records, lambda: export(export_format), track)
+
+    return {
+        'config': vars(args),
+        'records': records,
+        'missing_weeks': sum(len(season['missing_weeks']) for season in raw.values()),
+        'retries': client.retries,
+        'requests': server.request_count,
+        'bytes_served': server.bytes_sent,
+        'stages': results
+    }
+
+def print_report(report):
+    print(f"📊 {report['records']} team-week records, {report['requests']} requests "
+          f"({report['retries']} retries, {report['missing_weeks']} missing weeks), "
+          f"{report['bytes_served'] / (1024 * 1024):.1f} MB served")
+    print(f"{'Stage':<28} {'Seconds':>9} {'Records/s':>12} {'Peak MB':>9}")
+    print("-" * 62)
+    for stage in report['stages']:
+        print(f"{stage['stage']:<28} {stage['seconds']:>9.3f} {stage['records_per_second']:>12.0f} "
+              f"{stage['peak_memory_mb']:>9.1f}")
+
+def compare_to_baseline(report, baseline_path, tolerance):
+    """Return the stages that got slower than the baseline by more than tolerance"""
+    with open(baseline_path, 'r') as f:
+        baseline = {stage['stage']: stage for stage in json.load(f)['stages']}
+    regressions = []
+    for stage in report['stages']:
+        previous = baseline.get(stage['stage'])
+        if previous and stage['seconds'] > previous['seconds'] * (1 + tolerance):
+            regressions.append((stage['stage'], previous['seconds'], stage['seconds']))
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--weeks', type=int, default=17)
+    parser.add_argument('--seasons', type=int, default=3)
+    parser.add_argument('--players', type=int, default=15, help="players per roster")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=0, help="client requests per second (0 = unlimited)")
+    parser.add_argument('--retries', type=int, default=4)
+    parser.add_argument('--formats', nargs='+', default=['xlsx', 'csv'])
+    parser.add_argument('--no-memory', action='store_true', help="skip tracemalloc (faster, no peak memory)")
+    parser.add_argument('--output', help="write the report as JSON")
+    parser.add_argument('--baseline', help="JSON report to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="allowed slowdown vs baseline")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = run_benchmarks(args)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        regressions = compare_to_baseline(report, args.baseline, args.tolerance)
+        for stage, before, after in regressions:
+            print(f"❌ {stage}: {before:.3f}s -> {after:.3f}s")
+        if regressions:
+            sys.exit(1)
+        print("✅ No regressions against baseline")
@@ -0,0 +1,164 @@
+import random
+
+FIRST_SEASON = 2020
+STARTING_SLOTS = ['QB', 'RB', 'RB', 'WR', 'WR', 'TE', 'FLEX', 'K', 'DEF']
+POSITIONS = ['QB', 'RB', 'RB', 'WR', 'WR', 'WR', 'TE', 'K', 'DEF']
+TEAMS = ['ARI', 'ATL', 'BAL', 'BUF', 'CHI', 'DAL', 'DET', 'GB', 'KC', 'LAR', 'MIA', 'NYJ', 'PHI', 'SF', None]
+
+def _player_ids(rng, count, used):
+    ids = []
+    while len(ids) < count:
+        player_id = str(rng.randint(1000, 99999))
+        if player_id not in used:
+            used.add(player_id)
+            ids.append(player_id)
+    return ids
+
+def generate_season(league_id, num_teams=12, num_weeks=17, players_per_roster=15,
+                    starters_per_roster=9, seed=None, owners=None, user_prefix=None):
+    """Generate one season shaped like Sleeper's /rosters, /users and /matchups/{week} payloads.
+
+    owners lists the owner number for each roster in order (default: roster i
+    belongs to owner i). User IDs ('<user_prefix><owner>', prefix defaulting to
+    the league ID) and names follow the owner, not the roster.
+    """
+    rng = random.Random(seed)
+    used_ids = set()
+    users = []
+    rosters = []
+    roster_players = {}
+
+    owners = owners or list(range(1, num_teams + 1))
+    user_prefix = league_id if user_prefix is None else user_prefix
+    for roster_id in range(1, num_teams + 1):
+        owner = owners[roster_id - 1]
+        user_id = f"{user_prefix}{owner:03d}"
+        users.append({
+            'user_id': user_id,
+            'username': f'user{owner}',
+            'display_name': f'Owner {owner}',
+            'metadata': {'team_name': f'Synthetic Team {owner}'}
+        })
+        players = _player_ids(rng, players_per_roster, used_ids)
+        roster_players[roster_id] = players
+        rosters.append({
+            'roster_id': roster_id,
+            'owner_id': user_id,
+            'players': players,
+            'starters': players[:starters_per_roster]
+        })
+
+    matchups = {}
+    for week in range(1, num_weeks + 1):
+        order = list(range(1, num_teams + 1))
+        rng.shuffle(order)
+        matchup_of = {roster_id: i // 2 + 1 for i, roster_id in enumerate(order)}
+
+        week_matchups = []
+        for roster_id in range(1, num_teams + 1):
+            players = roster_players[roster_id]
+            starters = rng.sample(players, min(starters_per_roster, len(players)))
+            players_points = {player_id: round(max(rng.gauss(9, 6), 0), 2) for player_id in players}
+            starters_points = [players_points[player_id] for player_id in starters]
+            week_matchups.append({
+                'roster_id': roster_id,
+                'matchup_id': matchup_of[roster_id],
+                'points': round(sum(starters_points), 2),
+                'starters': starters,
+                'starters_points': starters_points,
+                'players': players,
+                'players_points': players_points
+            })
+        matchups[week] = week_matchups
+
+    transactions = generate_transactions(league_id, rosters, num_weeks, used_ids, seed)
+    slots = (STARTING_SLOTS * (starters_per_roster // len(STARTING_SLOTS) + 1))[:starters_per_roster]
+    league = {
+        'league_id': league_id,
+        'name': f'Synthetic League {league_id}',
+        'total_rosters': num_teams,
+        'roster_positions': slots + ['BN'] * max(players_per_roster - starters_per_roster, 0)
+    }
+    return {'league': league, 'rosters': rosters, 'users': users, 'matchups': matchups,
+            'transactions': transactions}
+
+def generate_transactions(league_id, rosters, num_weeks, used_ids, seed=None):
+    """/transactions/{week}-shaped waiver, free agent and trade moves (lineups are not changed)"""
+    # Separate stream so adding transactions didn't change the generated scores
+    rng = random.Random(f"{seed}-transactions")
+    roster_ids = [roster['roster_id'] for roster in rosters]
+    players = {roster['roster_id']: roster['players'] for roster in rosters}
+    transactions = {}
+    for week in range(1, num_weeks + 1):
+        week_transactions = []
+        for n in range(rng.randint(0, len(roster_ids))):
+            roster_id = rng.choice(roster_ids)
+            kind = rng.choice(['waiver', 'waiver', 'free_agent', 'trade'])
+            transaction = {
+                'transaction_id': f"{league_id}{week:02d}{n:03d}",
+                'type': kind,
+                'status': 'failed' if kind == 'waiver' and rng.random() < 0.2 else 'complete',
+                'leg': week,
+                'created': 1600000000000 + week * 604800000 + n * 1000,
+                'roster_ids': [roster_id],
+                'settings': {'waiver_bid': rng.randint(0, 40)} if kind == 'waiver' else None,
+                'draft_picks': [],
+                'waiver_budget': []
+            }
+            if kind == 'trade':
+                partner = rng.choice([other for other in roster_ids if other != roster_id])
+                give, get = rng.choice(players[roster_id]), rng.choice(players[partner])
+                transaction['roster_ids'] = [roster_id, partner]
+                transaction['adds'] = {get: roster_id, give: partner}
+                transaction['drops'] = {give: roster_id, get: partner}
+            else:
+                transaction['adds'] = {_player_ids(rng, 1, used_ids)[0]: roster_id}
+                transaction['drops'] = {rng.choice(players[roster_id]): roster_id}
+            week_transactions.append(transaction)
+        transactions[week] = week_transactions
+    return transactions
+
+def generate_league(num_teams=12, num_weeks=17, num_seasons=3, players_per_roster=15, seed=0):
+    """Generate a multi-season league chain.
+
+    Returns {'league_ids': {year: league_id}, 'seasons': {league_id: season}}
+    where league_ids has the same shape as league_data.json.
+    """
+    league_ids = {}
+    seasons = {}
+    # Owners keep their Sleeper user ID across seasons but not their roster ID
+    user_prefix = str(800000000000000000 + seed * 1000)
+    for offset in range(num_seasons):
+        year = FIRST_SEASON + offset
+        league_id = str(900000000000000000 + seed * 1000 + offset)
+        league_ids[str(year)] = league_id
+        owners = [(roster_id + 3 * offset) % num_teams + 1 for roster_id in range(num_teams)]
+        seasons[league_id] = generate_season(
+            league_id, num_teams, num_weeks, players_per_roster, seed=seed * 1000 + offset,
+            owners=owners, user_prefix=user_prefix
+        )
+    return {'league_ids': league_ids, 'seasons': seasons, 'players': generate_players(seasons, seed)}
+
+def generate_players(seasons, seed=0):
+    """A /players/nfl-shaped dump covering every player rostered in the generated seasons"""
+    rng = random.Random(seed)
+    player_ids = sorted({player_id for season in seasons.values() for roster in season['rosters']
+                         for player_id in roster['players']})
+    players = {}
+    for player_id in player_ids:
+        position = rng.choice(POSITIONS)
+        players[player_id] = {
+            'player_id': player_id,
+            'first_name': f'First{player_id}',
+            'last_name': f'Last{player_id}',
+            'full_name': None if position == 'DEF' else f'First{player_id} Last{player_id}',
+            'position': position,
+            'fantasy_positions': [position],
+            'team': rng.choice(TEAMS),
+            'status': 'Active'
+        }
+    return players
+
+def record_count(league):
+    """Number of team-week records in a generated league"""
+    return sum(len(week) for season in league['seasons'].values() for week in season['matchups'].values())
@@ -0,0 +1,172 @@
+"""Command-line entry point: python cli.py <command> [options]
+
+Only the standard library is imported up front. Each command imports
+what it needs when it runs, so database-backed commands (summary,
+rolling) never load requests or numpy, and openpyxl/pyarrow are only
+loaded by the export formats that use them.
+"""
+import argparse
+import json
+import sys
+
+DEFAULT_CONFIG = 'league_data.json'
+EXPORT_FORMATS = ('xlsx', 'parquet', 'csv')  # exporters.EXPORT_FORMATS, without importing numpy
+# Packages behind the optional extras; a failed import of anything else is a real bug
+OPTIONAL_MODULES = ('openpyxl', 'pyarrow')
+
+def load_config(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _open_database(config, must_exist=True):
+    import db_store
+
+    path = config.get('settings', {}).get('database', {}).get('path', db_store.DEFAULT_DB_PATH)
+    conn = db_store.connect(path)
+    if must_exist and not db_store.seasons(conn):
+        raise SystemExit(f"❌ No seasons in {path} yet - run `python cli.py fetch` first")
+    return conn
+
+def _season_or_latest(conn, season):
+    import db_store
+
+    return season if season is not None else db_store.seasons(conn)[-1]
+
+def cmd_analyze(config, args):
+    import main
+
+    profile = args.profile
+    if profile == '' or (profile is None and args.cprofile):
+        profile = main.default_profile_name()
+    main.main(args.formats, profile, args.cprofile, args.config)
+
+def cmd_fetch(config, args):
+    import db_store
+    import main
+    from fetcher import DEFAULT_MAX_WORKERS, configure_shared_client
+    from response_cache import ResponseCache
+
+    settings = config.get('settings', {})
+    max_workers = settings.get('max_concurrent_requests', DEFAULT_MAX_WORKERS)
+    configure_shared_client(settings, max_workers)
+    conn = _open_database(config, must_exist=False)
+    base_url = config.get('api', {}).get('base_url', main.DEFAULT_BASE_URL)
+    cache = ResponseCache.from_config(settings)
+    all_season_data = main.fetch_all_season_data(config.get('league_ids', {}), base_url, max_workers, cache, db=conn)
+    if settings.get('transactions', {}).get('enabled', True):
+        main.sync_season_transactions(conn, config.get('league_ids', {}), all_season_data, base_url, max_workers,
+                                      cache)
+    print(f"\n✅ {len(all_season_data)} seasons stored; stored seasons: "
+          f"{', '.join(str(season) for season in db_store.seasons(conn))}")
+
+def cmd_summary(config, args):
+    import db_store
+
+    conn = _open_database(config)
+    season = _season_or_latest(conn, args.season)
+    print(f"--- {season} SEASON ---")
+    db_store.display_summary(conn, season, config.get('league_ids', {}).get(str(season)))
+
+def cmd_rolling(config, args):
+    import db_store
+
+    conn = _open_database(config)
+    season = _season_or_latest(conn, args.season)
+    windows = tuple(config.get('settings', {}).get('rolling', {}).get('windows', (3, 5)))
+    print(f"📈 {season} rolling averages:")
+    db_store.display_rolling(conn, season, windows, config.get('league_ids', {}).get(str(season)))
+
+def cmd_activity(config, args):
+    import transactions
+
+    conn = _open_database(config)
+    season = _season_or_latest(conn, args.season)
+    print(f"🔁 {season} roster moves:")
+    transactions.display_activity(conn, season, config.get('league_ids', {}).get(str(season)))
+
+def cmd_export(config, args):
+    import db_store
+    from exporters import check_export_dependencies
+
+    settings = config.get('settings', {})
+    formats = args.formats or settings.get('export', {}).get('formats', ['xlsx'])
+    check_export_dependencies(formats)
+    windows = tuple(settings.get('rolling', {}).get('windows', (3, 5)))
+    conn = _open_database(config)
+    exported = db_store.export_seasons_from_db(conn, formats, windows, config.get('league_ids'))
+    for export_format, filename in exported.items():
+        print(f"✅ Exported {export_format}: {filename}")
+
+def cmd_live(config, args):
+    import live
+
+    live.main_live(['--config', args.config] + args.passthrough)
+
+def cmd_serve(config, args):
+    import service
+
+    service.main_service(['--config', args.config] + args.passthrough)
+
+COMMANDS = {
+    'analyze': cmd_analyze,
+    'fetch': cmd_fetch,
+    'summary': cmd_summary,
+    'rolling': cmd_rolling,
+    'activity': cmd_activity,
+    'export': cmd_export,
+    'live': cmd_live,
+    'serve': cmd_serve
+}
+
+PASSTHROUGH_COMMANDS = ('live', 'serve')
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Sleeper fantasy football multi-year analyzer")
+    parser.add_argument('--config', default=DEFAULT_CONFIG)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    analyze_parser = subparsers.add_parser('analyze', help="fetch, summarize and export every season")
+    analyze_parser.add_argument('--format', dest='formats', action='append', choices=EXPORT_FORMATS)
+    analyze_parser.add_argument('--profile', nargs='?', const='', metavar='BASENAME',
+                                help="write stage timings and counters as JSON and Prometheus text")
+    analyze_parser.add_argument('--cprofile', action='store_true',
+                                help="also dump cProfile stats for the slowest stage (implies --profile)")
+
+    subparsers.add_parser('fetch', help="fetch every season into the local database")
+
+    summary_parser = subparsers.add_parser('summary', help="season standings from the local database")
+    summary_parser.add_argument('season', type=int, nargs='?', help="default: latest stored season")
+
+    rolling_parser = subparsers.add_parser('rolling', help="latest rolling averages from the local database")
+    rolling_parser.add_argument('season', type=int, nargs='?', help="default: latest stored season")
+
+    activity_parser = subparsers.add_parser('activity', help="roster moves per team from the local database")
+    activity_parser.add_argument('season', type=int, nargs='?', help="default: latest stored season")
+
+    export_parser = subparsers.add_parser('export', help="export every stored season")
+    export_parser.add_argument('--format', dest='formats', action='append', choices=EXPORT_FORMATS)
+
+    # Options for these are parsed by live.py / service.py themselves
+    subparsers.add_parser('live', help="poll the current week (options as for live.py)", add_help=False)
+    subparsers.add_parser('serve', help="serve cached standings over local HTTP (options as for service.py)",
+                          add_help=False)
+    return parser
+
+def run(argv=None):
+    parser = build_parser()
+    args, passthrough = parser.parse_known_args(argv)
+    if passthrough and args.command not in PASSTHROUGH_COMMANDS:
+        parser.error(f"unrecognized arguments: {' '.join(passthrough)}")
+    args.passthrough = passthrough
+    config = load_config(args.config)
+    try:
+        return COMMANDS[args.command](config, args)
+    except ImportError as e:
+        # Missing optional packages are reported, never installed on the fly
+        if (e.name or '').split('.')[0] not in OPTIONAL_MODULES:
+            raise
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,316 @@
+import argparse
+import hashlib
+import json
+import sqlite3
+import time
+
+DEFAULT_DB_PATH = 'sleeper.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leagues (
+    league_id TEXT PRIMARY KEY,
+    season INTEGER NOT NULL,
+    synced_at REAL
+);
+CREATE TABLE IF NOT EXISTS users (
+    league_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    username TEXT,
+    display_name TEXT,
+    team_name TEXT,
+    PRIMARY KEY (league_id, user_id)
+);
+CREATE TABLE IF NOT EXISTS rosters (
+    league_id TEXT NOT NULL,
+    roster_id INTEGER NOT NULL,
+    owner_id TEXT,
+    PRIMARY KEY (league_id, roster_id)
+);
+CREATE TABLE IF NOT EXISTS matchups (
+    league_id TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    roster_id INTEGER NOT NULL,
+    matchup_id INTEGER,
+    points REAL NOT NULL,
+    PRIMARY KEY (league_id, week, roster_id)
+);
+CREATE TABLE IF NOT EXISTS player_scores (
+    league_id TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    roster_id INTEGER NOT NULL,
+    player_id TEXT NOT NULL,
+    points REAL NOT NULL,
+    started INTEGER NOT NULL,
+    PRIMARY KEY (league_id, week, roster_id, player_id)
+);
+CREATE TABLE IF NOT EXISTS week_sync (
+    league_id TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (league_id, week)
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    league_id TEXT NOT NULL,
+    transaction_id TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    status TEXT,
+    created REAL,
+    PRIMARY KEY (league_id, transaction_id)
+);
+CREATE TABLE IF NOT EXISTS transaction_moves (
+    league_id TEXT NOT NULL,
+    transaction_id TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    roster_id INTEGER NOT NULL,
+    owner_id TEXT,
+    player_id TEXT NOT NULL,
+    action TEXT NOT NULL,
+    waiver_bid INTEGER,
+    PRIMARY KEY (league_id, transaction_id, player_id, action)
+);
+CREATE TABLE IF NOT EXISTS transaction_sync (
+    league_id TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    closed INTEGER NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (league_id, week)
+);
+CREATE INDEX IF NOT EXISTS idx_matchups_season_week_roster ON matchups (season, week, roster_id);
+CREATE INDEX IF NOT EXISTS idx_player_scores_season_week_roster ON player_scores (season, week, roster_id);
+CREATE INDEX IF NOT EXISTS idx_player_scores_player ON player_scores (player_id);
+CREATE INDEX IF NOT EXISTS idx_rosters_owner ON rosters (owner_id);
+CREATE INDEX IF NOT EXISTS idx_transaction_moves_season_week_roster ON transaction_moves (season, week, roster_id);
+CREATE INDEX IF NOT EXISTS idx_transaction_moves_owner ON transaction_moves (owner_id);
+CREATE VIEW IF NOT EXISTS team_weeks AS
+SELECT m.season, m.week, m.roster_id, m.matchup_id, m.points, m.league_id, r.owner_id,
+       COALESCE(u.team_name, u.display_name, 'Team ' || m.roster_id) AS team_name,
+       COALESCE(u.display_name, 'Unknown Owner') AS owner_name
+FROM matchups m
+LEFT JOIN rosters r ON r.league_id = m.league_id AND r.roster_id = m.roster_id
+LEFT JOIN users u ON u.league_id = r.league_id AND u.user_id = r.owner_id;
+"""
+
+def connect(path=DEFAULT_DB_PATH):
+    """Open (and create if needed) the local league database"""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+def _week_hash(matchups):
+    return hashlib.sha1(json.dumps(matchups, sort_keys=True).encode('utf-8')).hexdigest()
+
+def sync_season(conn, year, league_id, rosters, users, matchups_data):
+    """Upsert one season's raw payloads, rewriting only weeks that are new or changed.
+
+    Returns {'inserted': n, 'updated': n, 'unchanged': n} week counts.
+    """
+    from player_scores import EMPTY_PLAYER_ID
+
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+    now = time.time()
+    known_hashes = {row['week']: row['content_hash'] for row in conn.execute(
+        "SELECT week, content_hash FROM week_sync WHERE league_id = ?", (league_id,))}
+
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO leagues (league_id, season, synced_at) VALUES (?, ?, ?)",
+                     (league_id, year, now))
+        conn.executemany(
+            "INSERT OR REPLACE INTO users (league_id, user_id, username, display_name, team_name) VALUES (?, ?, ?, ?, ?)",
+            [(league_id, user['user_id'], user.get('username'),
+              user.get('display_name', user.get('username', 'Unknown')),
+              (user.get('metadata') or {}).get('team_name'))
+             for user in users or []]
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO rosters (league_id, roster_id, owner_id) VALUES (?, ?, ?)",
+            [(league_id, roster['roster_id'], roster.get('owner_id')) for roster in rosters or []]
+        )
+
+        for week, matchups in sorted(matchups_data.items()):
+            content_hash = _week_hash(matchups)
+            previous = known_hashes.get(week)
+            if previous == content_hash:
+                counts['unchanged'] += 1
+                continue
+            counts['updated' if previous else 'inserted'] += 1
+
+            conn.execute("DELETE FROM matchups WHERE league_id = ? AND week = ?", (league_id, week))
+            conn.execute("DELETE FROM player_scores WHERE league_id = ? AND week = ?", (league_id, week))
+            conn.executemany(
+                "INSERT INTO matchups (league_id, season, week, roster_id, matchup_id, points) VALUES (?, ?, ?, ?, ?, ?)",
+                [(league_id, year, week, matchup['roster_id'], matchup.get('matchup_id'), matchup.get('points', 0) or 0)
+                 for matchup in matchups]
+            )
+            player_rows = []
+            for matchup in matchups:
+                starters = set(matchup.get('starters') or []) - {EMPTY_PLAYER_ID}
+                for player_id, points in (matchup.get('players_points') or {}).items():
+                    player_rows.append((league_id, year, week, matchup['roster_id'], player_id,
+                                        points or 0, int(player_id in starters)))
+            conn.executemany(
+                "INSERT OR REPLACE INTO player_scores (league_id, season, week, roster_id, player_id, points, started) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                player_rows
+            )
+            conn.execute("INSERT OR REPLACE INTO week_sync (league_id, week, content_hash, synced_at) VALUES (?, ?, ?, ?)",
+                         (league_id, week, content_hash, now))
+
+    return counts
+
+def seasons(conn):
+    return [row['season'] for row in conn.execute("SELECT DISTINCT season FROM matchups ORDER BY season")]
+
+def season_league_id(conn, season):
+    """League synced most recently for a season, or None"""
+    row = conn.execute("SELECT league_id FROM leagues WHERE season = ? ORDER BY synced_at DESC LIMIT 1",
+                       (season,)).fetchone()
+    return row['league_id'] if row else None
+
+def weekly_scores(conn, season, league_id=None):
+    """Rebuild organize_weekly_scores' {week: {roster_id: team_data}} for a season from the database.
+
+    Roster IDs only mean something within one league, so every reader
+    here takes league_id (default: the season's most recently synced league).
+    """
+    league_id = league_id or season_league_id(conn, season)
+    scores = {}
+    for row in conn.execute("SELECT * FROM team_weeks WHERE season = ? AND league_id = ? ORDER BY week, roster_id",
+                            (season, league_id)):
+        scores.setdefault(row['week'], {})[row['roster_id']] = {
+            'team_name': row['team_name'],
+            'owner_name': row['owner_name'],
+            'points': row['points'],
+            'matchup_id': row['matchup_id'],
+            'starters': [],
+            'players': []
+        }
+    return scores
+
+def season_summary(conn, season, league_id=None):
+    """calculate_season_summary as SQL: {roster_id: team_stats}"""
+    league_id = league_id or season_league_id(conn, season)
+    team_stats = {}
+    for row in conn.execute("""
+        SELECT roster_id, MAX(team_name) AS team_name, MAX(owner_name) AS owner_name,
+               SUM(points) AS total_points, COUNT(*) AS weeks_played, AVG(points) AS average_points
+        FROM team_weeks WHERE season = ? AND league_id = ? GROUP BY roster_id
+    """, (season, league_id)):
+        team_stats[row['roster_id']] = {
+            'team_name': row['team_name'],
+            'owner_name': row['owner_name'],
+            'total_points': row['total_points'],
+            'weeks_played': row['weeks_played'],
+            'weekly_scores': [],
+            'average_points': row['average_points']
+        }
+
+    for row in conn.execute("SELECT roster_id, week, points FROM matchups WHERE season = ? AND league_id = ? "
+                            "ORDER BY roster_id, week", (season, league_id)):
+        team_stats[row['roster_id']]['weekly_scores'].append({'week': row['week'], 'points': row['points']})
+
+    return team_stats
+
+def rolling_averages(conn, season, windows=(3, 5), league_id=None):
+    """Cumulative and trailing averages per team-week using SQL window functions.
+
+    Trailing windows count games played, not calendar weeks.
+    Returns rows of (season, week, roster_id, team_name, owner_name, points,
+    rolling_average, total_points, trailing_<N>...).
+    """
+    league_id = league_id or season_league_id(conn, season)
+    trailing = ", ".join(
+        f"AVG(points) OVER (PARTITION BY roster_id ORDER BY week ROWS BETWEEN {int(window) - 1} PRECEDING "
+        f"AND CURRENT ROW) AS trailing_{int(window)}"
+        for window in windows
+    )
+    query = f"""
+        SELECT season, week, roster_id, team_name, owner_name, points,
+               AVG(points) OVER running AS rolling_average,
+               SUM(points) OVER running AS total_points
+               {', ' + trailing if trailing else ''}
+        FROM team_weeks WHERE season = ? AND league_id = ?
+        WINDOW running AS (PARTITION BY roster_id ORDER BY week ROWS UNBOUNDED PRECEDING)
+        ORDER BY week, roster_id
+    """
+    return [dict(row) for row in conn.execute(query, (season, league_id))]
+
+def export_seasons_from_db(conn, formats=('xlsx',), windows=(3, 5), league_ids=None):
+    """Run the multi-year export straight from the database; returns {format: filename}.
+
+    league_ids ({season: league_id}, as in league_data.json) picks each
+    season's league; seasons missing from it use their latest synced one.
+    """
+    league_ids = league_ids or {}
+    from exporters import export_column_names, export_seasons, season_export_columns
+    from rolling_stats import compute_rolling_stats
+
+    season_tables = {}
+    for season in seasons(conn):
+        scores = weekly_scores(conn, season, league_ids.get(str(season)))
+        rolling_data = compute_rolling_stats(scores, windows)
+        season_tables[str(season)] = season_export_columns(season, scores, rolling_data, windows)
+    return export_seasons(season_tables, export_column_names(windows), formats)
+
+def owner_history(conn, owner_id):
+    """Every season an owner played, via the owner index"""
+    return [dict(row) for row in conn.execute("""
+        SELECT season, MAX(team_name) AS team_name, SUM(points) AS total_points, COUNT(*) AS weeks_played
+        FROM team_weeks WHERE owner_id = ? GROUP BY season ORDER BY season
+    """, (owner_id,))]
+
+def display_summary(conn, season, league_id=None):
+    team_stats = season_summary(conn, season, league_id)
+    sorted_teams = sorted(team_stats.values(), key=lambda stats: stats['total_points'], reverse=True)
+    print(f"{'Rank':<4} {'Team':<25} {'Owner':<20} {'Total':<8} {'Avg':<6}")
+    print("-" * 70)
+    for i, stats in enumerate(sorted_teams, 1):
+        print(f"{i:<4} {stats['team_name'][:24]:<25} {stats['owner_name'][:19]:<20} "
+              f"{stats['total_points']:<8.1f} {stats['average_points']:<6.1f}")
+
+def display_rolling(conn, season, windows=(3, 5), league_id=None):
+    latest = {}
+    for row in rolling_averages(conn, season, windows, league_id):
+        latest[row['roster_id']] = row
+    window = int(windows[0]) if windows else None
+    for i, row in enumerate(sorted(latest.values(), key=lambda row: row['rolling_average'], reverse=True), 1):
+        trailing = f", last {window}: {row[f'trailing_{window}']:.1f}" if window else ""
+        print(f"   {i}. {row['team_name']}: {row['rolling_average']:.1f} avg through week {row['week']}{trailing}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the local Sleeper database without touching the network")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH)
+    parser.add_argument('--league', help="league ID (default: the season's most recently synced league)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    summary_parser = subparsers.add_parser('summary', help="season standings")
+    summary_parser.add_argument('season', type=int)
+    rolling_parser = subparsers.add_parser('rolling', help="latest rolling averages for a season")
+    rolling_parser.add_argument('season', type=int)
+    export_parser = subparsers.add_parser('export', help="export every stored season")
+    export_parser.add_argument('--format', dest='formats', action='append', choices=('xlsx', 'parquet', 'csv'))
+    query_parser = subparsers.add_parser('query', help="run an ad-hoc SQL query")
+    query_parser.add_argument('sql')
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    if args.command == 'summary':
+        display_summary(conn, args.season, league_id=args.league)
+    elif args.command == 'rolling':
+        display_rolling(conn, args.season, league_id=args.league)
+    elif args.command == 'export':
+        for export_format, filename in export_seasons_from_db(conn, args.formats or ['xlsx']).items():
+            print(f"✅ Exported {export_format}: {filename}")
+    else:
+        cursor = conn.execute(args.sql)
+        columns = [column[0] for column in cursor.description or []]
+        if columns:
+            print("\t".join(columns))
+        for row in cursor:
+            print("\t".join(str(value) for value in row))
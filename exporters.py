@@ -0,0 +1,593 @@
+import csv
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import re
+import shutil
+import zipfile
+from datetime import datetime
+from xml.etree import ElementTree
+
+import numpy as np
+
+from metrics import METRICS
+from records import _season_arrays, compute_records, format_record
+
+BASE_COLUMNS = ['Season', 'Week', 'Team_Name', 'Owner_Name', 'Rolling_Average', 'Total_Points', 'Weekly_Score']
+RECORD_COLUMNS = ['Result', 'Points_Against', 'Record', 'All_Play_Record']
+EXPORT_FORMATS = ('xlsx', 'parquet', 'csv')
+DEFAULT_CSV_CHUNK_ROWS = 50000
+MAX_COLUMN_WIDTH = 50
+DEFAULT_INCREMENTAL_BASENAME = 'fantasy_multi_year_scores'
+DEFAULT_EXPORT_CACHE_DIR = '.sleeper_cache/export'
+MANIFEST_VERSION = 1
+SPREADSHEET_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+RELATIONSHIP_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+# Row and cell references in openpyxl's worksheet XML ('r' is always the first attribute)
+ROW_REFERENCE = re.compile(rb'(<row r="|<c r="[A-Z]+)(\d+)"')
+# Optional packages each format needs; they're only imported when that format is written
+FORMAT_DEPENDENCIES = {'xlsx': 'openpyxl', 'parquet': 'pyarrow', 'csv': None}
+
+def check_export_dependencies(formats):
+    """Raise ImportError up front if any requested format's package isn't installed"""
+    unknown = [export_format for export_format in formats if export_format not in FORMAT_DEPENDENCIES]
+    if unknown:
+        raise ValueError(f"Unknown export format '{unknown[0]}' (choose from {', '.join(EXPORT_FORMATS)})")
+    missing = {}
+    for export_format in formats:
+        package = FORMAT_DEPENDENCIES[export_format]
+        if package and importlib.util.find_spec(package) is None:
+            missing.setdefault(package, []).append(export_format)
+    if missing:
+        needed = ', '.join(f"{package} ({'/'.join(needed_by)} export)" for package, needed_by in missing.items())
+        raise ImportError(f"Missing optional dependencies: {needed} - install with: pip install {' '.join(missing)}",
+                          name=next(iter(missing)))
+
+def export_column_names(windows):
+    """Column order for every export format"""
+    return BASE_COLUMNS + [f'Trailing_{window}_Avg' for window in windows] + ['EWMA', 'Rolling_Std'] + RECORD_COLUMNS
+
+def season_export_columns(year, weekly_scores, rolling_data, windows, records_data=None):
+    """Build one season's export table as {column: list} from weekly scores, rolling stats and records.
+
+    Works on plain {week: {roster_id: team_data}} dicts and on ScoreStore
+    season views; views are read straight from their arrays. Records are
+    computed here when records_data isn't passed in.
+    """
+    if hasattr(weekly_scores, 'store'):
+        store = weekly_scores.store
+        rows = weekly_scores.rows[np.argsort(store.week[weekly_scores.rows], kind='stable')]
+        weeks = store.week[rows].astype(int).tolist()
+        roster_ids = store.roster_id[rows].astype(int).tolist()
+        team_names, owner_names = store.team_columns(rows)
+        team_names, owner_names = team_names.tolist(), owner_names.tolist()
+        points = store.points[rows].tolist()
+    else:
+        weeks, roster_ids, team_names, owner_names, points = [], [], [], [], []
+        for week, week_data in sorted(weekly_scores.items()):
+            for roster_id, team_data in week_data.items():
+                weeks.append(week)
+                roster_ids.append(roster_id)
+                team_names.append(team_data['team_name'])
+                owner_names.append(team_data['owner_name'])
+                points.append(team_data['points'])
+
+    rolling_infos = [rolling_data.get(roster_id, {}).get('rolling_averages', {}).get(week, {})
+                     for roster_id, week in zip(roster_ids, weeks)]
+
+    def rolling_column(key):
+        return [round(info.get(key, 0), 2) for info in rolling_infos]
+
+    columns = {
+        'Season': [str(year)] * len(weeks),
+        'Week': weeks,
+        'Team_Name': team_names,
+        'Owner_Name': owner_names,
+        'Rolling_Average': rolling_column('average'),
+        'Total_Points': rolling_column('total_points'),
+        'Weekly_Score': [round(value, 2) for value in points]
+    }
+    for window in windows:
+        columns[f'Trailing_{window}_Avg'] = rolling_column(f'trailing_{window}')
+    columns['EWMA'] = rolling_column('ewma')
+    columns['Rolling_Std'] = rolling_column('std')
+
+    if records_data is None:
+        records_data = compute_records(weekly_scores)
+    record_infos = [records_data.get(roster_id, {}).get('weekly', {}).get(week, {})
+                    for roster_id, week in zip(roster_ids, weeks)]
+    columns['Result'] = [info.get('result', '') for info in record_infos]
+    columns['Points_Against'] = [round(info.get('opponent_points') or 0, 2) for info in record_infos]
+    columns['Record'] = [format_record(info.get('wins', 0), info.get('losses', 0), info.get('ties', 0))
+                         for info in record_infos]
+    columns['All_Play_Record'] = [format_record(info.get('all_play_wins', 0), info.get('all_play_losses', 0),
+                                                info.get('all_play_ties', 0))
+                                  for info in record_infos]
+    return columns
+
+class ColumnStats:
+    """Running per-column display-width statistics, updated one chunk at a time.
+
+    Text columns track the longest distinct value; numeric columns only track
+    their min and max, from which the widest rendering is derived.
+    """
+
+    def __init__(self, column_names):
+        self.column_names = column_names
+        self.max_text = {name: len(name) for name in column_names}
+        self.min_value = {}
+        self.max_value = {}
+
+    def update(self, columns):
+        for name in self.column_names:
+            values = columns[name]
+            if not len(values):
+                continue
+            if isinstance(values[0], str):
+                self.max_text[name] = max(self.max_text[name], max(len(value) for value in set(values)))
+            else:
+                low, high = min(values), max(values)
+                self.min_value[name] = min(low, self.min_value.get(name, low))
+                self.max_value[name] = max(high, self.max_value.get(name, high))
+
+    def width(self, name):
+        length = self.max_text[name]
+        if name in self.max_value:
+            for value in (self.min_value[name], self.max_value[name]):
+                # Rounded floats render with at most two decimals
+                text = str(value) if isinstance(value, int) else f"{value:.2f}"
+                length = max(length, len(text))
+        return min(length + 2, MAX_COLUMN_WIDTH)
+
+    def widths(self):
+        return [self.width(name) for name in self.column_names]
+
+def _iter_chunks(columns, column_names, chunk_rows):
+    """Yield the rows of a column table as tuples, chunk_rows at a time"""
+    total = len(columns[column_names[0]]) if column_names else 0
+    for start in range(0, total, chunk_rows):
+        yield zip(*(columns[name][start:start + chunk_rows] for name in column_names))
+
+def _column_letter(index):
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+class ExcelSeasonWriter:
+    """Write-only workbook with a Career sheet plus one sheet per season, filled a season at a time.
+
+    Write-only sheets emit their column widths before any row, so widths
+    come from column statistics instead of a second pass over written cells.
+    The Career sheet is sized from career_stats when every season is known
+    up front, otherwise from the first season written.
+    """
+
+    def __init__(self, filename, column_names, career_stats=None):
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            raise ImportError("openpyxl is required for Excel export (pip install openpyxl)", name='openpyxl') from None
+
+        self.filename = filename
+        self.column_names = column_names
+        self.career_stats = career_stats
+        self.workbook = Workbook(write_only=True)
+        self.career = None
+
+    def _sheet(self, sheet_name, stats):
+        worksheet = self.workbook.create_sheet(sheet_name)
+        for index, width in enumerate(stats.widths()):
+            worksheet.column_dimensions[_column_letter(index)].width = width
+        worksheet.append(self.column_names)
+        return worksheet
+
+    def write_season(self, year, columns):
+        stats = ColumnStats(self.column_names)
+        stats.update(columns)
+        if self.career is None:
+            self.career = self._sheet('Career', self.career_stats or stats)
+        season_sheet = self._sheet(f'{year}', stats)
+        for row in zip(*(columns[name] for name in self.column_names)):
+            self.career.append(row)
+            season_sheet.append(row)
+
+    def close(self):
+        if self.career is None:
+            self.career = self._sheet('Career', self.career_stats or ColumnStats(self.column_names))
+        self.workbook.save(self.filename)
+        return self.filename
+
+class CsvSeasonWriter:
+    """One CSV for all seasons, written chunk_rows rows at a time"""
+
+    def __init__(self, filename, column_names, chunk_rows=DEFAULT_CSV_CHUNK_ROWS):
+        self.filename = filename
+        self.column_names = column_names
+        self.chunk_rows = chunk_rows
+        self.file = open(filename, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(column_names)
+
+    def write_season(self, year, columns):
+        for rows in _iter_chunks(columns, self.column_names, self.chunk_rows):
+            self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+        return self.filename
+
+class ParquetSeasonWriter:
+    """One Parquet file for all seasons, one row group per season"""
+
+    def __init__(self, filename, column_names):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("pyarrow is required for Parquet export (pip install pyarrow)", name='pyarrow') from None
+
+        self.filename = filename
+        self.column_names = column_names
+        self.pa, self.pq = pa, pq
+        self.writer = None
+
+    def write_season(self, year, columns):
+        table = self.pa.table({name: columns[name] for name in self.column_names})
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.filename, table.schema)
+        self.writer.write_table(table.cast(self.writer.schema))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        return self.filename
+
+def open_season_writer(export_format, filename, column_names, csv_chunk_rows=DEFAULT_CSV_CHUNK_ROWS,
+                       career_stats=None):
+    if export_format == 'xlsx':
+        return ExcelSeasonWriter(filename, column_names, career_stats)
+    if export_format == 'csv':
+        return CsvSeasonWriter(filename, column_names, csv_chunk_rows)
+    if export_format == 'parquet':
+        return ParquetSeasonWriter(filename, column_names)
+    raise ValueError(f"Unknown export format '{export_format}' (choose from {', '.join(EXPORT_FORMATS)})")
+
+def _write_all(writer, season_tables):
+    for year in sorted(season_tables.keys()):
+        writer.write_season(year, season_tables[year])
+    return writer.close()
+
+def write_excel(filename, season_tables, column_names):
+    """Stream a Career sheet plus one sheet per season into a write-only workbook"""
+    career_stats = ColumnStats(column_names)
+    for columns in season_tables.values():
+        career_stats.update(columns)
+    return _write_all(ExcelSeasonWriter(filename, column_names, career_stats), season_tables)
+
+def write_csv(filename, season_tables, column_names, chunk_rows=DEFAULT_CSV_CHUNK_ROWS):
+    """Write all seasons to one CSV, chunk_rows rows at a time"""
+    return _write_all(CsvSeasonWriter(filename, column_names, chunk_rows), season_tables)
+
+def write_parquet(filename, season_tables, column_names):
+    """Write all seasons to one Parquet file, one row group per season"""
+    return _write_all(ParquetSeasonWriter(filename, column_names), season_tables)
+
+def default_basename():
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"fantasy_multi_year_scores_{timestamp}"
+
+class SeasonExport:
+    """Writes each season to every requested format as soon as it is ready.
+
+    Only the season being written is held in memory. Use as a context
+    manager; `written` maps each format to its filename once closed.
+    """
+
+    def __init__(self, column_names, formats=('xlsx',), basename=None, csv_chunk_rows=DEFAULT_CSV_CHUNK_ROWS,
+                 career_stats=None):
+        basename = basename or default_basename()
+        self.column_names = column_names
+        self.writers = {}
+        self.written = {}
+        try:
+            for export_format in formats:
+                self.writers[export_format] = open_season_writer(
+                    export_format, f"{basename}.{export_format}", column_names, csv_chunk_rows, career_stats)
+        except Exception:
+            self.close()
+            raise
+
+    def reuse_season(self, year, weekly_scores):
+        """Every season is written out in full; see IncrementalExport"""
+        return False
+
+    def write_season(self, year, columns):
+        row_count = len(columns[self.column_names[0]])
+        for export_format, writer in self.writers.items():
+            with METRICS.span(f'export.{export_format}'):
+                writer.write_season(year, columns)
+            METRICS.incr('rows_exported', row_count)
+
+    def close(self):
+        for export_format, writer in self.writers.items():
+            with METRICS.span(f'export.{export_format}'):
+                self.written[export_format] = writer.close()
+        self.writers = {}
+        return self.written
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def season_content_hash(weekly_scores, *inputs):
+    """SHA-1 of a season's week data plus any other inputs its export table is built from"""
+    week, roster_id, matchup_id, points, team_names, owner_names = _season_arrays(weekly_scores)
+    order = np.lexsort((roster_id, week))
+    digest = hashlib.sha1(json.dumps(inputs, default=str).encode('utf-8'))
+    for values in (week, roster_id, matchup_id, points):
+        digest.update(np.ascontiguousarray(values[order]).tobytes())
+    for names in (team_names, owner_names):
+        digest.update('\x1f'.join(str(name) for name in np.asarray(names)[order]).encode('utf-8'))
+    return digest.hexdigest()
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _sheet_members(archive):
+    """{sheet name: zip member} of a saved workbook"""
+    workbook = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+    relationships = ElementTree.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+    targets = {relationship.get('Id'): relationship.get('Target') for relationship in relationships}
+    members = {}
+    for sheet in workbook.iter(f'{SPREADSHEET_NS}sheet'):
+        target = targets[sheet.get(f'{RELATIONSHIP_NS}id')]
+        members[sheet.get('name')] = target.lstrip('/') if target.startswith('/') else f'xl/{target}'
+    return members
+
+def _data_rows(sheet_xml):
+    """Every <row> of a worksheet's XML after the header row"""
+    start = sheet_xml.index(b'</row>', sheet_xml.index(b'<sheetData>')) + len(b'</row>')
+    return sheet_xml[start:sheet_xml.rindex(b'</sheetData>')]
+
+def _shift_rows(rows_xml, offset):
+    """Renumber worksheet rows and cell references by offset"""
+    if not offset:
+        return rows_xml
+    return ROW_REFERENCE.sub(lambda match: match.group(1) + str(int(match.group(2)) + offset).encode() + b'"',
+                             rows_xml)
+
+class IncrementalExport:
+    """Season-at-a-time export that only serializes seasons whose week data changed.
+
+    Every season's output is cached in cache_dir per format - its CSV
+    rows, a one-season Parquet file and its worksheet XML - under a
+    manifest of content hashes (season_content_hash). reuse_season()
+    answers from the manifest, so an unchanged season's table is never
+    built; write_season() serializes the rest. close() assembles each
+    format at the stable path <basename>.<format> from the cached pieces:
+    CSV and Parquet by concatenation, and the workbook by splicing the
+    season sheets' XML into a skeleton workbook, with the Career sheet's
+    rows renumbered from the same pieces.
+    """
+
+    def __init__(self, column_names, formats=('xlsx',), basename=None, cache_dir=DEFAULT_EXPORT_CACHE_DIR,
+                 csv_chunk_rows=DEFAULT_CSV_CHUNK_ROWS, inputs=()):
+        if 'xlsx' in formats and importlib.util.find_spec('openpyxl') is None:
+            raise ImportError("openpyxl is required for Excel export (pip install openpyxl)", name='openpyxl')
+        if 'parquet' in formats and importlib.util.find_spec('pyarrow') is None:
+            raise ImportError("pyarrow is required for Parquet export (pip install pyarrow)", name='pyarrow')
+
+        self.column_names = column_names
+        self.formats = tuple(formats)
+        self.basename = basename or DEFAULT_INCREMENTAL_BASENAME
+        self.cache_dir = cache_dir
+        self.csv_chunk_rows = csv_chunk_rows
+        # Anything besides the week data that changes the table (windows, EWMA alpha, ...)
+        self.inputs = [list(column_names)] + list(inputs)
+        self.manifest_path = os.path.join(cache_dir, 'manifest.json')
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.cached = {}
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION:
+                self.cached = manifest.get('seasons', {})
+        except (OSError, ValueError):
+            pass
+        self.seasons = {}  # year -> manifest entry, in the order seasons arrive
+        self._hashes = {}
+        self.reused = []
+        self.rewritten = []
+        self.written = {}
+
+    def _path(self, filename):
+        return os.path.join(self.cache_dir, filename)
+
+    def reuse_season(self, year, weekly_scores):
+        """Take a season from the cache if its content hash is unchanged; False if it needs writing"""
+        year = str(year)
+        content_hash = self._hashes[year] = season_content_hash(weekly_scores, *self.inputs)
+        entry = self.cached.get(year)
+        if (entry is None or entry['hash'] != content_hash
+                or not all(export_format in entry['files'] and os.path.exists(self._path(entry['files'][export_format]))
+                           for export_format in self.formats)):
+            return False
+        self.seasons[year] = entry
+        self.reused.append(year)
+        METRICS.incr('export_seasons_reused')
+        return True
+
+    def write_season(self, year, columns):
+        year = str(year)
+        content_hash = self._hashes.get(year)
+        if content_hash is None:
+            # No week data to hash - fall back to the table itself
+            content_hash = hashlib.sha1(json.dumps(columns, default=str).encode('utf-8')).hexdigest()
+        stats = ColumnStats(self.column_names)
+        stats.update(columns)
+        stem = f'{year}-{content_hash[:16]}'
+        files = {}
+        for export_format in self.formats:
+            with METRICS.span(f'export.{export_format}'):
+                files[export_format] = getattr(self, f'_write_{export_format}')(stem, year, columns, stats)
+        row_count = len(columns[self.column_names[0]])
+        self.seasons[year] = {'hash': content_hash, 'rows': row_count, 'widths': stats.widths(), 'files': files}
+        self.rewritten.append(year)
+        METRICS.incr('rows_exported', row_count)
+
+    def _write_csv(self, stem, year, columns, stats):
+        buffer = io.StringIO(newline='')
+        writer = csv.writer(buffer)
+        for rows in _iter_chunks(columns, self.column_names, self.csv_chunk_rows):
+            writer.writerows(rows)
+        _write_atomic(self._path(f'{stem}.csv'), buffer.getvalue().encode('utf-8'))
+        return f'{stem}.csv'
+
+    def _write_parquet(self, stem, year, columns, stats):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        tmp_path = self._path(f'{stem}.parquet.{os.getpid()}.tmp')
+        pq.write_table(pa.table({name: columns[name] for name in self.column_names}), tmp_path)
+        os.replace(tmp_path, self._path(f'{stem}.parquet'))
+        return f'{stem}.parquet'
+
+    def _workbook(self, sheets):
+        """Save a write-only workbook of [(name, widths, columns or None)] sheets to bytes"""
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        for sheet_name, widths, columns in sheets:
+            worksheet = workbook.create_sheet(sheet_name)
+            for index, width in enumerate(widths):
+                worksheet.column_dimensions[_column_letter(index)].width = width
+            worksheet.append(self.column_names)
+            if columns is not None:
+                for row in zip(*(columns[name] for name in self.column_names)):
+                    worksheet.append(row)
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        return buffer.getvalue()
+
+    def _write_xlsx(self, stem, year, columns, stats):
+        with zipfile.ZipFile(io.BytesIO(self._workbook([(year, stats.widths(), columns)]))) as archive:
+            sheet_xml = archive.read(_sheet_members(archive)[year])
+        _write_atomic(self._path(f'{stem}.xml'), sheet_xml)
+        return f'{stem}.xml'
+
+    def _assemble_csv(self, path, years):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerow(self.column_names)
+        with open(path, 'ab') as out:
+            for year in years:
+                with open(self._path(self.seasons[year]['files']['csv']), 'rb') as f:
+                    shutil.copyfileobj(f, out)
+
+    def _assemble_parquet(self, path, years):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        for year in years:
+            table = pq.read_table(self._path(self.seasons[year]['files']['parquet']))
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table.cast(writer.schema))
+        if writer is None:
+            pq.write_table(pa.table({name: [] for name in self.column_names}), path)
+        else:
+            writer.close()
+
+    def _assemble_xlsx(self, path, years):
+        # Career columns are as wide as the widest season's
+        career_widths = [max(widths) for widths in zip(*(self.seasons[year]['widths'] for year in years))]
+        skeleton = self._workbook([('Career', career_widths or ColumnStats(self.column_names).widths(), None)]
+                                  + [(year, self.seasons[year]['widths'], None) for year in years])
+        with zipfile.ZipFile(io.BytesIO(skeleton)) as archive:
+            members = _sheet_members(archive)
+            season_xml = {}
+            for year in years:
+                with open(self._path(self.seasons[year]['files']['xlsx']), 'rb') as f:
+                    season_xml[members[year]] = f.read()
+
+            career_xml = archive.read(members['Career'])
+            end = career_xml.rindex(b'</sheetData>')
+            career_parts = [career_xml[:end]]
+            next_row = 2
+            for year in years:
+                career_parts.append(_shift_rows(_data_rows(season_xml[members[year]]), next_row - 2))
+                next_row += self.seasons[year]['rows']
+            career_parts.append(career_xml[end:])
+            season_xml[members['Career']] = b''.join(career_parts)
+
+            with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as out:
+                for info in archive.infolist():
+                    out.writestr(info.filename, season_xml.get(info.filename) or archive.read(info.filename))
+
+    def _save_manifest(self, seasons):
+        _write_atomic(self.manifest_path, json.dumps({'version': MANIFEST_VERSION, 'seasons': seasons},
+                                                     indent=2).encode('utf-8'))
+
+    def close(self):
+        """Assemble every format at its stable path and drop cache files no season uses any more"""
+        if self.written:
+            return self.written
+        years = sorted(self.seasons)
+        for export_format in self.formats:
+            path = f"{self.basename}.{export_format}"
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with METRICS.span(f'export.{export_format}'):
+                getattr(self, f'_assemble_{export_format}')(tmp_path, years)
+            os.replace(tmp_path, path)
+            self.written[export_format] = path
+
+        self._save_manifest(self.seasons)
+        in_use = {filename for entry in self.seasons.values() for filename in entry['files'].values()}
+        for filename in os.listdir(self.cache_dir):
+            if filename != 'manifest.json' and filename not in in_use:
+                os.remove(self._path(filename))
+        return self.written
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.close()
+        else:
+            # Keep what was serialized before the failure for the next run
+            self._save_manifest({**self.cached, **self.seasons})
+
+def open_export(column_names, formats=('xlsx',), export_settings=None, inputs=()):
+    """SeasonExport to a new timestamped basename, or IncrementalExport when settings.export.incremental is on"""
+    export_settings = export_settings or {}
+    csv_chunk_rows = export_settings.get('csv_chunk_rows', DEFAULT_CSV_CHUNK_ROWS)
+    if export_settings.get('incremental'):
+        return IncrementalExport(column_names, formats, export_settings.get('basename'),
+                                 export_settings.get('cache_dir', DEFAULT_EXPORT_CACHE_DIR), csv_chunk_rows, inputs)
+    return SeasonExport(column_names, formats, export_settings.get('basename'), csv_chunk_rows)
+
+def export_seasons(season_tables, column_names, formats=('xlsx',), basename=None,
+                   csv_chunk_rows=DEFAULT_CSV_CHUNK_ROWS):
+    """Write season tables in each requested format; returns {format: filename}"""
+    career_stats = None
+    if 'xlsx' in formats:
+        career_stats = ColumnStats(column_names)
+        for columns in season_tables.values():
+            career_stats.update(columns)
+
+    with SeasonExport(column_names, formats, basename, csv_chunk_rows, career_stats) as export:
+        for year in sorted(season_tables.keys()):
+            export.write_season(year, season_tables[year])
+    return export.written
@@ -0,0 +1,131 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_client import HttpClient, TokenBucket
+from metrics import METRICS
+from response_cache import cached_get_json
+
+DEFAULT_MAX_WORKERS = 8
+
+_session_lock = threading.Lock()
+_shared_session = None
+_client_lock = threading.Lock()
+_shared_client = None
+
+def create_session(pool_size=DEFAULT_MAX_WORKERS):
+    """Create a requests Session with a keep-alive pool sized for pool_size workers"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def get_shared_session(pool_size=DEFAULT_MAX_WORKERS):
+    """Return the process-wide pooled Session, creating it on first use"""
+    global _shared_session
+    with _session_lock:
+        if _shared_session is None:
+            _shared_session = create_session(pool_size)
+        return _shared_session
+
+def get_shared_client(pool_size=DEFAULT_MAX_WORKERS):
+    """Return the process-wide retrying, rate-limited HttpClient over the shared Session"""
+    global _shared_client
+    with _client_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient(get_shared_session(pool_size), rate_limiter=TokenBucket())
+        return _shared_client
+
+def configure_shared_client(settings, pool_size=DEFAULT_MAX_WORKERS):
+    """Replace the shared HttpClient with one built from league_data.json settings"""
+    global _shared_client
+    client = HttpClient.from_config(get_shared_session(pool_size), settings)
+    with _client_lock:
+        _shared_client = client
+    return client
+
+def fetch_json(url, session=None, cache=None, immutable=False):
+    """GET a URL (through the response cache if given) and return the decoded JSON, or None on failure"""
+    session = session or get_shared_client()
+    try:
+        return cached_get_json(session, url, cache, immutable)
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching data from API: {e}")
+        return None
+
+# Sleeper applies stat corrections to the week just played during the following week
+STAT_CORRECTION_WEEKS = 1
+
+def is_immutable(year, kind, week, nfl_state=None):
+    """Whether a season endpoint can no longer change.
+
+    Past seasons are closed entirely. In the open season only the matchups
+    and transactions of weeks at least two weeks before the current NFL
+    week are final. The week that just finished can still pick up stat
+    corrections, so it keeps going through the TTL and ETag revalidation.
+    """
+    if not nfl_state or year is None:
+        return False
+    current_season = int(nfl_state.get('season', 0) or 0)
+    if year < current_season:
+        return True
+    if year == current_season and kind in ('matchups', 'transactions'):
+        return week < int(nfl_state.get('week', 0) or 0) - STAT_CORRECTION_WEEKS
+    return False
+
+def _season_jobs(league_id, base_url, max_weeks):
+    """List the (kind, week, url) requests that make up one season"""
+    jobs = [
+        ('league', None, f"{base_url}/league/{league_id}"),
+        ('rosters', None, f"{base_url}/league/{league_id}/rosters"),
+        ('users', None, f"{base_url}/league/{league_id}/users"),
+    ]
+    for week in range(1, max_weeks + 1):
+        jobs.append(('matchups', week, f"{base_url}/league/{league_id}/matchups/{week}"))
+    return jobs
+
+def fetch_seasons(seasons, base_url, max_workers=DEFAULT_MAX_WORKERS, session=None,
+                  cache=None, nfl_state=None):
+    """Fetch rosters, users and weekly matchups for many seasons concurrently.
+
+    seasons is an iterable of (year, league_id, max_weeks). Every request for
+    every season goes through one bounded thread pool sharing one pooled
+    Session. Returns {year: {'league', 'rosters', 'users', 'matchups',
+    'missing_weeks'}}: the raw /league/{id}, rosters and users payloads,
+    matchups as {week: [...]}, and the weeks whose request still failed
+    after the client's retries (listed rather than silently dropped).
+    With a ResponseCache, endpoints that is_immutable() reports as final
+    are served from disk without touching the network.
+    """
+    session = session or get_shared_client(max_workers)
+    results = {}
+    futures = []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for year, league_id, max_weeks in seasons:
+            results[year] = {'league': {}, 'rosters': {}, 'users': {}, 'matchups': {}, 'missing_weeks': []}
+            for kind, week, url in _season_jobs(league_id, base_url, max_weeks):
+                immutable = is_immutable(year, kind, week, nfl_state)
+                future = executor.submit(METRICS.profiled('fetch', fetch_json), url, session, cache, immutable)
+                futures.append((year, kind, week, future))
+
+        for year, kind, week, future in futures:
+            data = future.result()
+            if kind == 'matchups':
+                if data:
+                    results[year]['matchups'][week] = data
+                elif data is None:
+                    results[year]['missing_weeks'].append(week)
+                else:
+                    print(f"No data found for {year} week {week}.")
+            elif data:
+                results[year][kind] = data
+
+    # Keep weeks in ascending order like the sequential fetch did
+    for season in results.values():
+        season['matchups'] = dict(sorted(season['matchups'].items()))
+
+    return results
@@ -0,0 +1,126 @@
+import random
+import threading
+import time
+
+import requests
+
+from metrics import METRICS
+
+# Sleeper asks clients to stay under 1000 calls per minute
+DEFAULT_REQUESTS_PER_SECOND = 15
+DEFAULT_BURST = 15
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 30.0
+DEFAULT_TIMEOUT = 10
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class RequestBudgetExceeded(requests.exceptions.RequestException):
+    """Raised when a run has used up its request budget"""
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `capacity`"""
+
+    def __init__(self, rate=DEFAULT_REQUESTS_PER_SECOND, capacity=DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class RequestBudget:
+    """Caps the number of HTTP requests (including retries) a run may make"""
+
+    def __init__(self, max_requests=None):
+        self.max_requests = max_requests
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def spend(self):
+        with self._lock:
+            if self.max_requests is not None and self.used >= self.max_requests:
+                raise RequestBudgetExceeded(f"Request budget of {self.max_requests} requests exhausted")
+            self.used += 1
+
+class HttpClient:
+    """Shared HTTP client with retries, exponential backoff with full jitter, rate limiting and a budget.
+
+    get() has the same call shape as requests.Session.get, so it can be
+    passed anywhere a session is expected (e.g. cached_get_json).
+    """
+
+    def __init__(self, session, max_retries=DEFAULT_MAX_RETRIES, backoff_base=DEFAULT_BACKOFF_BASE,
+                 backoff_max=DEFAULT_BACKOFF_MAX, rate_limiter=None, budget=None, timeout=DEFAULT_TIMEOUT):
+        self.session = session
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limiter = rate_limiter
+        self.budget = budget or RequestBudget()
+        self.timeout = timeout
+        self.retries = 0
+        self._retries_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, session, settings):
+        """Build a client from the 'http' block of league_data.json settings"""
+        http_settings = settings.get('http', {})
+        return cls(
+            session,
+            max_retries=http_settings.get('max_retries', DEFAULT_MAX_RETRIES),
+            backoff_base=http_settings.get('backoff_base', DEFAULT_BACKOFF_BASE),
+            backoff_max=http_settings.get('backoff_max', DEFAULT_BACKOFF_MAX),
+            rate_limiter=TokenBucket(http_settings.get('requests_per_second', DEFAULT_REQUESTS_PER_SECOND),
+                                     http_settings.get('burst', DEFAULT_BURST)),
+            budget=RequestBudget(http_settings.get('request_budget')),
+            timeout=http_settings.get('timeout', DEFAULT_TIMEOUT),
+        )
+
+    def _backoff(self, attempt, response=None):
+        """Seconds to wait before retry number `attempt`, honouring Retry-After"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def get(self, url, headers=None, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        attempt = 0
+        while True:
+            self.budget.spend()
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            METRICS.incr('http_requests')
+            try:
+                with METRICS.span('http.request'):
+                    response = self.session.get(url, headers=headers, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                METRICS.incr('http_errors')
+                if attempt >= self.max_retries:
+                    raise
+                response = None
+            else:
+                METRICS.incr('http_bytes', len(response.content))
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+
+            with self._retries_lock:
+                self.retries += 1
+            METRICS.incr('http_retries')
+            time.sleep(self._backoff(attempt, response))
+            attempt += 1
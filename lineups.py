@@ -0,0 +1,143 @@
+import numpy as np
+
+from records import _group_bounds
+
+# Positions each Sleeper roster slot accepts
+SLOT_ELIGIBILITY = {
+    'QB': ('QB',),
+    'RB': ('RB',),
+    'WR': ('WR',),
+    'TE': ('TE',),
+    'K': ('K',),
+    'DEF': ('DEF',),
+    'DL': ('DL',),
+    'LB': ('LB',),
+    'DB': ('DB',),
+    'WRRB_FLEX': ('RB', 'WR'),
+    'REC_FLEX': ('WR', 'TE'),
+    'FLEX': ('RB', 'WR', 'TE'),
+    'SUPER_FLEX': ('QB', 'RB', 'WR', 'TE'),
+    'IDP_FLEX': ('DL', 'LB', 'DB'),
+}
+POSITIONS = sorted({position for positions in SLOT_ELIGIBILITY.values() for position in positions})
+UNKNOWN_POSITION = -1
+
+def slot_plan(roster_positions):
+    """[(slot, count)] of the starting slots, most restrictive first.
+
+    Filling single-position slots before flex slots, and narrow flex
+    slots before wider ones, gives the optimal lineup whenever the flex
+    eligibilities nest (every standard layout; a league with both
+    WRRB_FLEX and REC_FLEX can in rare weeks come out slightly low).
+    Bench, IR and taxi slots and unknown slot names are ignored.
+    """
+    counts = {}
+    for slot in roster_positions or []:
+        if slot in SLOT_ELIGIBILITY:
+            counts[slot] = counts.get(slot, 0) + 1
+    return sorted(counts.items(), key=lambda item: (len(SLOT_ELIGIBILITY[item[0]]), item[0]))
+
+def position_codes(player_index, players):
+    """Position code for every player code in a PlayerScoreIndex, from a PlayerIndex (or {id: {'position'}})"""
+    codes = np.full(len(player_index.player_ids.strings), UNKNOWN_POSITION, dtype=np.int8)
+    if players is None:
+        return codes
+    index_of = {position: i for i, position in enumerate(POSITIONS)}
+    for code, player_id in enumerate(player_index.player_ids.strings):
+        player = players.get(player_id)
+        if player:
+            codes[code] = index_of.get(player.get('position'), UNKNOWN_POSITION)
+    return codes
+
+def optimal_lineups(player_index, roster_positions, players=None, season=None):
+    """Actual and best possible starter points for every team-week in a PlayerScoreIndex.
+
+    roster_positions is {season: [...]} (the league's roster_positions,
+    bench included) and players resolves player IDs to positions. All
+    team-weeks of a season are solved together: each slot type is filled
+    with one sort of the still-available eligible players by (team-week,
+    points), keeping the top `count` of each team-week. A starter with no
+    known position is treated as eligible for the single-position slot it
+    was started in. Returns parallel arrays {season, week, roster_id,
+    actual, optimal, bench_points}.
+    """
+    mask = player_index._mask(season)
+    seasons = player_index.season[mask].astype(np.int64)
+    weeks = player_index.week[mask].astype(np.int64)
+    roster_ids = player_index.roster_id[mask].astype(np.int64)
+    points = player_index.points[mask]
+    started = player_index.started[mask]
+    slots = player_index.slot[mask]
+    positions = position_codes(player_index, players)[player_index.player[mask]]
+
+    keys = (seasons * 100 + weeks) * 100000 + roster_ids
+    team_weeks, group = np.unique(keys, return_inverse=True)
+    actual = np.bincount(group, weights=np.where(started, points, 0.0), minlength=len(team_weeks))
+    optimal = np.zeros(len(team_weeks))
+
+    for year in np.unique(seasons):
+        layout = roster_positions.get(int(year)) or []
+        in_season = seasons == year
+
+        # Fall back to the slot a starter actually filled
+        season_positions = positions.copy()
+        for slot_index, slot in enumerate(layout):
+            if slot in POSITIONS:
+                fill = in_season & started & (slots == slot_index) & (season_positions == UNKNOWN_POSITION)
+                season_positions[fill] = POSITIONS.index(slot)
+
+        # An empty slot beats a negative score, so only positive scores are ever picked
+        available = in_season & (points > 0)
+        for slot, count in slot_plan(layout):
+            eligible_codes = [POSITIONS.index(position) for position in SLOT_ELIGIBILITY[slot]]
+            candidates = np.flatnonzero(available & np.isin(season_positions, eligible_codes))
+            if not len(candidates):
+                continue
+            candidates = candidates[np.lexsort((-points[candidates], group[candidates]))]
+            first, _ = _group_bounds(group[candidates])
+            chosen = candidates[np.arange(len(candidates)) - first < count]
+            optimal += np.bincount(group[chosen], weights=points[chosen], minlength=len(team_weeks))
+            available[chosen] = False
+
+    # Positions we can't resolve never make the computed lineup worse than the real one
+    optimal = np.maximum(optimal, actual)
+    return {
+        'season': team_weeks // 10000000,
+        'week': team_weeks // 100000 % 100,
+        'roster_id': team_weeks % 100000,
+        'actual': actual,
+        'optimal': optimal,
+        'bench_points': optimal - actual
+    }
+
+def lineup_efficiency(lineups):
+    """Per (season, roster_id) totals: {(season, roster_id): {actual_points, optimal_points, bench_points,
+    efficiency, perfect_weeks, weeks}}"""
+    keys = lineups['season'] * 100000 + lineups['roster_id']
+    teams, group = np.unique(keys, return_inverse=True)
+    actual = np.bincount(group, weights=lineups['actual'], minlength=len(teams))
+    optimal = np.bincount(group, weights=lineups['optimal'], minlength=len(teams))
+    perfect = np.bincount(group, weights=np.isclose(lineups['bench_points'], 0.0), minlength=len(teams))
+    weeks = np.bincount(group, minlength=len(teams))
+
+    return {(int(key // 100000), int(key % 100000)): {
+        'actual_points': float(actual[i]),
+        'optimal_points': float(optimal[i]),
+        'bench_points': float(optimal[i] - actual[i]),
+        'efficiency': float(actual[i] / optimal[i]) if optimal[i] else 1.0,
+        'perfect_weeks': int(perfect[i]),
+        'weeks': int(weeks[i])
+    } for i, key in enumerate(teams)}
+
+def display_lineup_efficiency(efficiency, team_mapping, year):
+    """Print one season's manager efficiency, best first"""
+    teams = [(roster_id, stats) for (season, roster_id), stats in efficiency.items() if season == year]
+    if not teams:
+        return
+    print(f"\n🪑 {year} Lineup Efficiency (actual vs. optimal starters)")
+    print(f"{'Team':<25} {'Actual':<9} {'Optimal':<9} {'Bench':<8} {'Eff':<7} {'Perfect':<7}")
+    print("-" * 70)
+    for roster_id, stats in sorted(teams, key=lambda item: item[1]['efficiency'], reverse=True):
+        team_name = team_mapping.get(roster_id, {}).get('team_name', f'Team {roster_id}')
+        print(f"{team_name[:24]:<25} {stats['actual_points']:<9.1f} {stats['optimal_points']:<9.1f} "
+              f"{stats['bench_points']:<8.1f} {stats['efficiency']:<7.1%} {stats['perfect_weeks']}/{stats['weeks']}")
@@ -0,0 +1,266 @@
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+import main
+from fetcher import configure_shared_client, fetch_json
+from response_cache import ResponseCache
+from rolling_stats import DEFAULT_EWMA_ALPHA, DEFAULT_WINDOWS, compute_rolling_stats
+
+DEFAULT_MIN_INTERVAL = 30
+DEFAULT_MAX_INTERVAL = 300
+BACKOFF_FACTOR = 1.5
+STATE_CHECK_EVERY = 10
+
+class LiveStandings:
+    """Season standings that absorb repeated polls of the current week in O(teams).
+
+    Everything about completed weeks (totals, weeks played, the partial
+    trailing-window sums, the EWMA through last week, the season high/low)
+    is folded into per-team base values once. Each poll only replaces the
+    current week's points, so its cost doesn't depend on history size.
+    """
+
+    def __init__(self, year, history_weekly_scores, current_week, team_mapping,
+                 windows=DEFAULT_WINDOWS, ewma_alpha=DEFAULT_EWMA_ALPHA):
+        self.year = year
+        self.current_week = current_week
+        self.team_mapping = team_mapping
+        self.windows = tuple(windows)
+        self.ewma_alpha = ewma_alpha
+        self.current = {}  # roster_id -> this week's points so far
+
+        history = {week: data for week, data in history_weekly_scores.items() if week < current_week}
+        team_stats = main.calculate_season_summary(history)
+        rolling_data = compute_rolling_stats(history, self.windows, ewma_alpha)
+        self.season_high, self.season_low = main.find_highest_lowest_weeks(history)
+
+        self.base = {}
+        for roster_id in set(team_stats) | set(team_mapping):
+            stats = team_stats.get(roster_id, {})
+            week_points = {entry['week']: entry['points'] for entry in stats.get('weekly_scores', [])}
+            rolling_averages = rolling_data.get(roster_id, {}).get('rolling_averages', {})
+            last_week = max(rolling_averages) if rolling_averages else None
+
+            window_base = {}
+            for window in self.windows:
+                # The completed weeks that stay inside the window once this week is added
+                recent = [points for week, points in week_points.items() if week > current_week - window]
+                window_base[window] = (sum(recent), len(recent))
+
+            self.base[roster_id] = {
+                'total_points': stats.get('total_points', 0),
+                'weeks_played': stats.get('weeks_played', 0),
+                'window_base': window_base,
+                'ewma': rolling_averages[last_week]['ewma'] if last_week is not None else None
+            }
+
+    def _team_info(self, roster_id):
+        return self.team_mapping.get(roster_id, {'team_name': f'Team {roster_id}', 'owner_name': 'Unknown'})
+
+    def apply(self, matchups):
+        """Apply one poll of the current week's matchups; returns the list of changed teams"""
+        deltas = []
+        for matchup in matchups or []:
+            roster_id = matchup['roster_id']
+            new_points = matchup.get('points', 0) or 0
+            old_points = self.current.get(roster_id)
+            if old_points == new_points:
+                continue
+            self.current[roster_id] = new_points
+            deltas.append({
+                'roster_id': roster_id,
+                'team_name': self._team_info(roster_id)['team_name'],
+                'old_points': old_points or 0,
+                'new_points': new_points,
+                'delta': new_points - (old_points or 0)
+            })
+        return deltas
+
+    def team_line(self, roster_id):
+        base = self.base.get(roster_id) or {
+            'total_points': 0, 'weeks_played': 0, 'ewma': None,
+            'window_base': {window: (0, 0) for window in self.windows}
+        }
+        playing = roster_id in self.current
+        points = self.current.get(roster_id, 0)
+        total = base['total_points'] + points
+        weeks = base['weeks_played'] + (1 if playing else 0)
+
+        line = {
+            'roster_id': roster_id,
+            'team_name': self._team_info(roster_id)['team_name'],
+            'owner_name': self._team_info(roster_id)['owner_name'],
+            'week_points': points,
+            'total_points': total,
+            'weeks_played': weeks,
+            'average_points': total / weeks if weeks else 0
+        }
+        for window in self.windows:
+            window_sum, window_count = base['window_base'][window]
+            if playing:
+                window_sum, window_count = window_sum + points, window_count + 1
+            line[f'trailing_{window}'] = window_sum / window_count if window_count else 0
+        if base['ewma'] is None:
+            line['ewma'] = points if playing else 0
+        elif playing:
+            line['ewma'] = self.ewma_alpha * points + (1 - self.ewma_alpha) * base['ewma']
+        else:
+            line['ewma'] = base['ewma']
+        return line
+
+    def standings(self):
+        lines = [self.team_line(roster_id) for roster_id in self.base.keys() | self.current.keys()]
+        return sorted(lines, key=lambda line: line['total_points'], reverse=True)
+
+    def highs_lows(self):
+        """Season high (the live week can set it) and season low (completed weeks only).
+
+        A team's score only climbs while its week is played, so a live high
+        already stands; a live low is just an unfinished week and is
+        reported by provisional_low() instead.
+        """
+        highest = self.season_high
+        if self.current:
+            top_id = max(self.current, key=self.current.get)
+            if highest is None or self.current[top_id] > highest['points']:
+                highest = {'week': self.current_week, 'roster_id': top_id, 'points': self.current[top_id],
+                           'team_name': self._team_info(top_id)['team_name']}
+        return highest, self.season_low
+
+    def provisional_low(self):
+        """Lowest score of the live week so far, or None before any poll"""
+        if not self.current:
+            return None
+        bottom_id = min(self.current, key=self.current.get)
+        return {'week': self.current_week, 'roster_id': bottom_id, 'points': self.current[bottom_id],
+                'team_name': self._team_info(bottom_id)['team_name']}
+
+class ConsoleSink:
+    """Print score changes and the refreshed standings"""
+
+    def __init__(self, top=None):
+        self.top = top
+
+    def publish(self, live, deltas):
+        stamp = datetime.now().strftime("%H:%M:%S")
+        print(f"\n⏱️  {stamp} - {live.year} Week {live.current_week}: {len(deltas)} teams changed")
+        for delta in deltas:
+            print(f"   {delta['team_name'][:24]:<25} {delta['old_points']:>7.1f} -> {delta['new_points']:>7.1f} "
+                  f"({delta['delta']:+.1f})")
+
+        print(f"{'Rank':<4} {'Team':<25} {'Week':<7} {'Total':<8} {'Avg':<6} {'EWMA':<6}")
+        print("-" * 60)
+        for i, line in enumerate(live.standings()[:self.top], 1):
+            print(f"{i:<4} {line['team_name'][:24]:<25} {line['week_points']:<7.1f} {line['total_points']:<8.1f} "
+                  f"{line['average_points']:<6.1f} {line['ewma']:<6.1f}")
+
+        highest, lowest = live.highs_lows()
+        if highest:
+            print(f"🏆 High: {highest['team_name']} - Week {highest['week']} - {highest['points']:.1f} pts")
+        if lowest:
+            print(f"💀 Low: {lowest['team_name']} - Week {lowest['week']} - {lowest['points']:.1f} pts")
+        provisional = live.provisional_low()
+        if provisional:
+            print(f"⏳ Week {provisional['week']} low so far (not final): {provisional['team_name']} - "
+                  f"{provisional['points']:.1f} pts")
+
+class FileSink:
+    """Atomically rewrite a JSON snapshot of the live standings after every change"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def publish(self, live, deltas):
+        highest, lowest = live.highs_lows()
+        snapshot = {
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+            'season': live.year,
+            'week': live.current_week,
+            'changes': deltas,
+            'standings': live.standings(),
+            'high': highest,
+            'low': lowest,
+            'provisional_low': live.provisional_low()
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+def load_live_standings(year, league_id, base_url, cache=None, nfl_state=None, windows=DEFAULT_WINDOWS,
+                        ewma_alpha=DEFAULT_EWMA_ALPHA):
+    """Load the season's completed weeks (through the cache) and build LiveStandings for the current week"""
+    nfl_state = nfl_state or main.get_nfl_state(base_url, cache) or {}
+    current_week = int(nfl_state.get('week', 1) or 1)
+
+    season_data = main.fetch_season_data(year, league_id, base_url, cache)
+    if season_data is None:
+        raise RuntimeError(f"Could not load {year} season history")
+    return LiveStandings(year, season_data['weekly_scores'], current_week, season_data['team_mapping'],
+                         windows, ewma_alpha)
+
+def run_live(year, league_id, base_url, sinks, cache=None, min_interval=DEFAULT_MIN_INTERVAL,
+             max_interval=DEFAULT_MAX_INTERVAL, max_polls=None):
+    """Poll the current week's matchups until interrupted, pushing deltas to every sink.
+
+    The interval drops to min_interval whenever scores move and backs off
+    towards max_interval while they don't. The NFL state is rechecked every
+    STATE_CHECK_EVERY polls so a new week reloads the history once.
+    """
+    live = load_live_standings(year, league_id, base_url, cache)
+    interval = min_interval
+    polls = 0
+    print(f"📡 Live mode: {year} week {live.current_week}, polling every {min_interval}-{max_interval}s (Ctrl+C to stop)")
+
+    try:
+        while max_polls is None or polls < max_polls:
+            polls += 1
+            if polls % STATE_CHECK_EVERY == 0:
+                nfl_state = main.get_nfl_state(base_url) or {}
+                if int(nfl_state.get('week', live.current_week) or live.current_week) != live.current_week:
+                    print("🔄 NFL week changed, reloading season history...")
+                    live = load_live_standings(year, league_id, base_url, cache, nfl_state,
+                                               live.windows, live.ewma_alpha)
+
+            matchups = fetch_json(f"{base_url}/league/{league_id}/matchups/{live.current_week}")
+            deltas = live.apply(matchups) if matchups else []
+            if deltas:
+                for sink in sinks:
+                    sink.publish(live, deltas)
+                interval = min_interval
+            else:
+                interval = min(interval * BACKOFF_FACTOR, max_interval)
+
+            if max_polls is None or polls < max_polls:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\n👋 Live mode stopped")
+    return live
+
+def main_live(argv=None):
+    parser = argparse.ArgumentParser(description="Poll the current week and keep standings up to date")
+    parser.add_argument('--config', default='league_data.json')
+    parser.add_argument('--interval', type=float, default=DEFAULT_MIN_INTERVAL, help="seconds between polls while scores move")
+    parser.add_argument('--max-interval', type=float, default=DEFAULT_MAX_INTERVAL)
+    parser.add_argument('--output', help="also write a JSON snapshot to this file")
+    parser.add_argument('--polls', type=int, default=None, help="stop after this many polls")
+    args = parser.parse_args(argv)
+
+    league_data = main.load_json(args.config)
+    settings = league_data.get('settings', {})
+    year = int(league_data.get('current_season'))
+    league_id = league_data['league_ids'][str(year)]
+    base_url = league_data.get('api', {}).get('base_url', main.DEFAULT_BASE_URL)
+
+    configure_shared_client(settings)
+    sinks = [ConsoleSink()]
+    if args.output:
+        sinks.append(FileSink(args.output))
+    return run_live(year, league_id, base_url, sinks, ResponseCache.from_config(settings),
+                    args.interval, args.max_interval, args.polls)
+
+if __name__ == "__main__":
+    main_live()
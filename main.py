@@ -1,48 +1,60 @@
+"""Sleeper multi-year analyzer.
+
+Only the standard library and the pure-Python helpers are imported at
+module load. requests, numpy and the subsystems built on them (fetching,
+the score store, exporters, rankings) are imported by the functions that
+use them, so `import main` stays cheap for callers that only need a
+helper or two.
+"""
+import heapq
 import sys
-import requests
 import json
 from datetime import datetime
 
+from metrics import METRICS
+from response_cache import ResponseCache, cached_get_json
+
+DEFAULT_BASE_URL = "https://api.sleeper.app/v1"
+
 def load_json(file_path):
     with open(file_path, 'r') as f:
         return json.load(f)
 
-def rosters_response(league_id, base_url):
+def rosters_response(league_id, base_url, cache=None, immutable=False):
+    import requests
+
+    from fetcher import get_shared_client
+
     data = {}
     try:
-        response = requests.get(f"{base_url}/league/{league_id}/rosters")
-        response.raise_for_status()  # Raise an error for bad responses
-        data = response.json()
+        data = cached_get_json(get_shared_client(), f"{base_url}/league/{league_id}/rosters", cache, immutable)
         print(f"API response for league {league_id} is successful.")
     except requests.exceptions.RequestException as e:
         print(f"Error fetching data from API: {e}")
     return data
 
-def users_response(league_id, base_url):
+def users_response(league_id, base_url, cache=None, immutable=False):
+    import requests
+
+    from fetcher import get_shared_client
+
     data = {}
     try:
-        response = requests.get(f"{base_url}/league/{league_id}/users")
-        response.raise_for_status()  # Raise an error for bad responses
-        data = response.json()
+        data = cached_get_json(get_shared_client(), f"{base_url}/league/{league_id}/users", cache, immutable)
         print(f"API response for league {league_id} is successful.")
     except requests.exceptions.RequestException as e:
         print(f"Error fetching data from API: {e}")
     return data
 
-def matchup_response(league_id, base_url, max_week=17):
-    all_scores = {}
-    for i in range(1,max_week + 1):
-        try:
-            response = requests.get(f"{base_url}/league/{league_id}/matchups/{str(i)}")
-            response.raise_for_status()  # Raise an error for bad responses
-            data = response.json()
-            if data:
-                all_scores[i] = data
-            else:
-                print(f"No data found for week {i}.")
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching data from API: {e}")
-    return all_scores
+def matchup_response(league_id, base_url, max_week=17, max_workers=None, cache=None):
+    """Fetch every week's matchups for one league concurrently"""
+    from fetcher import DEFAULT_MAX_WORKERS, fetch_seasons
+
+    season = fetch_seasons([(None, league_id, max_week)], base_url, max_workers or DEFAULT_MAX_WORKERS,
+                           cache=cache)[None]
+    if season['missing_weeks']:
+        print(f"⚠️  Missing weeks after retries: {', '.join(str(week) for week in season['missing_weeks'])}")
+    return season['matchups']
 
 def get_team_names_mapping(users, rosters):
     """Create a mapping of roster_id to team names and owner info"""
@@ -68,13 +80,15 @@ def get_team_names_mapping(users, rosters):
             team_mapping[roster_id] = {
                 'team_name': team_name,
                 'owner_name': user['display_name'],
-                'username': user['username']
+                'username': user['username'],
+                'user_id': owner_id
             }
         else:
             team_mapping[roster_id] = {
                 'team_name': f'Team {roster_id}',
                 'owner_name': 'Unknown Owner',
-                'username': 'unknown'
+                'username': 'unknown',
+                'user_id': None
             }
     
     return team_mapping
@@ -103,13 +117,19 @@ def organize_weekly_scores(matchups_data, team_mapping):
                 'points': points,
                 'matchup_id': matchup_id,
                 'starters': matchup.get('starters', []),
-                'players': matchup.get('players', [])
+                'players': matchup.get('players', []),
+                'starters_points': matchup.get('starters_points', []),
+                'players_points': matchup.get('players_points', {})
             }
     
     return weekly_scores
 
 def calculate_season_summary(weekly_scores):
     """Calculate season totals, averages, and standings"""
+    # ScoreStore season views compute it from their arrays
+    if hasattr(weekly_scores, 'season_summary'):
+        return weekly_scores.season_summary()
+    
     team_stats = {}
     
     # Calculate totals for each team
@@ -160,6 +180,9 @@ def display_season_summary(team_stats):
 
 def find_highest_lowest_weeks(weekly_scores):
     """Find the highest and lowest scoring weeks across all teams"""
+    if hasattr(weekly_scores, 'highest_lowest'):
+        return weekly_scores.highest_lowest()
+    
     all_scores = []
     
     for week, week_data in weekly_scores.items():
@@ -175,20 +198,30 @@ def find_highest_lowest_weeks(weekly_scores):
     if not all_scores:
         return None, None
     
-    # Sort by points
-    all_scores.sort(key=lambda x: x['points'], reverse=True)
-    
-    highest = all_scores[0]
-    lowest = all_scores[-1]
+    # First of any tied highs, last of any tied lows - what a stable sort would give
+    highest = max(all_scores, key=lambda x: x['points'])
+    lowest = min(reversed(all_scores), key=lambda x: x['points'])
     
     return highest, lowest
 
-def get_current_nfl_week(year):
-    """Get current NFL week for a given year"""
+def get_nfl_state(base_url=DEFAULT_BASE_URL, cache=None):
+    """Get Sleeper's NFL state (current season and week), or None if unavailable"""
+    import requests
+
+    from fetcher import get_shared_client
+
     try:
-        response = requests.get("https://api.sleeper.app/v1/state/nfl")
-        nfl_state = response.json()
-        
+        return cached_get_json(get_shared_client(), f"{base_url}/state/nfl", cache)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Error fetching NFL state from API: {e}")
+        return None
+
+def get_current_nfl_week(year, base_url=DEFAULT_BASE_URL, cache=None, nfl_state=None):
+    """Get current NFL week for a given year"""
+    if nfl_state is None:
+        nfl_state = get_nfl_state(base_url, cache)
+    
+    if nfl_state:
         current_season = nfl_state.get('season', '2024')
         current_week = nfl_state.get('week', 1)
         
@@ -198,27 +231,15 @@ def get_current_nfl_week(year):
         else:
             # For past seasons, assume full 17 weeks
             return 17
-    except:
+    else:
         # Fallback logic
         if year == 2025:
             return 2  # You mentioned 2025 only has 2 weeks
         else:
             return 17  # Past seasons are complete
 
-def fetch_season_data(year, league_id, base_url):
-    """Fetch data for a specific season"""
-    print(f"\n🏈 Fetching data for {year} season...")
-    print(f"   League ID: {league_id}")
-    
-    # Determine how many weeks to fetch
-    max_weeks = get_current_nfl_week(year)
-    print(f"   Fetching {max_weeks} weeks of data...")
-    
-    # Fetch all data for this season
-    rosters = rosters_response(league_id, base_url)
-    users = users_response(league_id, base_url)
-    matchups = matchup_response(league_id, base_url, max_weeks)
-    
+def build_season_data(year, rosters, users, matchups, max_weeks, store=None, player_index=None, missing_weeks=()):
+    """Turn one season's raw API payloads into the organized season record"""
     if not rosters or not users or not matchups:
         print(f"   ❌ Failed to fetch data for {year}")
         return None
@@ -227,24 +248,187 @@ def fetch_season_data(year, league_id, base_url):
     
     # Create team mapping and organize scores
     team_mapping = get_team_names_mapping(users, rosters)
-    weekly_scores = organize_weekly_scores(matchups, team_mapping)
+    if store is not None:
+        store.add_season(year, matchups, team_mapping)
+        weekly_scores = store.season_view(year)
+    else:
+        weekly_scores = organize_weekly_scores(matchups, team_mapping)
+    if player_index is not None:
+        player_index.add_season(year, matchups)
+    METRICS.incr('records_processed', sum(len(week_matchups) for week_matchups in matchups.values()))
+    
+    if missing_weeks:
+        print(f"   ⚠️  {year}: weeks {', '.join(str(week) for week in missing_weeks)} failed after retries")
     
     return {
         'year': year,
         'weekly_scores': weekly_scores,
         'team_mapping': team_mapping,
-        'weeks_fetched': max_weeks
+        'weeks_fetched': max_weeks,
+        'missing_weeks': list(missing_weeks)
     }
 
+def queue_seasons(league_ids, base_url, cache=None, nfl_state=None):
+    """[(year, league_id, max_weeks)] for every configured season, oldest first"""
+    seasons = []
+    for year, league_id in sorted(league_ids.items()):
+        year = int(year)
+        # Determine how many weeks to fetch
+        max_weeks = get_current_nfl_week(year, base_url, cache, nfl_state)
+        print(f"\n🏈 Queuing {year} season (League ID: {league_id}, {max_weeks} weeks)")
+        seasons.append((year, league_id, max_weeks))
+    return seasons
+
+def organize_season(year, league_id, max_weeks, raw, store=None, player_index=None, db=None):
+    """Sync one season's raw payloads into the database (if any) and build its season record"""
+    if db is not None and raw['matchups']:
+        from db_store import sync_season
+
+        counts = sync_season(db, year, league_id, raw['rosters'], raw['users'], raw['matchups'])
+        print(f"   🗄️  {year}: {counts['inserted']} new, {counts['updated']} changed, "
+              f"{counts['unchanged']} unchanged weeks in database")
+    season_data = build_season_data(year, raw['rosters'], raw['users'], raw['matchups'], max_weeks,
+                                    store, player_index, raw['missing_weeks'])
+    if season_data:
+        season_data['roster_positions'] = (raw.get('league') or {}).get('roster_positions', [])
+    return season_data
+
+def fetch_season_data(year, league_id, base_url, cache=None):
+    """Fetch data for a specific season"""
+    season_data = fetch_all_season_data({str(year): league_id}, base_url, cache=cache)
+    return season_data[0] if season_data else None
+
+def fetch_all_season_data(league_ids, base_url, max_workers=None, cache=None, store=None,
+                          player_index=None, db=None):
+    """Fetch every season's rosters, users and matchups together and organize them.
+    
+    With a ScoreStore, seasons are appended to it and each season's
+    'weekly_scores' is a view into the store instead of nested dicts.
+    With a PlayerScoreIndex, per-player points are ingested into it too.
+    With a database connection, raw payloads are synced into it incrementally.
+    """
+    from fetcher import DEFAULT_MAX_WORKERS, fetch_seasons
+
+    max_workers = max_workers or DEFAULT_MAX_WORKERS
+    nfl_state = get_nfl_state(base_url, cache)
+    seasons = queue_seasons(league_ids, base_url, cache, nfl_state)
+    
+    print(f"\n⚡ Fetching {len(seasons)} seasons with up to {max_workers} concurrent requests...")
+    with METRICS.stage('fetch'):
+        raw_seasons = fetch_seasons(seasons, base_url, max_workers, cache=cache, nfl_state=nfl_state)
+    if cache is not None:
+        print(f"💾 Cache: {cache.hits} hits, {cache.misses} misses")
+    
+    all_season_data = []
+    with METRICS.stage('organize'):
+        for year, league_id, max_weeks in seasons:
+            season_data = organize_season(year, league_id, max_weeks, raw_seasons[year], store, player_index, db)
+            if season_data:
+                all_season_data.append(season_data)
+    
+    return all_season_data
+
+def iter_season_data(league_ids, base_url, max_workers=None, cache=None, db=None, player_index=None):
+    """Yield organized seasons one at a time, oldest first.
+    
+    Each season gets its own ScoreStore and its raw payloads are dropped
+    once organized, so team scores are bounded by one season no matter
+    how many are configured. Player points go into one PlayerScoreIndex
+    shared by every season (season_data['player_index']), a few numeric
+    columns per player-week, so career queries still span all seasons.
+    The next season is fetched in the background while the caller works
+    on the current one.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from fetcher import DEFAULT_MAX_WORKERS, fetch_seasons
+    from player_scores import PlayerScoreIndex
+    from score_store import ScoreStore
+
+    max_workers = max_workers or DEFAULT_MAX_WORKERS
+    player_index = player_index if player_index is not None else PlayerScoreIndex()
+    nfl_state = get_nfl_state(base_url, cache)
+    seasons = queue_seasons(league_ids, base_url, cache, nfl_state)
+    
+    def fetch(season):
+        return fetch_seasons([season], base_url, max_workers, cache=cache, nfl_state=nfl_state)[season[0]]
+    
+    # The fetch stage on this thread only waits on the prefetch, so profile the prefetch where it runs
+    fetch = METRICS.profiled('fetch', fetch)
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        pending = prefetcher.submit(fetch, seasons[0]) if seasons else None
+        for i, (year, league_id, max_weeks) in enumerate(seasons):
+            print(f"\n⚡ Fetching {year} with up to {max_workers} concurrent requests...")
+            with METRICS.stage('fetch'):
+                raw = pending.result()
+            pending = prefetcher.submit(fetch, seasons[i + 1]) if i + 1 < len(seasons) else None
+            
+            with METRICS.stage('organize'):
+                season_data = organize_season(year, league_id, max_weeks, raw, ScoreStore(), player_index, db)
+            del raw
+            if season_data:
+                season_data['player_index'] = player_index
+                yield season_data
+
+def sync_season_transactions(db, league_ids, season_list, base_url, max_workers=None, cache=None):
+    """Pull the new or still-open weeks of transactions for seasons already synced to the database"""
+    from transactions import sync_league_transactions
+
+    seasons = [(season_data['year'], league_ids[str(season_data['year'])], season_data['weeks_fetched'])
+               for season_data in season_list]
+    with METRICS.stage('transactions'):
+        counts = sync_league_transactions(db, seasons, base_url, max_workers, cache, get_nfl_state(base_url, cache))
+    for year, season_counts in counts.items():
+        print(f"   🔁 {year}: {season_counts['requested']} transaction weeks requested, "
+              f"{season_counts['inserted']} new, {season_counts['updated']} changed")
+    return counts
+
+def season_playoff_odds(year, league_id, base_url, simulation=None, cache=None, weekly_scores=None, nfl_state=None,
+                        iterations=None, workers=None, seed=None):
+    """Simulate the rest of an in-progress season; None when the regular season isn't underway"""
+    from playoff_odds import (DEFAULT_ITERATIONS, DEFAULT_PLAYOFF_TEAMS, DEFAULT_REGULAR_SEASON_WEEKS, DEFAULT_SEED,
+                              remaining_schedule, simulate_playoff_odds)
+
+    simulation = simulation or {}
+    regular_season_weeks = simulation.get('regular_season_weeks', DEFAULT_REGULAR_SEASON_WEEKS)
+    nfl_state = nfl_state or get_nfl_state(base_url, cache) or {}
+    if str(nfl_state.get('season')) != str(year):
+        return None
+    # The current NFL week is still being played
+    completed_through = int(nfl_state.get('week', 1) or 1) - 1
+    if completed_through < 1 or completed_through >= regular_season_weeks:
+        return None
+    
+    if weekly_scores is None:
+        season_data = fetch_season_data(year, league_id, base_url, cache)
+        if season_data is None:
+            return None
+        weekly_scores = season_data['weekly_scores']
+    
+    schedule = remaining_schedule(league_id, base_url, weekly_scores, completed_through, regular_season_weeks, cache)
+    return simulate_playoff_odds(
+        weekly_scores, schedule, completed_through,
+        iterations=iterations or simulation.get('iterations', DEFAULT_ITERATIONS),
+        playoff_teams=simulation.get('playoff_teams', DEFAULT_PLAYOFF_TEAMS),
+        seed=seed if seed is not None else simulation.get('seed', DEFAULT_SEED),
+        workers=workers or simulation.get('workers', 1)
+    )
+
 def combine_multi_year_data(season_data_list):
-    """Combine data from multiple seasons"""
+    """Combine data from multiple seasons.
+
+    Roster IDs are reused across seasons, so each team-week is tagged with
+    its owner's user_id and the returned team mapping is keyed by user_id.
+    """
+    from owners import OwnerIndex
+
     combined_weekly_scores = {}
-    all_team_mappings = {}
+    owners = OwnerIndex()
     
     for season_data in season_data_list:
         year = season_data['year']
         weekly_scores = season_data['weekly_scores']
-        team_mapping = season_data['team_mapping']
+        owners.add_season(year, season_data['team_mapping'])
         
         # Add year prefix to weeks to avoid conflicts
         for week, week_data in weekly_scores.items():
@@ -256,230 +440,209 @@ def combine_multi_year_data(season_data_list):
                 team_data_copy = team_data.copy()
                 team_data_copy['season'] = year
                 team_data_copy['original_week'] = week
+                team_data_copy['user_id'] = owners.owner_of(year, roster_id)
                 combined_weekly_scores[year_week_key][roster_id] = team_data_copy
         
-        # Keep track of team mappings (use most recent)
-        all_team_mappings.update(team_mapping)
-    
-    return combined_weekly_scores, all_team_mappings
+    return combined_weekly_scores, owners.team_mapping()
 
-def calculate_rolling_averages(weekly_scores):
+def calculate_rolling_averages(weekly_scores, windows=None, ewma_alpha=None):
     """Calculate rolling averages for each team by week"""
-    rolling_data = {}
-    
-    # Get all teams and weeks
-    all_weeks = sorted(weekly_scores.keys())
-    all_teams = set()
-    for week_data in weekly_scores.values():
-        all_teams.update(week_data.keys())
-    
-    # Initialize rolling data for each team
-    for roster_id in all_teams:
-        rolling_data[roster_id] = {
-            'team_name': '',
-            'owner_name': '',
-            'weekly_totals': {},
-            'rolling_averages': {}
-        }
-    
-    # Calculate rolling averages week by week
-    for week in all_weeks:
-        week_data = weekly_scores.get(week, {})
-        
-        for roster_id in all_teams:
-            if roster_id in week_data:
-                team_data = week_data[roster_id]
-                
-                # Store team info (use latest available)
-                rolling_data[roster_id]['team_name'] = team_data['team_name']
-                rolling_data[roster_id]['owner_name'] = team_data['owner_name']
-                
-                # Store this week's score
-                rolling_data[roster_id]['weekly_totals'][week] = team_data['points']
-                
-                # Calculate rolling average up to this week
-                weeks_played = []
-                total_points = 0
-                
-                for w in all_weeks:
-                    if w > week:  # Only include weeks up to current week
-                        break
-                    if roster_id in weekly_scores.get(w, {}):
-                        points = weekly_scores[w][roster_id]['points']
-                        weeks_played.append(w)
-                        total_points += points
-                
-                if weeks_played:
-                    rolling_avg = total_points / len(weeks_played)
-                    rolling_data[roster_id]['rolling_averages'][week] = {
-                        'average': rolling_avg,
-                        'weeks_included': len(weeks_played),
-                        'total_points': total_points
-                    }
-    
-    return rolling_data
-
-def export_multi_year_excel_with_rolling(combined_weekly_scores, team_mapping):
-    """Export multi-year data to Excel with rolling averages - one tab per year"""
-    try:
-        import pandas as pd
-    except ImportError:
-        print("pandas is required for Excel export. Installing...")
-        import subprocess
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "pandas", "openpyxl"])
-        import pandas as pd
-    
-    print("Preparing multi-year data with rolling averages for Excel export...")
-    
-    # Organize data by season
-    seasons_combined_data = {}
-    
-    for year_week_key, week_data in sorted(combined_weekly_scores.items()):
-        year = year_week_key.split('_')[0]
-        week = int(year_week_key.split('_W')[1])
-        
-        if year not in seasons_combined_data:
-            seasons_combined_data[year] = []
-        
-        # Get just this season's weekly scores for rolling average calculation
-        season_weekly_scores = {}
-        for ywk, wk_data in combined_weekly_scores.items():
-            if ywk.startswith(year + '_'):
-                wk_num = int(ywk.split('_W')[1])
-                season_weekly_scores[wk_num] = wk_data
-        
-        # Calculate rolling averages for this season
-        rolling_data = calculate_rolling_averages(season_weekly_scores)
-        
-        # Combine weekly scores with rolling averages
-        for roster_id, team_data in week_data.items():
-            rolling_avg = 0
-            total_points = 0
-            
-            if roster_id in rolling_data and week in rolling_data[roster_id]['rolling_averages']:
-                rolling_info = rolling_data[roster_id]['rolling_averages'][week]
-                rolling_avg = rolling_info['average']
-                total_points = rolling_info['total_points']
-            
-            combined_record = {
-                'Season': year,
-                'Week': week,
-                'Team_Name': team_data['team_name'],
-                'Owner_Name': team_data['owner_name'],
-                'Rolling_Average': round(rolling_avg, 2),
-                'Total_Points': round(total_points, 2),
-                'Weekly_Score': round(team_data['points'], 2)
-            }
-            seasons_combined_data[year].append(combined_record)
-    
-    # Export to Excel with one tab per year
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"fantasy_multi_year_scores_{timestamp}.xlsx"
-    
-    with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-        # Create Career tab with all data combined
-        all_career_data = []
-        for year in sorted(seasons_combined_data.keys()):
-            all_career_data.extend(seasons_combined_data[year])
-        
-        career_df = pd.DataFrame(all_career_data)
-        # Ensure columns are in the exact order requested
-        career_df = career_df[['Season', 'Week', 'Team_Name', 'Owner_Name', 'Rolling_Average', 'Total_Points', 'Weekly_Score']]
-        career_df.to_excel(writer, sheet_name='Career', index=False)
-        
-        # Individual season sheets with combined data
-        for year in sorted(seasons_combined_data.keys()):
-            season_df = pd.DataFrame(seasons_combined_data[year])
-            # Ensure columns are in the exact order requested
-            season_df = season_df[['Season', 'Week', 'Team_Name', 'Owner_Name', 'Rolling_Average', 'Total_Points', 'Weekly_Score']]
-            season_df.to_excel(writer, sheet_name=f'{year}', index=False)
-        
-        # Auto-adjust column widths for all sheets
-        for sheet_name in writer.sheets:
-            worksheet = writer.sheets[sheet_name]
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-    
-    print(f"✅ Multi-year data with rolling averages exported to Excel: {filename}")
-    total_records = sum(len(data) for data in seasons_combined_data.values())
-    print(f"� Total records: {total_records}")
-    print(f"📋 Seasons included: {', '.join(sorted(seasons_combined_data.keys()))}")
+    from rolling_stats import DEFAULT_EWMA_ALPHA, DEFAULT_WINDOWS, compute_rolling_stats
+
+    return compute_rolling_stats(weekly_scores, windows or DEFAULT_WINDOWS,
+                                 DEFAULT_EWMA_ALPHA if ewma_alpha is None else ewma_alpha)
+
+def export_multi_year(combined_weekly_scores, rolling_by_season=None, windows=None,
+                      formats=('xlsx',), csv_chunk_rows=None, basename=None,
+                      records_by_season=None):
+    """Export multi-year data with rolling averages in each requested format - one table per year"""
+    from exporters import DEFAULT_CSV_CHUNK_ROWS, export_column_names, export_seasons, season_export_columns
+    from rolling_stats import DEFAULT_WINDOWS
+    from score_store import ScoreStore
+
+    windows = windows or DEFAULT_WINDOWS
+    print("Preparing multi-year data with rolling averages for export...")
+    
+    # Split the combined weeks back out by season
+    season_weekly_scores = {}
+    if isinstance(combined_weekly_scores, ScoreStore):
+        for year in combined_weekly_scores.seasons():
+            season_weekly_scores[str(year)] = combined_weekly_scores.season_view(year)
+    else:
+        for year_week_key, week_data in combined_weekly_scores.items():
+            year = year_week_key.split('_')[0]
+            week = int(year_week_key.split('_W')[1])
+            season_weekly_scores.setdefault(year, {})[week] = week_data
+    
+    # Calculate rolling stats once per season (reuse the caller's if provided)
+    rolling_by_season = {str(year): data for year, data in (rolling_by_season or {}).items()}
+    records_by_season = {str(year): data for year, data in (records_by_season or {}).items()}
+    season_tables = {}
+    for year, weekly_scores in season_weekly_scores.items():
+        if year not in rolling_by_season:
+            rolling_by_season[year] = calculate_rolling_averages(weekly_scores, windows)
+        season_tables[year] = season_export_columns(year, weekly_scores, rolling_by_season[year], windows,
+                                                    records_by_season.get(year))
+    
+    written = export_seasons(season_tables, export_column_names(windows), formats, basename,
+                             csv_chunk_rows or DEFAULT_CSV_CHUNK_ROWS)
+    
+    for export_format, filename in written.items():
+        print(f"✅ Multi-year data with rolling averages exported to {export_format}: {filename}")
+    total_records = sum(len(table['Week']) for table in season_tables.values())
+    print(f"📊 Total records: {total_records}")
+    print(f"📋 Seasons included: {', '.join(sorted(season_tables.keys()))}")
     
     # Show summary by season
-    for year in sorted(seasons_combined_data.keys()):
-        season_records = len(seasons_combined_data[year])
-        max_week = max(record['Week'] for record in seasons_combined_data[year])
+    for year in sorted(season_tables.keys()):
+        season_records = len(season_tables[year]['Week'])
+        max_week = max(season_tables[year]['Week'], default=0)
         print(f"   {year}: {season_records} records, {max_week} weeks")
     
-    return filename
-    """Export weekly scores to Excel format"""
-    try:
-        import pandas as pd
-    except ImportError:
-        print("pandas is required for Excel export. Installing...")
-        import subprocess
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "pandas", "openpyxl"])
-        import pandas as pd
-    
-    print("Preparing data for Excel export...")
-    
-    # Prepare data for Excel
-    excel_data = []
-    
-    for week, week_data in sorted(weekly_scores.items()):
-        for roster_id, team_data in week_data.items():
-            excel_data.append({
-                'Week': week,
-                'Team_Name': team_data['team_name'],
-                'Owner_Name': team_data['owner_name'],
-                'Points': round(team_data['points'], 2)
-            })
-    
-    # Create DataFrame
-    df = pd.DataFrame(excel_data)
-    
-    # Export to Excel
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"fantasy_weekly_scores_{timestamp}.xlsx"
-    
-    # Create Excel writer object
-    with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-        # Write main data
-        df.to_excel(writer, sheet_name='Weekly Scores', index=False)
+    return written
+
+def export_multi_year_excel_with_rolling(combined_weekly_scores, team_mapping, rolling_by_season=None,
+                                        windows=None):
+    """Export multi-year data to Excel with rolling averages - one tab per year"""
+    return export_multi_year(combined_weekly_scores, rolling_by_season, windows, ('xlsx',))['xlsx']
+
+def default_profile_name():
+    return f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+def display_season_report(season_data, rolling_data, season_records, windows=None, players=None,
+                          book=None, current_season=None):
+    """Print one season's standings, records, high/low, rolling leaders and top starters.
+
+    players is an optional PlayerIndex used to name the top starters; book
+    is a RecordsBook the season has already been added to. The current
+    season also gets its early weeks printed per team for checking the data.
+    """
+    from records import format_record
+    from rolling_stats import DEFAULT_WINDOWS
+
+    windows = windows or DEFAULT_WINDOWS
+    year = season_data['year']
+    weekly_scores = season_data['weekly_scores']
+    weeks_fetched = season_data['weeks_fetched']
+    player_index = season_data.get('player_index')
+    
+    print(f"\n--- {year} SEASON ({weeks_fetched} weeks) ---")
+    if season_data['missing_weeks']:
+        print(f"⚠️  Missing weeks (not in totals): {', '.join(str(week) for week in season_data['missing_weeks'])}")
+
+    team_stats = calculate_season_summary(weekly_scores)
+
+    # Sort teams by total points for this season
+    sorted_teams = sorted(team_stats.items(), 
+                         key=lambda x: x[1]['total_points'], 
+                         reverse=True)
+
+    print(f"{'Rank':<4} {'Team':<25} {'Owner':<20} {'Total':<8} {'Avg':<6} {'W-L-T':<8} {'PA':<8} "
+          f"{'All-Play':<9} {'Strk':<4}")
+    print("-" * 100)
+
+    for i, (roster_id, stats) in enumerate(sorted_teams, 1):
+        record = season_records.get(roster_id)
+        record_cols = ""
+        if record:
+            all_play = format_record(record['all_play_wins'], record['all_play_losses'], record['all_play_ties'])
+            record_cols = (f" {format_record(record['wins'], record['losses'], record['ties']):<8} "
+                           f"{record['points_against']:<8.1f} {all_play:<9} {record['streak']:<4}")
+        print(f"{i:<4} {stats['team_name'][:24]:<25} {stats['owner_name'][:19]:<20} "
+              f"{stats['total_points']:<8.1f} {stats['average_points']:<6.1f}{record_cols}")
+
+    # Show highest/lowest for this season
+    if book is not None:
+        highest = next(iter(book.top_scores(year, 1)), None)
+        lowest = next(iter(book.bottom_scores(year, 1)), None)
+    else:
+        highest, lowest = find_highest_lowest_weeks(weekly_scores)
+    if highest and lowest:
+        print(f"🏆 High: {highest['team_name']} - Week {highest['week']} - {highest['points']:.1f} pts")
+        print(f"💀 Low: {lowest['team_name']} - Week {lowest['week']} - {lowest['points']:.1f} pts")
+    if book is not None:
+        for label, games in (("💥 Blowout", book.blowouts(year, 1)), ("😬 Closest", book.narrowest_margins(year, 1))):
+            for game in games:
+                print(f"{label}: {game['winner_name']} {game['winner_points']:.1f} - {game['loser_points']:.1f} "
+                      f"{game['loser_name']} - Week {game['week']}")
+
+    # Show latest rolling averages for this season
+    if rolling_data:
+        latest_week = max(weekly_scores.keys()) if weekly_scores else 0
+        print(f"\n📈 Rolling Averages through Week {latest_week}:")
+    
+        # Get latest rolling averages for ranking
+        latest_averages = []
+        for roster_id, team_rolling in rolling_data.items():
+            if latest_week in team_rolling['rolling_averages']:
+                avg_info = team_rolling['rolling_averages'][latest_week]
+                latest_averages.append({
+                    'team_name': team_rolling['team_name'],
+                    'rolling_avg': avg_info['average'],
+                    'weeks': avg_info['weeks_included'],
+                    'trailing': avg_info[f'trailing_{windows[0]}'],
+                    'ewma': avg_info['ewma']
+                })
+    
+        # Top 3 by rolling average
+        for i, team_avg in enumerate(heapq.nlargest(3, latest_averages, key=lambda x: x['rolling_avg']), 1):
+            print(f"   {i}. {team_avg['team_name']}: {team_avg['rolling_avg']:.1f} avg ({team_avg['weeks']} weeks), "
+                  f"last {windows[0]}: {team_avg['trailing']:.1f}, EWMA: {team_avg['ewma']:.1f}")
+
+    # Show the season's top individual scorers
+    top_scorers = player_index.top_scorers(season=year, k=3, started_only=True) if player_index else []
+    if top_scorers:
+        print("\n⭐ Top Starters:" if players is not None else "\n⭐ Top Starters (player ID):")
+        for i, player in enumerate(top_scorers, 1):
+            label = players.describe(player['player_id']) if players is not None else player['player_id']
+            print(f"   {i}. {label}: {player['total_points']:.1f} pts "
+                  f"({player['average_points']:.1f} avg over {player['weeks']} starts)")
+
+    # Show detailed weekly scores for the current season to help debug data accuracy
+    if year == current_season:
+        print(f"\n🔍 DETAILED {year} WEEKLY SCORES (for data verification):")
+        print(f"{'Team':<25} {'Owner':<20} {'W1':<8} {'W2':<8} {'W3':<8} {'Total':<8}")
+        print("-" * 85)
+    
+        for roster_id, stats in sorted_teams:
+            team_name = stats['team_name'][:24]
+            owner_name = stats['owner_name'][:19]
         
-        # Get the workbook and worksheet
-        workbook = writer.book
-        worksheet = writer.sheets['Weekly Scores']
+            # Get weekly scores for this team
+            week_scores = {}
+            for week_score in stats['weekly_scores']:
+                week_scores[week_score['week']] = week_score['points']
         
-        # Auto-adjust column widths
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
-    
-    print(f"✅ Data exported to Excel: {filename}")
-    print(f"📊 Total records: {len(excel_data)}")
-    
-    return filename
-
-def main():
-    config_file = 'league_data.json'
+            w1 = week_scores.get(1, 0)
+            w2 = week_scores.get(2, 0) 
+            w3 = week_scores.get(3, 0)
+            total = stats['total_points']
+        
+            print(f"{team_name:<25} {owner_name:<20} {w1:<8.1f} {w2:<8.1f} {w3:<8.1f} {total:<8.1f}")
+
+    print()  # Extra spacing between seasons
+
+def main(formats=None, profile=None, cprofile=False, config_file='league_data.json'):
+    """Run the full analysis; with profile, write <profile>.json/.prom stage metrics.
+
+    cprofile additionally profiles every stage and dumps the slowest one
+    to <profile>_<stage>.prof.
+    """
+    from db_store import DEFAULT_DB_PATH, connect
+    from exporters import check_export_dependencies, export_column_names, open_export, season_export_columns
+    from fetcher import DEFAULT_MAX_WORKERS, configure_shared_client
+    from lineups import display_lineup_efficiency, lineup_efficiency, optimal_lineups
+    from owners import OwnerIndex, display_careers
+    from player_metadata import load_player_index
+    from playoff_odds import DEFAULT_ITERATIONS, display_playoff_odds
+    from power_rankings import (DEFAULT_PATH as DEFAULT_POWER_PATH, PowerRatings, display_power_rankings,
+                                load_power_ratings, season_games)
+    from records import compute_records
+    from records_book import RecordsBook, display_records_book
+    from rolling_stats import DEFAULT_EWMA_ALPHA, DEFAULT_WINDOWS, compute_rolling_stats
+
+    METRICS.reset()
+    METRICS.capture_profiles = cprofile
     league_data = load_json(config_file)
     base_url = league_data.get('api').get('base_url')
     league_ids = league_data.get('league_ids', {})
@@ -488,114 +651,151 @@ def main():
     print("=" * 60)
     print(f"Available seasons: {', '.join(sorted(league_ids.keys()))}")
     
-    # Fetch data for all available seasons
-    all_season_data = []
-    
-    for year, league_id in sorted(league_ids.items()):
-        season_data = fetch_season_data(int(year), league_id, base_url)
-        if season_data:
-            all_season_data.append(season_data)
-    
-    if not all_season_data:
-        print("❌ No data could be fetched from any season.")
-        sys.exit(1)
-    
-    print(f"\n✅ Successfully fetched data from {len(all_season_data)} seasons")
-    
-    # Combine all seasons
-    combined_weekly_scores, combined_team_mapping = combine_multi_year_data(all_season_data)
-    
-    print(f"📊 Total combined records: {sum(len(week_data) for week_data in combined_weekly_scores.values())}")
-    
-    # Display summary for each season
-    print("\n" + "="*80)
-    print("MULTI-YEAR SEASON SUMMARIES")
-    print("="*80)
-    
-    for season_data in all_season_data:
-        year = season_data['year']
-        weekly_scores = season_data['weekly_scores'] 
-        weeks_fetched = season_data['weeks_fetched']
-        
-        print(f"\n--- {year} SEASON ({weeks_fetched} weeks) ---")
-        
-        team_stats = calculate_season_summary(weekly_scores)
-        
-        # Sort teams by total points for this season
-        sorted_teams = sorted(team_stats.items(), 
-                             key=lambda x: x[1]['total_points'], 
-                             reverse=True)
-        
-        print(f"{'Rank':<4} {'Team':<25} {'Owner':<20} {'Total':<8} {'Avg':<6}")
-        print("-" * 70)
-        
-        for i, (roster_id, stats) in enumerate(sorted_teams, 1):
-            print(f"{i:<4} {stats['team_name'][:24]:<25} {stats['owner_name'][:19]:<20} "
-                  f"{stats['total_points']:<8.1f} {stats['average_points']:<6.1f}")
-        
-        # Show highest/lowest for this season
-        highest, lowest = find_highest_lowest_weeks(weekly_scores)
-        if highest and lowest:
-            print(f"🏆 High: {highest['team_name']} - Week {highest['week']} - {highest['points']:.1f} pts")
-            print(f"💀 Low: {lowest['team_name']} - Week {lowest['week']} - {lowest['points']:.1f} pts")
-        
-        # Show latest rolling averages for this season
-        rolling_data = calculate_rolling_averages(weekly_scores)
-        if rolling_data:
-            latest_week = max(weekly_scores.keys()) if weekly_scores else 0
-            print(f"\n📈 Rolling Averages through Week {latest_week}:")
+    settings = league_data.get('settings', {})
+    export_settings = settings.get('export', {})
+    formats = formats or export_settings.get('formats', ['xlsx'])
+    # Fail before fetching anything if an export format's package is missing
+    check_export_dependencies(formats)
+    
+    max_workers = settings.get('max_concurrent_requests', DEFAULT_MAX_WORKERS)
+    cache = ResponseCache.from_config(settings)
+    http_client = configure_shared_client(settings, max_workers)
+    with METRICS.stage('player_metadata'):
+        players = load_player_index(settings, base_url, http_client)
+    
+    database_settings = settings.get('database', {})
+    db = connect(database_settings.get('path', DEFAULT_DB_PATH)) if database_settings.get('enabled') else None
+    rolling_settings = settings.get('rolling', {})
+    windows = tuple(rolling_settings.get('windows', DEFAULT_WINDOWS))
+    ewma_alpha = rolling_settings.get('ewma_alpha', DEFAULT_EWMA_ALPHA)
+    simulation = settings.get('simulation', {})
+    power = load_power_ratings(settings)
+    latest_year = max((int(year) for year in league_ids), default=None)
+    
+    # Seasons flow through fetch -> organize -> aggregate -> write one at a time;
+    # only the owner index, records book and a few counters outlive each iteration
+    owners = OwnerIndex()
+    seasons = []
+    synced = []
+    total_records = 0
+    playoff_odds = None
+    column_names = export_column_names(windows)
+    book = RecordsBook(owners=owners)
+    # Every season's games are kept (a few arrays each) in case the ratings need a full rebuild
+    season_games_list = []
+    rebuild_power = power is not None and not power.applied
+    with open_export(column_names, formats, export_settings, inputs=(ewma_alpha,)) as export:
+        for season_data in iter_season_data(league_ids, base_url, max_workers, cache, db):
+            year = season_data['year']
+            weekly_scores = season_data['weekly_scores']
             
-            # Get latest rolling averages for ranking
-            latest_averages = []
-            for roster_id, team_rolling in rolling_data.items():
-                if latest_week in team_rolling['rolling_averages']:
-                    avg_info = team_rolling['rolling_averages'][latest_week]
-                    latest_averages.append({
-                        'team_name': team_rolling['team_name'],
-                        'rolling_avg': avg_info['average'],
-                        'weeks': avg_info['weeks_included']
-                    })
+            with METRICS.stage('rolling'):
+                rolling_data = compute_rolling_stats(weekly_scores, windows, ewma_alpha)
+            with METRICS.stage('records'):
+                season_records = compute_records(weekly_scores)
+                owners.add_season(year, season_data['team_mapping'])
+                book.add_season(year, weekly_scores)
+                owners.add_season_scores(year, weekly_scores)
+            if power is not None:
+                with METRICS.stage('power_rankings'):
+                    games = season_games(year, weekly_scores, owners)
+                    season_games_list.append(games)
+                    # Saved ratings only need the weeks they haven't seen
+                    if not rebuild_power:
+                        try:
+                            power.add_games(games)
+                        except ValueError:
+                            rebuild_power = True
+            with METRICS.stage('summaries'):
+                display_season_report(season_data, rolling_data, season_records, windows, players, book,
+                                      latest_year)
             
-            # Sort by rolling average
-            latest_averages.sort(key=lambda x: x['rolling_avg'], reverse=True)
+            # Bench points need every player's position, so only with player metadata
+            if players is not None and season_data['roster_positions']:
+                with METRICS.stage('lineups'):
+                    efficiency = lineup_efficiency(optimal_lineups(season_data['player_index'],
+                                                                   {year: season_data['roster_positions']}, players,
+                                                                   season=year))
+                display_lineup_efficiency(efficiency, season_data['team_mapping'], year)
             
-            for i, team_avg in enumerate(latest_averages[:3], 1):  # Show top 3
-                print(f"   {i}. {team_avg['team_name']}: {team_avg['rolling_avg']:.1f} avg ({team_avg['weeks']} weeks)")
-        
-        # Show detailed weekly scores for 2025 to help debug data accuracy
-        if year == 2025:
-            print(f"\n🔍 DETAILED 2025 WEEKLY SCORES (for data verification):")
-            print(f"{'Team':<25} {'Owner':<20} {'W1':<8} {'W2':<8} {'W3':<8} {'Total':<8}")
-            print("-" * 85)
+            # Project the current season forward
+            if year == latest_year and simulation.get('enabled', True):
+                with METRICS.stage('playoff_odds'):
+                    playoff_odds = season_playoff_odds(year, league_ids[str(year)], base_url, simulation, cache,
+                                                       weekly_scores)
+                if playoff_odds:
+                    display_playoff_odds(playoff_odds, year, simulation.get('iterations', DEFAULT_ITERATIONS))
             
-            for roster_id, stats in sorted_teams:
-                team_name = stats['team_name'][:24]
-                owner_name = stats['owner_name'][:19]
-                
-                # Get weekly scores for this team
-                week_scores = {}
-                for week_score in stats['weekly_scores']:
-                    week_scores[week_score['week']] = week_score['points']
-                
-                w1 = week_scores.get(1, 0)
-                w2 = week_scores.get(2, 0) 
-                w3 = week_scores.get(3, 0)
-                total = stats['total_points']
-                
-                print(f"{team_name:<25} {owner_name:<20} {w1:<8.1f} {w2:<8.1f} {w3:<8.1f} {total:<8.1f}")
-        
-        print()  # Extra spacing between seasons
+            # Incremental exports skip seasons whose week data hasn't changed since the last run
+            with METRICS.stage('export'):
+                if not export.reuse_season(str(year), weekly_scores):
+                    export.write_season(str(year), season_export_columns(year, weekly_scores, rolling_data,
+                                                                         windows, season_records))
+            
+            seasons.append(year)
+            synced.append({'year': year, 'weeks_fetched': season_data['weeks_fetched']})
+            total_records += len(weekly_scores.rows)
+    exported_files = export.written
+    
+    if not seasons:
+        print("❌ No data could be fetched from any season.")
+        sys.exit(1)
     
-    # Export to Excel
-    excel_file = export_multi_year_excel_with_rolling(combined_weekly_scores, combined_team_mapping)
-    print(f"\n📁 Excel file created: {excel_file}")
+    if db is not None and settings.get('transactions', {}).get('enabled', True):
+        print("\n🔁 Syncing transactions...")
+        sync_season_transactions(db, league_ids, synced, base_url, max_workers, cache)
+    
+    if power is not None:
+        with METRICS.stage('power_rankings'):
+            # History that changed, or seasons no longer configured, mean replaying everything
+            rated_seasons = {int(key.split(':')[0]) for key in power.applied}
+            if rebuild_power or rated_seasons - set(seasons):
+                power = PowerRatings.rebuild(season_games_list, **power.params())
+            power.save(settings.get('power', {}).get('path', DEFAULT_POWER_PATH))
+    
+    display_records_book(book)
+    display_careers(owners)
+    if power is not None:
+        display_power_rankings(power, owners)
+    
+    print(f"\n✅ Successfully processed {len(seasons)} seasons")
+    print(f"🌐 HTTP: {http_client.budget.used} requests, {http_client.retries} retries")
+    if cache is not None:
+        print(f"💾 Cache: {cache.hits} hits, {cache.misses} misses")
+    print(f"📊 Total combined records: {total_records}")
+    print(f"📋 Seasons included: {', '.join(str(year) for year in seasons)}")
+    if getattr(export, 'reused', None):
+        print(f"♻️  Export: reused {', '.join(export.reused)}; rewrote {', '.join(export.rewritten) or 'nothing'}")
+    for filename in exported_files.values():
+        print(f"\n📁 File created: {filename}")
+    
+    if profile:
+        for filename in METRICS.write(profile):
+            print(f"⏱️  Profile written: {filename}")
     
     return {
-        'all_season_data': all_season_data,
-        'combined_weekly_scores': combined_weekly_scores,
-        'combined_team_mapping': combined_team_mapping,
-        'excel_file': excel_file
+        'seasons': seasons,
+        'combined_team_mapping': owners.team_mapping(),
+        'owners': owners,
+        'playoff_odds': playoff_odds,
+        'records_book': book,
+        'power_rankings': power,
+        'excel_file': exported_files.get('xlsx'),
+        'exported_files': exported_files
     }
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    
+    from exporters import EXPORT_FORMATS
+    
+    parser = argparse.ArgumentParser(description="Sleeper fantasy football multi-year analyzer")
+    parser.add_argument('--format', dest='formats', action='append', choices=EXPORT_FORMATS,
+                        help="Export format (repeat for several; default from league_data.json or xlsx)")
+    default_profile = default_profile_name()
+    parser.add_argument('--profile', nargs='?', const=default_profile, metavar='BASENAME',
+                        help="write stage timings and counters as JSON and Prometheus text")
+    parser.add_argument('--cprofile', action='store_true',
+                        help="also dump cProfile stats for the slowest stage (implies --profile)")
+    args = parser.parse_args()
+    main(args.formats, args.profile or (default_profile if args.cprofile else None), args.cprofile)
@@ -0,0 +1,184 @@
+import contextlib
+import cProfile
+import json
+import pstats
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+METRIC_PREFIX = 'sleeper'
+
+class Metrics:
+    """Process-wide timing spans, counters and peak memory for one run.
+
+    span() aggregates many short timings (e.g. every HTTP request) into
+    count/total/max; stage() marks a top-level pipeline stage and, when
+    cProfile capture is on, profiles it so the hottest one can be dumped.
+    A stage entered repeatedly (once per season when streaming) accumulates
+    into one profile and one total. cProfile only sees the thread that
+    enabled it, so work a stage hands to a thread pool is wrapped with
+    profiled() and merged into the stage's profile when it is written.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {}
+            self.spans = {}
+            self.stages = []
+            self.profiles = {}
+            self.thread_profiles = {}
+            self.capture_profiles = False
+            self.started = time.perf_counter()
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record(self, name, seconds):
+        with self._lock:
+            span = self.spans.setdefault(name, {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+            span['count'] += 1
+            span['total_seconds'] += seconds
+            span['max_seconds'] = max(span['max_seconds'], seconds)
+
+    @contextlib.contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        profiler = None
+        if self.capture_profiles:
+            profiler = self.profiles.setdefault(name, cProfile.Profile())
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+            self.record(f'stage.{name}', elapsed)
+            with self._lock:
+                self.stages.append({'stage': name, 'seconds': elapsed})
+
+    @contextlib.contextmanager
+    def thread_profile(self, name):
+        """Profile a block running on a worker thread into stage name's profile"""
+        if not self.capture_profiles:
+            yield
+            return
+        key = (name, threading.get_ident())
+        with self._lock:
+            profiler = self.thread_profiles.get(key)
+        if profiler is None:
+            profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # Python 3.12+ allows one active profiler, and it already sees every thread
+            profiler = None
+        else:
+            with self._lock:
+                self.thread_profiles[key] = profiler
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+
+    def profiled(self, name, fn):
+        """Wrap fn so calls made on pool threads land in stage name's profile"""
+        def run(*args, **kwargs):
+            with self.thread_profile(name):
+                return fn(*args, **kwargs)
+        return run
+
+    def stage_stats(self, name):
+        """pstats.Stats for stage name merged across every thread that did its work, or None"""
+        with self._lock:
+            profilers = [profiler for (stage, _), profiler in self.thread_profiles.items() if stage == name]
+            if name in self.profiles:
+                profilers.insert(0, self.profiles[name])
+        if not profilers:
+            return None
+        stats = pstats.Stats(profilers[0])
+        for profiler in profilers[1:]:
+            stats.add(profiler)
+        return stats
+
+    def peak_memory_bytes(self):
+        """Peak resident set size of this process, or None where unavailable"""
+        if resource is None:
+            return None
+        # ru_maxrss is kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def report(self):
+        with self._lock:
+            return {
+                'wall_seconds': time.perf_counter() - self.started,
+                'peak_memory_bytes': self.peak_memory_bytes(),
+                'stages': list(self.stages),
+                'spans': {name: dict(span) for name, span in self.spans.items()},
+                'counters': dict(self.counters)
+            }
+
+    def to_prometheus(self):
+        """Render the report in the Prometheus text exposition format"""
+        report = self.report()
+        lines = [
+            f'# TYPE {METRIC_PREFIX}_run_seconds gauge',
+            f'{METRIC_PREFIX}_run_seconds {report["wall_seconds"]:.6f}',
+        ]
+        if report['peak_memory_bytes'] is not None:
+            lines += [f'# TYPE {METRIC_PREFIX}_peak_memory_bytes gauge',
+                      f'{METRIC_PREFIX}_peak_memory_bytes {report["peak_memory_bytes"]}']
+
+        lines += [f'# TYPE {METRIC_PREFIX}_span_seconds_total counter',
+                  f'# TYPE {METRIC_PREFIX}_span_seconds_max gauge',
+                  f'# TYPE {METRIC_PREFIX}_span_count counter']
+        for name, span in sorted(report['spans'].items()):
+            label = f'{{span="{name}"}}'
+            lines.append(f'{METRIC_PREFIX}_span_seconds_total{label} {span["total_seconds"]:.6f}')
+            lines.append(f'{METRIC_PREFIX}_span_seconds_max{label} {span["max_seconds"]:.6f}')
+            lines.append(f'{METRIC_PREFIX}_span_count{label} {span["count"]}')
+
+        for name, value in sorted(report['counters'].items()):
+            lines.append(f'# TYPE {METRIC_PREFIX}_{name}_total counter')
+            lines.append(f'{METRIC_PREFIX}_{name}_total {value}')
+        return '\n'.join(lines) + '\n'
+
+    def hottest_stage(self):
+        with self._lock:
+            totals = {}
+            for stage in self.stages:
+                totals[stage['stage']] = totals.get(stage['stage'], 0.0) + stage['seconds']
+        return max(totals, key=totals.get) if totals else None
+
+    def write(self, basename):
+        """Write <basename>.json, <basename>.prom and, if captured, the hottest stage's .prof"""
+        written = [f'{basename}.json', f'{basename}.prom']
+        with open(written[0], 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        with open(written[1], 'w') as f:
+            f.write(self.to_prometheus())
+
+        stats = self.stage_stats(self.hottest_stage())
+        if stats is not None:
+            written.append(f'{basename}_{self.hottest_stage()}.prof')
+            stats.dump_stats(written[-1])
+        return written
+
+METRICS = Metrics()
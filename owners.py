@@ -0,0 +1,180 @@
+from records import format_record
+
+RESULT_KEYS = {'W': 'wins', 'L': 'losses', 'T': 'ties'}
+
+class OwnerIndex:
+    """Owner identities keyed by Sleeper user_id with running career aggregates.
+
+    Roster IDs are only meaningful inside one league season, so every
+    season's team_mapping (from get_team_names_mapping) is folded into a
+    (season, roster_id) -> user_id map. add_week() then updates each
+    owner's career totals, head-to-head record and best/worst weeks in
+    place, so career() is a dict lookup rather than a rescan of every
+    season. Re-adding a week (e.g. a live week still in progress) replaces
+    its earlier contribution. A user who owns several rosters in a season
+    gets one team-week per roster. Rosters without an owner have no
+    identity and are left out of careers.
+    """
+
+    def __init__(self):
+        self.owners = {}  # user_id -> identity and latest names
+        self._owner_of = {}  # (season, roster_id) -> user_id
+        self._by_name = {}  # username / display name -> user_id
+        self._careers = {}
+        self._weeks = {}  # (season, week) -> {user_id: [(points, result), ...]} (one per roster owned)
+
+    def __len__(self):
+        return len(self.owners)
+
+    def add_season(self, year, team_mapping):
+        """Register one season's {roster_id: team_info} mapping"""
+        for roster_id, team_info in team_mapping.items():
+            user_id = team_info.get('user_id')
+            if not user_id:
+                continue
+            self._owner_of[(year, roster_id)] = user_id
+            owner = self.owners.setdefault(user_id, {'user_id': user_id, 'seasons': [], 'latest_season': None})
+            if year not in owner['seasons']:
+                owner['seasons'].append(year)
+                owner['seasons'].sort()
+            # Names come from the most recent season registered
+            if owner['latest_season'] is None or year >= owner['latest_season']:
+                owner.update(latest_season=year, team_name=team_info['team_name'],
+                             owner_name=team_info['owner_name'], username=team_info.get('username', 'unknown'))
+            for name in (team_info.get('username'), team_info['owner_name']):
+                if name:
+                    self._by_name[name.lower()] = user_id
+            self._careers.setdefault(user_id, self._empty_career())
+
+    def owner_of(self, year, roster_id):
+        """user_id behind a roster in a given season, or None"""
+        return self._owner_of.get((year, roster_id))
+
+    def find(self, name):
+        """user_id for a username or display name (case-insensitive), or None"""
+        return self._by_name.get(name.lower())
+
+    @staticmethod
+    def _empty_career():
+        return {'total_points': 0.0, 'weeks': 0, 'wins': 0, 'losses': 0, 'ties': 0,
+                'best_week': None, 'worst_week': None}
+
+    def add_week(self, year, week, week_scores):
+        """Fold one week's {roster_id: team_data} into the owners' careers"""
+        # Resolve each team once; WeekView builds a fresh dict on every access
+        week_scores = {roster_id: week_scores[roster_id] for roster_id in week_scores}
+        by_matchup = {}
+        for roster_id, team_data in week_scores.items():
+            if team_data.get('matchup_id') is not None:
+                by_matchup.setdefault(team_data['matchup_id'], []).append(roster_id)
+
+        contributions = {}
+        for roster_id, team_data in week_scores.items():
+            user_id = self.owner_of(year, roster_id)
+            if user_id is None:
+                continue
+            points = float(team_data['points'])
+            result = None
+            rosters = by_matchup.get(team_data.get('matchup_id'), [])
+            if len(rosters) == 2:
+                opponent = float(week_scores[rosters[0] if rosters[1] == roster_id else rosters[1]]['points'])
+                result = 'W' if points > opponent else 'L' if points < opponent else 'T'
+            contributions.setdefault(user_id, []).append((points, result))
+
+        previous = self._weeks.get((year, week), {})
+        self._weeks[(year, week)] = contributions
+        stale = []
+        for user_id, team_weeks in previous.items():
+            career = self._careers[user_id]
+            for points, result in team_weeks:
+                career['total_points'] -= points
+                career['weeks'] -= 1
+                if result:
+                    career[RESULT_KEYS[result]] -= 1
+            for key in ('best_week', 'worst_week'):
+                if career[key] and (career[key]['season'], career[key]['week']) == (year, week):
+                    stale.append(user_id)
+
+        for user_id, team_weeks in contributions.items():
+            career = self._careers[user_id]
+            for points, result in team_weeks:
+                career['total_points'] += points
+                career['weeks'] += 1
+                if result:
+                    career[RESULT_KEYS[result]] += 1
+                if user_id in stale:
+                    continue
+                entry = {'season': year, 'week': week, 'points': points}
+                if career['best_week'] is None or points > career['best_week']['points']:
+                    career['best_week'] = entry
+                if career['worst_week'] is None or points < career['worst_week']['points']:
+                    career['worst_week'] = entry
+
+        # A replaced best or worst week can only be recovered by looking back over that owner's weeks
+        for user_id in set(stale):
+            self._rescan_extremes(user_id)
+
+    def _rescan_extremes(self, user_id):
+        career = self._careers[user_id]
+        career['best_week'] = career['worst_week'] = None
+        for (year, week), contributions in sorted(self._weeks.items()):
+            for points, _ in contributions.get(user_id, ()):
+                entry = {'season': year, 'week': week, 'points': points}
+                if career['best_week'] is None or points > career['best_week']['points']:
+                    career['best_week'] = entry
+                if career['worst_week'] is None or points < career['worst_week']['points']:
+                    career['worst_week'] = entry
+
+    def add_season_scores(self, year, weekly_scores):
+        """add_week() for every week of a season, in week order"""
+        for week in sorted(weekly_scores):
+            self.add_week(year, week, weekly_scores[week])
+
+    def career(self, user_id):
+        """Career totals for one owner, or None if unknown"""
+        owner = self.owners.get(user_id)
+        if owner is None:
+            return None
+        career = self._careers[user_id]
+        games = career['wins'] + career['losses'] + career['ties']
+        return {
+            'user_id': user_id,
+            'owner_name': owner['owner_name'],
+            'username': owner['username'],
+            'team_name': owner['team_name'],
+            'seasons': list(owner['seasons']),
+            'total_points': career['total_points'],
+            'weeks': career['weeks'],
+            'average_points': career['total_points'] / career['weeks'] if career['weeks'] else 0.0,
+            'wins': career['wins'],
+            'losses': career['losses'],
+            'ties': career['ties'],
+            'win_pct': (career['wins'] + 0.5 * career['ties']) / games if games else 0.0,
+            'best_week': career['best_week'],
+            'worst_week': career['worst_week']
+        }
+
+    def careers(self):
+        return {user_id: self.career(user_id) for user_id in self.owners}
+
+    def team_mapping(self):
+        """Latest {user_id: {team_name, owner_name, username}} across every season"""
+        return {user_id: {'team_name': owner['team_name'], 'owner_name': owner['owner_name'],
+                          'username': owner['username'], 'user_id': user_id}
+                for user_id, owner in self.owners.items()}
+
+def display_careers(owners):
+    """Print every owner's career line, best average first"""
+    careers = [career for career in owners.careers().values() if career['weeks']]
+    if not careers:
+        return
+    print(f"\n👔 Career Totals ({len(careers)} owners)")
+    print(f"{'Owner':<20} {'Seasons':<8} {'Total':<9} {'Avg':<6} {'W-L-T':<9} {'Best':<17} {'Worst':<17}")
+    print("-" * 90)
+    for career in sorted(careers, key=lambda c: c['average_points'], reverse=True):
+        best, worst = career['best_week'], career['worst_week']
+        record = format_record(career['wins'], career['losses'], career['ties'])
+        best_label = f"{best['points']:.1f} ({best['season']} W{best['week']})"
+        worst_label = f"{worst['points']:.1f} ({worst['season']} W{worst['week']})"
+        print(f"{career['owner_name'][:19]:<20} {len(career['seasons']):<8} {career['total_points']:<9.1f} "
+              f"{career['average_points']:<6.1f} {record:<9} {best_label:<17} {worst_label:<17}")
@@ -0,0 +1,230 @@
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+
+DEFAULT_INDEX_PATH = os.path.join('.sleeper_cache', 'players_nfl.idx')
+DEFAULT_MAX_AGE_SECONDS = 24 * 60 * 60
+
+MAGIC = b'SLPI'
+VERSION = 1
+# magic, version, (unused), players, hash slots, records offset, strings offset, vocabulary offset
+HEADER = struct.Struct('<4sHHIIIII')
+# crc32 of the player ID, record index + 1 (0 marks an empty slot)
+SLOT = struct.Struct('<II')
+# ID offset, name offset, ID length, name length, position code, team code
+RECORD = struct.Struct('<IIHHBB2x')
+
+def player_name(player):
+    """Display name from a /players/nfl entry; team defenses only have first and last names"""
+    name = player.get('full_name')
+    if not name:
+        name = ' '.join(part for part in (player.get('first_name'), player.get('last_name')) if part)
+    return name or str(player.get('player_id', ''))
+
+def player_position(player):
+    position = player.get('position')
+    if not position:
+        position = next(iter(player.get('fantasy_positions') or []), None)
+    return position or ''
+
+def _hash(player_id_bytes):
+    return zlib.crc32(player_id_bytes)
+
+def build_index(players, path=DEFAULT_INDEX_PATH):
+    """Write the /players/nfl dump ({player_id: player}) as a binary index at path.
+
+    Layout: header, an open-addressing hash table of (hash, record) slots,
+    fixed-size records, a UTF-8 string blob and a JSON list of the
+    position and team codes. The file is written next to path and renamed
+    into place, so readers holding the old file keep a consistent mapping.
+    Returns the number of players indexed.
+    """
+    positions, teams = [''], ['']
+    position_codes, team_codes = {'': 0}, {'': 0}
+    strings = bytearray()
+    records = []
+    for player_id, player in players.items():
+        if not isinstance(player, dict):
+            continue
+        id_bytes = str(player_id).encode('utf-8')
+        name_bytes = player_name(player).encode('utf-8')[:0xFFFF]
+        position = player_position(player)
+        team = player.get('team') or ''
+        if position not in position_codes:
+            position_codes[position] = len(positions)
+            positions.append(position)
+        if team not in team_codes:
+            team_codes[team] = len(teams)
+            teams.append(team)
+
+        id_offset = len(strings)
+        strings += id_bytes
+        name_offset = len(strings)
+        strings += name_bytes
+        records.append((id_bytes, RECORD.pack(id_offset, name_offset, len(id_bytes), len(name_bytes),
+                                              position_codes[position], team_codes[team])))
+
+    # Keep the table at most half full so probe chains stay short
+    slot_count = 1 << max(len(records) * 2 - 1, 1).bit_length()
+    slots = [(0, 0)] * slot_count
+    for index, (id_bytes, _) in enumerate(records):
+        key = _hash(id_bytes)
+        slot = key & (slot_count - 1)
+        while slots[slot][1]:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = (key, index + 1)
+
+    records_offset = HEADER.size + slot_count * SLOT.size
+    strings_offset = records_offset + len(records) * RECORD.size
+    vocab_offset = strings_offset + len(strings)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(records), slot_count, records_offset, strings_offset,
+                            vocab_offset))
+        f.write(b''.join(SLOT.pack(*slot) for slot in slots))
+        f.write(b''.join(record for _, record in records))
+        f.write(strings)
+        f.write(json.dumps({'positions': positions, 'teams': teams}).encode('utf-8'))
+    os.replace(tmp_path, path)
+    return len(records)
+
+class PlayerIndex:
+    """Read-only, memory-mapped view of an index written by build_index.
+
+    Lookups hash the player ID and probe the slot table in place, so
+    opening the file costs nothing beyond mapping it and every worker
+    process that opens the same path shares its pages through the OS
+    page cache.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self._count, self._slot_count, self._records_offset,
+         self._strings_offset, vocab_offset) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} player index")
+        vocab = json.loads(self._map[vocab_offset:].decode('utf-8'))
+        self._positions = vocab['positions']
+        self._teams = vocab['teams']
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, player_id):
+        return self._find(player_id) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._map.close()
+
+    def _find(self, player_id):
+        """Record offset for player_id, or None"""
+        if not self._slot_count:
+            return None
+        id_bytes = str(player_id).encode('utf-8')
+        key = _hash(id_bytes)
+        mask = self._slot_count - 1
+        slot = key & mask
+        while True:
+            slot_key, record = SLOT.unpack_from(self._map, HEADER.size + slot * SLOT.size)
+            if not record:
+                return None
+            if slot_key == key:
+                offset = self._records_offset + (record - 1) * RECORD.size
+                id_offset, _, id_length, _, _, _ = RECORD.unpack_from(self._map, offset)
+                start = self._strings_offset + id_offset
+                if self._map[start:start + id_length] == id_bytes:
+                    return offset
+            slot = (slot + 1) & mask
+
+    def get(self, player_id):
+        """{player_id, name, position, team} for player_id, or None if unknown"""
+        offset = self._find(player_id)
+        if offset is None:
+            return None
+        _, name_offset, _, name_length, position, team = RECORD.unpack_from(self._map, offset)
+        start = self._strings_offset + name_offset
+        return {
+            'player_id': str(player_id),
+            'name': self._map[start:start + name_length].decode('utf-8'),
+            'position': self._positions[position],
+            'team': self._teams[team]
+        }
+
+    def name(self, player_id, default=None):
+        player = self.get(player_id)
+        return player['name'] if player else (str(player_id) if default is None else default)
+
+    def describe(self, player_id):
+        """'Name (POS, TEAM)' for display, falling back to the raw ID"""
+        player = self.get(player_id)
+        if player is None:
+            return str(player_id)
+        details = ', '.join(part for part in (player['position'], player['team']) if part)
+        return f"{player['name']} ({details})" if details else player['name']
+
+def index_age(path):
+    """Seconds since the index at path was built, or None if it doesn't exist"""
+    try:
+        return time.time() - os.path.getmtime(path)
+    except OSError:
+        return None
+
+def refresh_index(base_url, path=DEFAULT_INDEX_PATH, max_age_seconds=DEFAULT_MAX_AGE_SECONDS, client=None):
+    """Rebuild the index from /players/nfl if it is missing or older than max_age_seconds.
+
+    Sleeper asks that the (several MB) players dump be fetched at most
+    once a day, so a fresh index is left alone. If the fetch fails a stale
+    index is kept. Returns True when path holds a usable index.
+    """
+    age = index_age(path)
+    if age is not None and age < max_age_seconds:
+        return True
+
+    import requests
+    from fetcher import get_shared_client
+
+    client = client or get_shared_client()
+    try:
+        response = client.get(f"{base_url}/players/nfl")
+        response.raise_for_status()
+        players = response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"⚠️  Could not fetch player metadata: {e}")
+        return age is not None
+
+    if not isinstance(players, dict):
+        return age is not None
+    count = build_index(players, path)
+    print(f"👤 Indexed {count} players into {path}")
+    return True
+
+def load_player_index(settings, base_url, client=None):
+    """Refresh and open the index from the 'players' block of league_data.json settings, or None"""
+    player_settings = settings.get('players', {})
+    if not player_settings.get('enabled', True):
+        return None
+    path = player_settings.get('path', DEFAULT_INDEX_PATH)
+    max_age_seconds = player_settings.get('max_age_hours', DEFAULT_MAX_AGE_SECONDS / 3600) * 3600
+    if not refresh_index(base_url, path, max_age_seconds, client):
+        return None
+    try:
+        return PlayerIndex(path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Could not open player index {path}: {e}")
+        return None
@@ -0,0 +1,136 @@
+import numpy as np
+
+from score_store import EMPTY_PLAYER_ID, GrowableArray, StringTable
+
+BENCH_SLOT = -1
+
+class PlayerScoreIndex:
+    """Array-backed index of per-player weekly points.
+
+    One row per (season, week, roster, player) with parallel columns for
+    points, whether the player started and the starter slot index
+    (BENCH_SLOT for bench players). Sleeper player IDs are interned to
+    integer codes so every query is a bincount or mask over the columns.
+    Columns grow with amortized capacity as seasons are added.
+    """
+
+    COLUMNS = {'season': np.int16, 'week': np.int8, 'roster_id': np.int16, 'player': np.int32,
+               'points': np.float64, 'started': bool, 'slot': np.int8}
+
+    def __init__(self):
+        self.player_ids = StringTable()
+        self._columns = {name: GrowableArray(dtype) for name, dtype in self.COLUMNS.items()}
+        self._publish()
+
+    def _publish(self):
+        for name, column in self._columns.items():
+            setattr(self, name, column.values)
+
+    def __len__(self):
+        return len(self.points)
+
+    def add_season(self, year, matchups_data):
+        """Ingest players_points and starters from one season's raw /matchups payloads"""
+        weeks, roster_ids, players, points, slots = [], [], [], [], []
+
+        for week, matchups in sorted(matchups_data.items()):
+            for matchup in matchups:
+                roster_id = matchup['roster_id']
+                players_points = matchup.get('players_points') or {}
+                starters = matchup.get('starters') or []
+                starters_points = matchup.get('starters_points') or []
+                slot_of = {player_id: slot for slot, player_id in enumerate(starters)
+                           if player_id != EMPTY_PLAYER_ID}
+
+                # Starters missing from players_points still count via starters_points
+                player_points = dict(players_points)
+                for slot, player_id in enumerate(starters):
+                    if player_id != EMPTY_PLAYER_ID and player_id not in player_points and slot < len(starters_points):
+                        player_points[player_id] = starters_points[slot]
+
+                for player_id, player_score in player_points.items():
+                    weeks.append(week)
+                    roster_ids.append(roster_id)
+                    players.append(self.player_ids.intern(player_id))
+                    points.append(player_score or 0)
+                    slots.append(slot_of.get(player_id, BENCH_SLOT))
+
+        slots = np.asarray(slots, dtype=np.int8)
+        for name, values in (('season', np.full(len(weeks), year)), ('week', weeks), ('roster_id', roster_ids),
+                             ('player', players), ('points', points), ('started', slots != BENCH_SLOT),
+                             ('slot', slots)):
+            self._columns[name].extend(values)
+        self._publish()
+
+    def _mask(self, season=None, started_only=False):
+        mask = np.ones(len(self.points), dtype=bool)
+        if season is not None:
+            mask &= self.season == season
+        if started_only:
+            mask &= self.started
+        return mask
+
+    def top_scorers(self, season=None, k=10, started_only=False):
+        """Top k players by total points: [{'player_id', 'total_points', 'weeks', 'average_points'}]"""
+        mask = self._mask(season, started_only)
+        size = len(self.player_ids.strings)
+        totals = np.bincount(self.player[mask], weights=self.points[mask], minlength=size)
+        weeks = np.bincount(self.player[mask], minlength=size)
+
+        k = min(k, int(np.count_nonzero(weeks)))
+        if k <= 0:
+            return []
+        top = np.argpartition(-totals, k - 1)[:k]
+        top = top[np.argsort(-totals[top], kind='stable')]
+
+        return [{
+            'player_id': self.player_ids[code],
+            'total_points': float(totals[code]),
+            'weeks': int(weeks[code]),
+            'average_points': float(totals[code]) / int(weeks[code])
+        } for code in top]
+
+    def points_by_slot(self, season=None, roster_id=None, slot_labels=None):
+        """Total and average starter points per starter slot: {slot: {'total_points', 'average_points'}}.
+
+        slot_labels (e.g. the league's roster_positions) replaces slot
+        indexes with their names.
+        """
+        mask = self._mask(season, started_only=True)
+        if roster_id is not None:
+            mask &= self.roster_id == roster_id
+        slots = self.slot[mask].astype(np.int64)
+        if not len(slots):
+            return {}
+        totals = np.bincount(slots, weights=self.points[mask])
+        counts = np.bincount(slots)
+
+        # Repeated labels (two RB slots) are pooled together
+        pooled = {}
+        for slot in np.flatnonzero(counts):
+            label = slot_labels[slot] if slot_labels and slot < len(slot_labels) else int(slot)
+            total, count = pooled.get(label, (0.0, 0))
+            pooled[label] = (total + float(totals[slot]), count + int(counts[slot]))
+
+        return {label: {'total_points': total, 'average_points': total / count}
+                for label, (total, count) in pooled.items()}
+
+    def player_career(self, player_id):
+        """A player's totals per (season, roster): [{'season', 'roster_id', 'weeks', 'starts', 'total_points'}]"""
+        code = self.player_ids.code(player_id)
+        if code is None:
+            return []
+        rows = np.flatnonzero(self.player == code)
+        keys = self.season[rows].astype(np.int64) * 100000 + self.roster_id[rows]
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        totals = np.bincount(inverse, weights=self.points[rows])
+        weeks = np.bincount(inverse)
+        starts = np.bincount(inverse, weights=self.started[rows])
+
+        return [{
+            'season': int(key // 100000),
+            'roster_id': int(key % 100000),
+            'weeks': int(weeks[i]),
+            'starts': int(starts[i]),
+            'total_points': float(totals[i])
+        } for i, key in enumerate(unique_keys)]
@@ -0,0 +1,232 @@
+import argparse
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from fetcher import fetch_json
+from records import compute_records
+from rolling_stats import _score_matrix
+
+DEFAULT_ITERATIONS = 100000
+DEFAULT_CHUNK_SIZE = 10000
+DEFAULT_PLAYOFF_TEAMS = 6
+DEFAULT_REGULAR_SEASON_WEEKS = 14
+DEFAULT_SEED = 2025
+# Early-season means are pulled towards the league mean as if the team had
+# also played this many league-average weeks
+PRIOR_WEEKS = 2
+
+def team_distributions(weekly_scores):
+    """Per-team normal score model from completed weeks: (roster_ids, means, stds)"""
+    _, roster_ids, points, _ = _score_matrix(weekly_scores)
+    if not roster_ids:
+        return [], np.empty(0), np.empty(0)
+
+    played = ~np.isnan(points)
+    counts = played.sum(axis=1)
+    league_mean = np.nanmean(points) if played.any() else 0.0
+    league_std = np.nanstd(points) if played.sum() > 1 else 0.0
+
+    sums = np.where(played, points, 0.0).sum(axis=1)
+    means = (sums + PRIOR_WEEKS * league_mean) / (counts + PRIOR_WEEKS)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        stds = np.sqrt(np.where(played, (points - (sums / counts)[:, None]) ** 2, 0.0).sum(axis=1) / (counts - 1))
+    # Too few games to trust a team's own spread: use the league's
+    stds = np.where(counts > 2, stds, league_std)
+    return roster_ids, means, np.nan_to_num(stds)
+
+def schedule_from_matchups(matchups_by_week, roster_ids):
+    """Pair rosters by matchup_id: {week: [(roster_a, roster_b), ...]} -> (home, away) roster index arrays"""
+    index_of = {roster_id: i for i, roster_id in enumerate(roster_ids)}
+    home, away = [], []
+    for week, pairs in sorted(matchups_by_week.items()):
+        for roster_a, roster_b in pairs:
+            if roster_a in index_of and roster_b in index_of:
+                home.append(index_of[roster_a])
+                away.append(index_of[roster_b])
+    return np.asarray(home, dtype=np.int64), np.asarray(away, dtype=np.int64)
+
+def pair_matchups(matchups):
+    """Raw /matchups payload (or a {roster_id: team_data} week) -> [(roster_a, roster_b)] by matchup_id"""
+    if hasattr(matchups, 'items'):
+        matchups = [dict(team_data, roster_id=roster_id) for roster_id, team_data in matchups.items()]
+    by_matchup = {}
+    for matchup in matchups or []:
+        if matchup.get('matchup_id') is not None:
+            by_matchup.setdefault(matchup['matchup_id'], []).append(matchup['roster_id'])
+    return [tuple(rosters) for rosters in by_matchup.values() if len(rosters) == 2]
+
+def round_robin(roster_ids, week):
+    """[(roster_a, roster_b)] for one week of a circle-method round-robin over roster_ids (odd counts get a bye)"""
+    teams = sorted(roster_ids) + ([None] if len(roster_ids) % 2 else [])
+    if len(teams) < 2:
+        return []
+    # Keep the first team fixed and rotate the rest one place per week
+    rest = teams[1:]
+    shift = (week - 1) % len(rest)
+    teams = [teams[0]] + rest[-shift:] + rest[:-shift] if shift else teams
+    half = len(teams) // 2
+    return [(teams[i], teams[-1 - i]) for i in range(half) if teams[i] is not None and teams[-1 - i] is not None]
+
+def remaining_schedule(league_id, base_url, weekly_scores, completed_through,
+                       regular_season_weeks=DEFAULT_REGULAR_SEASON_WEEKS, cache=None):
+    """{week: [(roster_a, roster_b)]} for the regular-season weeks after completed_through.
+
+    Sleeper publishes future matchup pairings ahead of time. A week that
+    can't be fetched gets a generated round-robin week over the league's
+    rosters instead, which is announced since it is not the real schedule.
+    """
+    roster_ids = sorted({roster_id for week in weekly_scores for roster_id in weekly_scores[week]})
+    schedule, generated = {}, []
+    for week in range(completed_through + 1, regular_season_weeks + 1):
+        pairs = pair_matchups(fetch_json(f"{base_url}/league/{league_id}/matchups/{week}", cache=cache))
+        if not pairs and roster_ids:
+            pairs = round_robin(roster_ids, week)
+            generated.append(week)
+        schedule[week] = pairs
+    if generated:
+        print(f"   ⚠️  No published matchups for weeks {', '.join(str(week) for week in generated)}; "
+              f"simulating them with a generated round-robin schedule")
+    return schedule
+
+def _play(rng, means, stds, team_a, team_b):
+    """Sample one game per element of the (iterations, games) index arrays; returns the winners"""
+    score_a = means[team_a] + stds[team_a] * rng.standard_normal(team_a.shape)
+    score_b = means[team_b] + stds[team_b] * rng.standard_normal(team_b.shape)
+    return np.where(score_a >= score_b, team_a, team_b)
+
+def _simulate_chunk(job):
+    """Play out `iterations` seasons; returns per-team counts and summed final wins"""
+    means, stds, wins, points_for, home, away, playoff_teams, iterations, seed = job
+    rng = np.random.default_rng(seed)
+    teams = len(means)
+
+    # Regular season: one vectorized draw for every remaining game in every simulation
+    final_wins = np.tile(wins, (iterations, 1))
+    final_points = np.tile(points_for, (iterations, 1))
+    if len(home):
+        home_scores = means[home] + stds[home] * rng.standard_normal((iterations, len(home)))
+        away_scores = means[away] + stds[away] * rng.standard_normal((iterations, len(home)))
+        home_won = home_scores > away_scores
+        for game, (home_team, away_team) in enumerate(zip(home, away)):
+            final_wins[:, home_team] += home_won[:, game]
+            final_wins[:, away_team] += ~home_won[:, game]
+            final_points[:, home_team] += home_scores[:, game]
+            final_points[:, away_team] += away_scores[:, game]
+
+    # Seed by wins, then points for
+    order = np.argsort(-(final_wins * 1e6 + final_points), axis=1, kind='stable')
+    seeds = order[:, :playoff_teams]
+    bracket_size = 1 << max(playoff_teams - 1, 0).bit_length()
+    byes = bracket_size - playoff_teams
+
+    # Single elimination, best remaining seed plays the worst each round
+    advancing, playing = seeds[:, :byes], seeds[:, byes:]
+    while advancing.shape[1] + playing.shape[1] > 1:
+        half = playing.shape[1] // 2
+        winners = _play(rng, means, stds, playing[:, :half], playing[:, ::-1][:, :half])
+        advancing, playing = advancing[:, :0], np.hstack([advancing, winners])
+    champions = playing[:, 0]
+
+    return {
+        'playoffs': np.bincount(seeds.ravel(), minlength=teams),
+        'byes': np.bincount(seeds[:, :byes].ravel(), minlength=teams),
+        'top_seed': np.bincount(seeds[:, 0], minlength=teams),
+        'champion': np.bincount(champions, minlength=teams),
+        'wins': final_wins.sum(axis=0)
+    }
+
+def simulate_playoff_odds(weekly_scores, schedule, completed_through=None, iterations=DEFAULT_ITERATIONS,
+                          playoff_teams=DEFAULT_PLAYOFF_TEAMS, seed=DEFAULT_SEED, workers=1,
+                          chunk_size=DEFAULT_CHUNK_SIZE):
+    """Monte Carlo playoff and championship odds for one season.
+
+    Each team's weekly score is modelled as a normal distribution fitted to
+    its completed weeks, and the remaining `schedule` ({week: [(roster_a,
+    roster_b)]}) plus a single-elimination bracket are played out
+    `iterations` times. Work is split into fixed-size chunks seeded from
+    one SeedSequence, so results depend on `seed` and `iterations` but not
+    on `workers`. Returns [{roster_id, team_name, ..., playoff_odds,
+    bye_odds, top_seed_odds, champion_odds, projected_wins}] best first.
+    """
+    if completed_through is not None:
+        weekly_scores = {week: data for week, data in weekly_scores.items() if week <= completed_through}
+    roster_ids, means, stds = team_distributions(weekly_scores)
+    if not roster_ids:
+        return []
+
+    records = compute_records(weekly_scores)
+    wins = np.array([records.get(r, {}).get('wins', 0) + 0.5 * records.get(r, {}).get('ties', 0)
+                     for r in roster_ids])
+    points_for = np.array([records.get(r, {}).get('points_for', 0.0) for r in roster_ids])
+    home, away = schedule_from_matchups(schedule, roster_ids)
+    playoff_teams = min(playoff_teams, len(roster_ids))
+
+    chunks = math.ceil(iterations / chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(chunks)
+    jobs = [(means, stds, wins, points_for, home, away, playoff_teams,
+             min(chunk_size, iterations - i * chunk_size), seeds[i]) for i in range(chunks)]
+
+    if workers > 1 and chunks > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_simulate_chunk, jobs))
+    else:
+        results = [_simulate_chunk(job) for job in jobs]
+    totals = {key: sum(result[key] for result in results) for key in results[0]}
+
+    odds = []
+    for i, roster_id in enumerate(roster_ids):
+        record = records.get(roster_id, {})
+        odds.append({
+            'roster_id': roster_id,
+            'team_name': record.get('team_name', f'Team {roster_id}'),
+            'owner_name': record.get('owner_name', 'Unknown'),
+            'wins': record.get('wins', 0),
+            'losses': record.get('losses', 0),
+            'ties': record.get('ties', 0),
+            'mean_points': float(means[i]),
+            'std_points': float(stds[i]),
+            'projected_wins': float(totals['wins'][i]) / iterations,
+            'playoff_odds': float(totals['playoffs'][i]) / iterations,
+            'bye_odds': float(totals['byes'][i]) / iterations,
+            'top_seed_odds': float(totals['top_seed'][i]) / iterations,
+            'champion_odds': float(totals['champion'][i]) / iterations
+        })
+    return sorted(odds, key=lambda team: (team['champion_odds'], team['playoff_odds']), reverse=True)
+
+def display_playoff_odds(odds, year, iterations):
+    print(f"\n🎲 {year} Playoff Odds ({iterations:,} simulated seasons)")
+    print(f"{'Team':<25} {'Record':<8} {'Proj W':<7} {'Playoffs':<9} {'Bye':<7} {'Title':<7}")
+    print("-" * 68)
+    for team in odds:
+        record = f"{team['wins']}-{team['losses']}" + (f"-{team['ties']}" if team['ties'] else "")
+        print(f"{team['team_name'][:24]:<25} {record:<8} {team['projected_wins']:<7.1f} "
+              f"{team['playoff_odds']:<9.1%} {team['bye_odds']:<7.1%} {team['champion_odds']:<7.1%}")
+
+if __name__ == "__main__":
+    import main
+    from fetcher import configure_shared_client
+    from response_cache import ResponseCache
+
+    parser = argparse.ArgumentParser(description="Simulate playoff and championship odds for the current season")
+    parser.add_argument('--config', default='league_data.json')
+    parser.add_argument('--iterations', type=int, help="simulated seasons (more = slower, more accurate)")
+    parser.add_argument('--workers', type=int, help="processes to split the simulations across")
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    league_data = main.load_json(args.config)
+    settings = league_data.get('settings', {})
+    simulation = settings.get('simulation', {})
+    year = int(league_data.get('current_season'))
+    league_id = league_data['league_ids'][str(year)]
+    base_url = league_data.get('api', {}).get('base_url', main.DEFAULT_BASE_URL)
+    iterations = args.iterations or simulation.get('iterations', DEFAULT_ITERATIONS)
+
+    configure_shared_client(settings)
+    cache = ResponseCache.from_config(settings)
+    odds = main.season_playoff_odds(year, league_id, base_url, simulation, cache, iterations=iterations,
+                                    workers=args.workers, seed=args.seed)
+    if odds:
+        display_playoff_odds(odds, year, iterations)
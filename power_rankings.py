@@ -0,0 +1,302 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from records import _group_bounds, _season_arrays
+from records_book import _matchup_pairs
+
+DEFAULT_PATH = '.sleeper_cache/power_ratings.json'
+DEFAULT_K = 20.0
+DEFAULT_MARGIN_SCALE = 20.0
+DEFAULT_REGRESSION = 1 / 3
+DEFAULT_TREND_WEEKS = 3
+INITIAL_RATING = 1500.0
+STATE_VERSION = 1
+
+def _week_key(year, week):
+    return f'{year}:{week}'
+
+def season_games(year, weekly_scores, owners):
+    """Every head-to-head game of a season between owned rosters, as parallel arrays.
+
+    Games come from the matchup_id pairings; each side is the roster's
+    owner (user_id) from an OwnerIndex. Games against a roster without an
+    owner, and weeks nobody has scored in yet, are left out. Returns
+    {season, week, owner_a, owner_b, points_a, points_b, fingerprints}
+    where fingerprints is {week: hash of that week's games}.
+    """
+    week, roster_id, matchup_id, points, _, _ = _season_arrays(weekly_scores)
+    rows_a, rows_b = _matchup_pairs(week, matchup_id)
+    owner_a = np.array([owners.owner_of(year, int(roster)) for roster in roster_id[rows_a]], dtype=object)
+    owner_b = np.array([owners.owner_of(year, int(roster)) for roster in roster_id[rows_b]], dtype=object)
+    owned = np.array([a is not None and b is not None for a, b in zip(owner_a, owner_b)], dtype=bool)
+    keep = owned & ((points[rows_a] != 0) | (points[rows_b] != 0))
+    games = {
+        'season': np.full(int(keep.sum()), year, dtype=np.int64),
+        'week': week[rows_a][keep],
+        'owner_a': owner_a[keep],
+        'owner_b': owner_b[keep],
+        'points_a': points[rows_a][keep],
+        'points_b': points[rows_b][keep]
+    }
+
+    fingerprints = {}
+    for game_week in np.unique(games['week']):
+        in_week = np.flatnonzero(games['week'] == game_week)
+        week_games = sorted((games['owner_a'][i], games['owner_b'][i], float(games['points_a'][i]),
+                             float(games['points_b'][i])) for i in in_week)
+        fingerprints[int(game_week)] = hashlib.sha1(json.dumps(week_games).encode('utf-8')).hexdigest()
+    games['fingerprints'] = fingerprints
+    return games
+
+def _game_deltas(rating_a, rating_b, points_a, points_b, k, margin_scale):
+    """Rating change of side a in each game (side b changes by the opposite amount).
+
+    Elo with a margin-of-victory multiplier: a blowout moves ratings more
+    than a narrow win, damped when the favourite wins so strong teams
+    don't inflate by beating weak ones.
+    """
+    expected = 1.0 / (1.0 + 10.0 ** ((rating_b - rating_a) / 400.0))
+    actual = np.where(points_a > points_b, 1.0, np.where(points_a < points_b, 0.0, 0.5))
+    favourite_edge = np.where(actual == 0.5, 0.0, np.where(actual == 1.0, rating_a - rating_b, rating_b - rating_a))
+    multiplier = (1.0 + np.log1p(np.abs(points_a - points_b) / margin_scale)) * 2.2 / (
+        np.maximum(favourite_edge, -1000.0) * 0.001 + 2.2)
+    return k * multiplier * (actual - expected)
+
+class PowerRatings:
+    """Elo power ratings per owner, carried across seasons.
+
+    Ratings start at 1500 and regress toward 1500 by `regression` between
+    seasons. State is the current ratings plus a fingerprint per applied
+    week, so add_games() skips weeks it has already seen and applying a
+    new week touches only that week's teams. The latest week can be
+    re-applied (a live week still being scored): its previous
+    contribution is undone first. A change to any earlier week needs a
+    rebuild(), which replays every season in one vectorized pass.
+    """
+
+    def __init__(self, k=DEFAULT_K, margin_scale=DEFAULT_MARGIN_SCALE, regression=DEFAULT_REGRESSION,
+                 trend_weeks=DEFAULT_TREND_WEEKS):
+        self.k = k
+        self.margin_scale = margin_scale
+        self.regression = regression
+        self.trend_weeks = trend_weeks
+        self.ratings = {}  # user_id -> rating
+        self.games = {}  # user_id -> games played
+        self.recent = {}  # user_id -> rating changes of the last trend_weeks games
+        self.season = None
+        self.applied = {}  # 'season:week' -> fingerprint
+        self._undo = None  # (week key, {user_id: (rating, games, recent)}) from before the latest week
+
+    def params(self):
+        return {'k': self.k, 'margin_scale': self.margin_scale, 'regression': self.regression,
+                'trend_weeks': self.trend_weeks}
+
+    def _latest(self):
+        return max((tuple(int(part) for part in key.split(':')) for key in self.applied), default=None)
+
+    def _regress(self):
+        for user_id, rating in self.ratings.items():
+            self.ratings[user_id] = INITIAL_RATING + (rating - INITIAL_RATING) * (1 - self.regression)
+
+    def add_games(self, games):
+        """Apply one season's season_games() week by week; returns the weeks that changed ratings.
+
+        Raises ValueError if a week before the latest applied one is new
+        or changed - call rebuild() then.
+        """
+        year = int(games['season'][0]) if len(games['season']) else None
+        latest = self._latest()
+        pending = [week for week, fingerprint in sorted(games['fingerprints'].items())
+                   if self.applied.get(_week_key(year, week)) != fingerprint]
+        for week in pending:
+            replaceable = self._undo is not None and self._undo[0] == _week_key(year, week)
+            if latest is not None and ((year, week) < latest or ((year, week) == latest and not replaceable)):
+                raise ValueError(f"{year} week {week} changed after later weeks were rated; rebuild the ratings")
+        for week in pending:
+            in_week = games['week'] == week
+            self._apply_week(year, week, games['owner_a'][in_week], games['owner_b'][in_week],
+                             games['points_a'][in_week], games['points_b'][in_week], games['fingerprints'][week])
+        return pending
+
+    def _apply_week(self, year, week, owner_a, owner_b, points_a, points_b, fingerprint):
+        key = _week_key(year, week)
+        if key in self.applied:
+            # Re-scoring the latest week: put its teams back where they were
+            for user_id, (rating, games, recent) in self._undo[1].items():
+                self.ratings[user_id], self.games[user_id], self.recent[user_id] = rating, games, list(recent)
+        elif self.season is not None and year > self.season:
+            self._regress()
+        self.season = year if self.season is None else max(self.season, year)
+
+        owners_in_week = list(owner_a) + list(owner_b)
+        self._undo = (key, {user_id: (self.ratings.get(user_id, INITIAL_RATING), self.games.get(user_id, 0),
+                                      list(self.recent.get(user_id, []))) for user_id in owners_in_week})
+        rating_a = np.array([self.ratings.get(user_id, INITIAL_RATING) for user_id in owner_a])
+        rating_b = np.array([self.ratings.get(user_id, INITIAL_RATING) for user_id in owner_b])
+        deltas = _game_deltas(rating_a, rating_b, points_a, points_b, self.k, self.margin_scale)
+        # Deltas come from the ratings going into the week and accumulate, since
+        # an owner with two rosters plays two games in it
+        for user_id, delta in zip(owners_in_week, np.concatenate([deltas, -deltas])):
+            self.ratings[user_id] = float(self.ratings.get(user_id, INITIAL_RATING) + delta)
+            self.games[user_id] = self.games.get(user_id, 0) + 1
+            self.recent[user_id] = (self.recent.get(user_id, []) + [float(delta)])[-self.trend_weeks:]
+        self.applied[key] = fingerprint
+
+    @classmethod
+    def rebuild(cls, seasons_games, **params):
+        """Ratings from every season's season_games() at once.
+
+        All games are sorted by (season, week) and each week's games are
+        rated together as arrays, with seasons regressed in between; the
+        result matches applying the weeks one at a time with add_games().
+        """
+        ratings = cls(**params)
+        seasons_games = [games for games in seasons_games if len(games['season'])]
+        if not seasons_games:
+            return ratings
+
+        def column(name):
+            return np.concatenate([games[name] for games in seasons_games])
+
+        season, week = column('season'), column('week')
+        owner_a, owner_b = column('owner_a'), column('owner_b')
+        points_a, points_b = column('points_a'), column('points_b')
+        order = np.lexsort((week, season))
+        season, week = season[order], week[order]
+        points_a, points_b = points_a[order], points_b[order]
+        # One rating slot per owner
+        user_ids, codes = np.unique(np.concatenate([owner_a[order], owner_b[order]]).astype(str), return_inverse=True)
+        code_a, code_b = codes[:len(order)], codes[len(order):]
+
+        current = np.full(len(user_ids), INITIAL_RATING)
+        deltas = np.empty(len(order))
+        first, last = _group_bounds(season, week)
+        week_starts = np.unique(first)
+        previous_season = None
+        for start in week_starts:
+            games = slice(start, last[start] + 1)
+            if previous_season is not None and season[start] > previous_season:
+                current = INITIAL_RATING + (current - INITIAL_RATING) * (1 - ratings.regression)
+            previous_season = season[start]
+            if start == week_starts[-1]:
+                before_latest = current.copy()
+            deltas[games] = _game_deltas(current[code_a[games]], current[code_b[games]], points_a[games],
+                                         points_b[games], ratings.k, ratings.margin_scale)
+            # add.at so an owner with two games in a week gets both
+            np.add.at(current, code_a[games], deltas[games])
+            np.subtract.at(current, code_b[games], deltas[games])
+
+        # Trend: each owner's last trend_weeks rating changes, in the order
+        # _apply_week records them (a sides then b sides within a week)
+        owner_codes = np.concatenate([code_a, code_b])
+        changes = np.concatenate([deltas, -deltas])
+        game_week = np.concatenate([first, first])
+        by_owner = np.lexsort((np.arange(2 * len(order)), game_week, owner_codes))
+        in_latest = game_week[by_owner] == week_starts[-1]
+        owner_first, owner_last = _group_bounds(owner_codes[by_owner])
+        undo = {}
+        for start in np.unique(owner_first):
+            end = owner_last[start] + 1
+            code = owner_codes[by_owner[start]]
+            user_id = str(user_ids[code])
+            ratings.ratings[user_id] = float(current[code])
+            ratings.games[user_id] = int(end - start)
+            ratings.recent[user_id] = [float(change) for change in
+                                       changes[by_owner[max(start, end - ratings.trend_weeks):end]]]
+            # Owners in the latest week can have it re-applied incrementally later
+            latest_games = int(in_latest[start:end].sum())
+            if latest_games:
+                before = end - latest_games
+                undo[user_id] = (float(before_latest[code]), int(before - start), [
+                    float(change) for change in changes[by_owner[max(start, before - ratings.trend_weeks):before]]])
+
+        ratings.season = int(season[-1])
+        for games in seasons_games:
+            year = int(games['season'][0])
+            ratings.applied.update({_week_key(year, game_week): fingerprint
+                                    for game_week, fingerprint in games['fingerprints'].items()})
+        ratings._undo = (_week_key(ratings.season, int(week[-1])), undo)
+        return ratings
+
+    def trend(self, user_id):
+        """Rating change over the owner's last trend_weeks games"""
+        return sum(self.recent.get(user_id, []))
+
+    def rankings(self):
+        """[{rank, user_id, rating, trend, games}] best first"""
+        ordered = sorted(self.ratings.items(), key=lambda item: item[1], reverse=True)
+        return [{'rank': rank, 'user_id': user_id, 'rating': rating, 'trend': self.trend(user_id),
+                 'games': self.games[user_id]}
+                for rank, (user_id, rating) in enumerate(ordered, 1)]
+
+    def save(self, path=DEFAULT_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        state = {
+            'version': STATE_VERSION,
+            'params': self.params(),
+            'season': self.season,
+            'ratings': self.ratings,
+            'games': self.games,
+            'recent': self.recent,
+            'applied': self.applied,
+            'undo': [self._undo[0], {user_id: list(entry) for user_id, entry in self._undo[1].items()}]
+            if self._undo else None
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH, **params):
+        """Saved ratings, or fresh ones if there's no state or it was built with other parameters"""
+        ratings = cls(**params)
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return ratings
+        if state.get('version') != STATE_VERSION or state.get('params') != ratings.params():
+            return ratings
+        ratings.season = state['season']
+        ratings.ratings = state['ratings']
+        ratings.games = state['games']
+        ratings.recent = state['recent']
+        ratings.applied = state['applied']
+        if state.get('undo'):
+            key, entries = state['undo']
+            ratings._undo = (key, {user_id: tuple(entry) for user_id, entry in entries.items()})
+        return ratings
+
+def power_settings(settings):
+    """PowerRatings parameters from settings.power"""
+    power = settings.get('power', {})
+    return {'k': power.get('k', DEFAULT_K), 'margin_scale': power.get('margin_scale', DEFAULT_MARGIN_SCALE),
+            'regression': power.get('regression', DEFAULT_REGRESSION),
+            'trend_weeks': power.get('trend_weeks', DEFAULT_TREND_WEEKS)}
+
+def load_power_ratings(settings):
+    """Saved ratings per settings.power, or None when power rankings are disabled"""
+    power = settings.get('power', {})
+    if not power.get('enabled', True):
+        return None
+    return PowerRatings.load(power.get('path', DEFAULT_PATH), **power_settings(settings))
+
+def display_power_rankings(ratings, owners, count=None):
+    """Print the power rankings with each owner's latest team name"""
+    rankings = ratings.rankings()[:count]
+    if not rankings:
+        return
+    print(f"\n⚡ Power Rankings (Elo, {len(ratings.applied)} weeks rated)")
+    print(f"{'Rank':<5} {'Owner':<20} {'Team':<25} {'Rating':<8} {'Trend':<7} {'Games':<5}")
+    print("-" * 75)
+    for entry in rankings:
+        owner = owners.owners.get(entry['user_id'], {})
+        print(f"{entry['rank']:<5} {owner.get('owner_name', entry['user_id'])[:19]:<20} "
+              f"{owner.get('team_name', '')[:24]:<25} {entry['rating']:<8.1f} {entry['trend']:<+7.1f} "
+              f"{entry['games']:<5}")
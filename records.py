@@ -0,0 +1,165 @@
+import numpy as np
+
+from score_store import NO_MATCHUP
+
+WIN, TIE, LOSS = 1, 0, -1
+NO_GAME = 2
+RESULT_LABELS = {WIN: 'W', TIE: 'T', LOSS: 'L'}
+
+def _season_arrays(weekly_scores):
+    """Flatten one season into (week, roster_id, matchup_id, points, team_names, owner_names) columns"""
+    if hasattr(weekly_scores, 'store'):
+        # ScoreStore season views already hold the columns
+        store, rows = weekly_scores.store, weekly_scores.rows
+        team_names, owner_names = store.team_columns(rows)
+        return (store.week[rows].astype(np.int64), store.roster_id[rows].astype(np.int64),
+                store.matchup_id[rows].astype(np.int64), store.points[rows].astype(np.float64),
+                team_names, owner_names)
+
+    weeks, roster_ids, matchup_ids, points, team_names, owner_names = [], [], [], [], [], []
+    for week, week_data in weekly_scores.items():
+        for roster_id, team_data in week_data.items():
+            weeks.append(week)
+            roster_ids.append(roster_id)
+            matchup_id = team_data.get('matchup_id')
+            matchup_ids.append(NO_MATCHUP if matchup_id is None else matchup_id)
+            points.append(team_data['points'])
+            team_names.append(team_data['team_name'])
+            owner_names.append(team_data['owner_name'])
+    return (np.asarray(weeks, dtype=np.int64), np.asarray(roster_ids, dtype=np.int64),
+            np.asarray(matchup_ids, dtype=np.int64), np.asarray(points, dtype=np.float64),
+            np.asarray(team_names, dtype=object), np.asarray(owner_names, dtype=object))
+
+def _group_bounds(*keys):
+    """First and last index of each row's run of equal keys in already-sorted columns"""
+    n = len(keys[0])
+    index = np.arange(n)
+    starts = np.zeros(n, dtype=bool)
+    starts[:1] = True
+    for key in keys:
+        starts[1:] |= key[1:] != key[:-1]
+    ends = np.append(starts[1:], True)
+    first = np.maximum.accumulate(np.where(starts, index, 0))
+    last = np.minimum.accumulate(np.where(ends, index, n - 1)[::-1])[::-1]
+    return first, last
+
+def _head_to_head(week, matchup_id, points):
+    """Opponent points per row (NaN without exactly one opponent that week)"""
+    opponent_points = np.full(len(points), np.nan)
+    order = np.lexsort((matchup_id, week))
+    first, last = _group_bounds(week[order], matchup_id[order])
+    paired = (last - first == 1) & (matchup_id[order] != NO_MATCHUP)
+    position = np.arange(len(order))
+    opponent = np.where(position == first, last, first)
+    opponent_points[order[paired]] = points[order[opponent[paired]]]
+    return opponent_points
+
+def _all_play(week, points):
+    """All-play wins, losses and ties per row from one sort of each week's scores"""
+    order = np.lexsort((points, week))
+    sorted_week, sorted_points = week[order], points[order]
+    week_first, week_last = _group_bounds(sorted_week)
+    score_first, score_last = _group_bounds(sorted_week, sorted_points)
+
+    wins, losses, ties = (np.empty(len(order), dtype=np.int64) for _ in range(3))
+    wins[order] = score_first - week_first
+    ties[order] = score_last - score_first
+    losses[order] = week_last - score_last
+    return wins, losses, ties
+
+def _running_sum(values, first):
+    """Cumulative sum of values restarting at each group's first index"""
+    totals = np.cumsum(values)
+    return totals - totals[first] + values[first]
+
+def compute_records(weekly_scores):
+    """Compute every team's head-to-head and all-play records for one season.
+
+    Opponents are paired by (week, matchup_id) with one sort; all-play
+    records come from ranking each week's scores once rather than
+    comparing every pair of teams. Returns {roster_id: record} where each
+    record has season totals, the current and longest streaks and a
+    'weekly' {week: {...}} entry with that week's result and running record.
+    """
+    week, roster_id, matchup_id, points, team_names, owner_names = _season_arrays(weekly_scores)
+    if not len(points):
+        return {}
+
+    opponent_points = _head_to_head(week, matchup_id, points)
+    has_game = ~np.isnan(opponent_points)
+    result = np.where(has_game, np.sign(np.nan_to_num(points - opponent_points)), TIE).astype(np.int64)
+    all_play_wins, all_play_losses, all_play_ties = _all_play(week, points)
+
+    # Per-team running records and streaks, in week order
+    order = np.lexsort((week, roster_id))
+    team_first, team_last = _group_bounds(roster_id[order])
+    game_result = np.where(has_game[order], result[order], NO_GAME)
+    wins = _running_sum((game_result == WIN).astype(np.int64), team_first)
+    losses = _running_sum((game_result == LOSS).astype(np.int64), team_first)
+    ties = _running_sum((game_result == TIE).astype(np.int64), team_first)
+    ap_wins = _running_sum(all_play_wins[order], team_first)
+    ap_losses = _running_sum(all_play_losses[order], team_first)
+    ap_ties = _running_sum(all_play_ties[order], team_first)
+    against = _running_sum(np.where(has_game[order], opponent_points[order], 0.0), team_first)
+
+    # Streaks run over games only, so weeks without an opponent neither extend nor break them
+    games = np.flatnonzero(has_game[order])
+    streak = np.zeros(len(order), dtype=np.int64)
+    if len(games):
+        run_first, _ = _group_bounds(roster_id[order][games], game_result[games])
+        streak[games] = np.arange(len(games)) - run_first + 1
+
+    records = {}
+    team_starts = np.unique(team_first)
+    for start, end in zip(team_starts, team_last[team_starts]):
+        rows = order[start:end + 1]
+        weekly = {}
+        current = ('', 0)
+        longest = {WIN: 0, LOSS: 0}
+        for i, row in zip(range(start, end + 1), rows):
+            entry = {
+                'points': float(points[row]),
+                'result': RESULT_LABELS[int(result[row])] if has_game[row] else '',
+                'opponent_points': float(opponent_points[row]) if has_game[row] else None,
+                'wins': int(wins[i]),
+                'losses': int(losses[i]),
+                'ties': int(ties[i]),
+                'all_play_wins': int(all_play_wins[row]),
+                'all_play_losses': int(all_play_losses[row]),
+                'all_play_ties': int(all_play_ties[row])
+            }
+            weekly[int(week[row])] = entry
+            if has_game[row]:
+                current = (entry['result'], int(streak[i]))
+                if result[row] in longest:
+                    longest[int(result[row])] = max(longest[int(result[row])], int(streak[i]))
+
+        games_played = int(wins[end] + losses[end] + ties[end])
+        all_play_games = int(ap_wins[end] + ap_losses[end] + ap_ties[end])
+        records[int(roster_id[rows[0]])] = {
+            'team_name': team_names[rows[-1]],
+            'owner_name': owner_names[rows[-1]],
+            'wins': int(wins[end]),
+            'losses': int(losses[end]),
+            'ties': int(ties[end]),
+            'win_pct': (wins[end] + 0.5 * ties[end]) / games_played if games_played else 0.0,
+            'points_for': float(points[rows].sum()),
+            'points_against': float(against[end]),
+            'streak': f"{current[0]}{current[1]}" if current[1] else '',
+            'longest_win_streak': longest[WIN],
+            'longest_loss_streak': longest[LOSS],
+            'all_play_wins': int(ap_wins[end]),
+            'all_play_losses': int(ap_losses[end]),
+            'all_play_ties': int(ap_ties[end]),
+            'all_play_pct': (ap_wins[end] + 0.5 * ap_ties[end]) / all_play_games if all_play_games else 0.0,
+            'weekly': weekly
+        }
+
+    return records
+
+def compute_season_records(all_season_data):
+    """Compute records once per season: {year: records}"""
+    return {season_data['year']: compute_records(season_data['weekly_scores']) for season_data in all_season_data}
+
+def format_record(wins, losses, ties=0):
+    return f"{wins}-{losses}-{ties}" if ties else f"{wins}-{losses}"
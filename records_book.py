@@ -0,0 +1,227 @@
+import heapq
+
+import numpy as np
+
+from records import _group_bounds, _season_arrays
+from score_store import NO_MATCHUP
+
+DEFAULT_K = 10
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+def _top_k(values, k):
+    """Indices of the k largest values, largest first and ties in index order, without a full sort"""
+    n = len(values)
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    threshold = np.partition(values, n - k)[n - k]
+    above = np.flatnonzero(values > threshold)
+    tied = np.flatnonzero(values == threshold)[:k - len(above)]
+    chosen = np.concatenate([above, tied])
+    return chosen[np.lexsort((chosen, -values[chosen]))]
+
+def _bottom_k(values, k):
+    """Indices of the k smallest values, smallest first and ties in reverse index order.
+
+    Matches the old sort-based lows, where the last of several tied
+    minimums was reported.
+    """
+    return len(values) - 1 - _top_k(-values[::-1], k)
+
+def _matchup_pairs(week, matchup_id):
+    """Row indices (a, b) of the two teams in every head-to-head game"""
+    order = np.lexsort((matchup_id, week))
+    first, last = _group_bounds(week[order], matchup_id[order])
+    games = np.flatnonzero((np.arange(len(order)) == first) & (last - first == 1)
+                           & (matchup_id[order] != NO_MATCHUP))
+    return order[games], order[games + 1]
+
+def _push(heap, key, entry, k):
+    """Keep the k entries with the largest keys in a min-heap"""
+    if len(heap) < k:
+        heapq.heappush(heap, (key, entry))
+    elif key > heap[0][0]:
+        heapq.heapreplace(heap, (key, entry))
+
+class RecordsBook:
+    """League records book built from one pass over each season as it arrives.
+
+    add_season() selects the season's top and bottom k weekly scores,
+    biggest blowouts and narrowest margins with partial selection rather
+    than full sorts, and computes per-team score percentiles. The season
+    results are kept (k entries each) and pushed into bounded all-time
+    heaps, so all-time queries never revisit earlier seasons. Queries
+    take season=None for all-time results.
+
+    All-time percentiles follow owners, not names: with an OwnerIndex
+    each roster's scores are filed under its owner's user_id (register
+    the season with the index first) and names are looked up when the
+    percentiles are read. Rosters without an owner are left out of them.
+    """
+
+    def __init__(self, k=DEFAULT_K, percentiles=DEFAULT_PERCENTILES, owners=None):
+        self.k = k
+        self.percentiles = tuple(percentiles)
+        self.owners = owners
+        self.by_season = {}
+        self._all_time = {'top': [], 'bottom': [], 'blowouts': [], 'narrowest': []}
+        self._team_points = {}  # user_id -> [points array per season]
+        self._rows_seen = 0
+        self._games_seen = 0
+
+    def seasons(self):
+        return list(self.by_season)
+
+    def add_season(self, year, weekly_scores):
+        week, roster_id, matchup_id, points, team_names, owner_names = _season_arrays(weekly_scores)
+
+        def score_entry(row):
+            return {
+                'season': year,
+                'week': int(week[row]),
+                'roster_id': int(roster_id[row]),
+                'team_name': team_names[row],
+                'owner_name': owner_names[row],
+                'points': float(points[row])
+            }
+
+        top_rows, bottom_rows = _top_k(points, self.k), _bottom_k(points, self.k)
+        top = [score_entry(row) for row in top_rows]
+        bottom = [score_entry(row) for row in bottom_rows]
+
+        rows_a, rows_b = _matchup_pairs(week, matchup_id)
+        a_won = points[rows_a] >= points[rows_b]
+        winners = np.where(a_won, rows_a, rows_b)
+        losers = np.where(a_won, rows_b, rows_a)
+        margins = points[winners] - points[losers]
+
+        def game_entry(game):
+            winner, loser = winners[game], losers[game]
+            return {
+                'season': year,
+                'week': int(week[winner]),
+                'matchup_id': int(matchup_id[winner]),
+                'winner_roster_id': int(roster_id[winner]),
+                'winner_name': team_names[winner],
+                'winner_points': float(points[winner]),
+                'loser_roster_id': int(roster_id[loser]),
+                'loser_name': team_names[loser],
+                'loser_points': float(points[loser]),
+                'margin': float(margins[game])
+            }
+
+        blowout_games, narrowest_games = _top_k(margins, self.k), _top_k(-margins, self.k)
+        blowouts = [game_entry(game) for game in blowout_games]
+        narrowest = [game_entry(game) for game in narrowest_games]
+
+        team_percentiles = {}
+        order = np.argsort(roster_id, kind='stable')
+        if len(order):
+            first, last = _group_bounds(roster_id[order])
+            for start in np.unique(first):
+                rows = order[start:last[start] + 1]
+                team_percentiles[int(roster_id[rows[0]])] = self._percentile_entry(
+                    points[rows], team_names[rows[-1]], owner_names[rows[-1]])
+                user_id = self.owners.owner_of(year, int(roster_id[rows[0]])) if self.owners is not None else None
+                if user_id is not None:
+                    self._team_points.setdefault(user_id, []).append(points[rows])
+
+        self.by_season[year] = {
+            'top': top,
+            'bottom': bottom,
+            'blowouts': blowouts,
+            'narrowest': narrowest,
+            'percentiles': team_percentiles
+        }
+
+        # Only this season's k best of each list can enter the all-time lists. Ties
+        # are broken by position across every season added, like the per-season lists.
+        rows, games = self._rows_seen, self._games_seen
+        for row, entry in zip(top_rows, top):
+            _push(self._all_time['top'], (entry['points'], -(rows + row)), entry, self.k)
+        for row, entry in zip(bottom_rows, bottom):
+            _push(self._all_time['bottom'], (-entry['points'], rows + row), entry, self.k)
+        for game, entry in zip(blowout_games, blowouts):
+            _push(self._all_time['blowouts'], (entry['margin'], -(games + game)), entry, self.k)
+        for game, entry in zip(narrowest_games, narrowest):
+            _push(self._all_time['narrowest'], (-entry['margin'], -(games + game)), entry, self.k)
+        self._rows_seen += len(points)
+        self._games_seen += len(margins)
+        return self.by_season[year]
+
+    def _percentile_entry(self, points, team_name, owner_name):
+        values = np.percentile(points, self.percentiles) if len(points) else [0.0] * len(self.percentiles)
+        entry = {
+            'team_name': team_name,
+            'owner_name': owner_name,
+            'weeks': int(len(points)),
+            'min': float(points.min()) if len(points) else 0.0,
+            'max': float(points.max()) if len(points) else 0.0
+        }
+        entry.update({f'p{percentile}': float(value) for percentile, value in zip(self.percentiles, values)})
+        return entry
+
+    def _results(self, kind, season, k):
+        if season is not None:
+            entries = self.by_season.get(season, {}).get(kind, [])
+        else:
+            entries = [entry for _, entry in sorted(self._all_time[kind], key=lambda item: item[0], reverse=True)]
+        return entries[:k or self.k]
+
+    def top_scores(self, season=None, k=None):
+        """Highest weekly scores, best first"""
+        return self._results('top', season, k)
+
+    def bottom_scores(self, season=None, k=None):
+        """Lowest weekly scores, worst first"""
+        return self._results('bottom', season, k)
+
+    def blowouts(self, season=None, k=None):
+        """Games with the largest winning margins"""
+        return self._results('blowouts', season, k)
+
+    def narrowest_margins(self, season=None, k=None):
+        """Games with the smallest winning margins (ties first)"""
+        return self._results('narrowest', season, k)
+
+    def team_percentiles(self, season=None):
+        """Weekly score percentiles per team: {roster_id: ...} for a season, {user_id: ...} all-time"""
+        if season is not None:
+            return self.by_season.get(season, {}).get('percentiles', {})
+        percentiles = {}
+        for user_id, chunks in self._team_points.items():
+            owner = self.owners.owners.get(user_id, {})
+            percentiles[user_id] = self._percentile_entry(np.concatenate(chunks), owner.get('team_name', ''),
+                                                          owner.get('owner_name', user_id))
+        return percentiles
+
+def display_records_book(book, k=5):
+    """Print the all-time records book"""
+    if not book.seasons():
+        return
+    print("\n" + "=" * 80)
+    print(f"ALL-TIME RECORDS BOOK ({len(book.seasons())} seasons)")
+    print("=" * 80)
+
+    print("🏆 Highest weekly scores:")
+    for i, entry in enumerate(book.top_scores(k=k), 1):
+        print(f"   {i}. {entry['team_name']} - {entry['season']} Week {entry['week']} - {entry['points']:.1f} pts")
+    print("💀 Lowest weekly scores:")
+    for i, entry in enumerate(book.bottom_scores(k=k), 1):
+        print(f"   {i}. {entry['team_name']} - {entry['season']} Week {entry['week']} - {entry['points']:.1f} pts")
+    print("💥 Biggest blowouts:")
+    for i, game in enumerate(book.blowouts(k=k), 1):
+        print(f"   {i}. {game['winner_name']} over {game['loser_name']} - {game['season']} Week {game['week']} - "
+              f"{game['winner_points']:.1f} to {game['loser_points']:.1f} (+{game['margin']:.1f})")
+    print("😬 Narrowest margins:")
+    for i, game in enumerate(book.narrowest_margins(k=k), 1):
+        print(f"   {i}. {game['winner_name']} vs {game['loser_name']} - {game['season']} Week {game['week']} - "
+              f"{game['winner_points']:.1f} to {game['loser_points']:.1f} (+{game['margin']:.1f})")
+
+    percentiles = book.team_percentiles()
+    if percentiles:
+        labels = [f'p{percentile}' for percentile in book.percentiles]
+        print(f"\n{'Owner':<20} {'Weeks':<6} " + ' '.join(f'{label:<7}' for label in labels))
+        print("-" * (28 + 8 * len(labels)))
+        for entry in sorted(percentiles.values(), key=lambda entry: entry.get('p50', 0), reverse=True):
+            print(f"{entry['owner_name'][:19]:<20} {entry['weeks']:<6} " + ' '.join(f"{entry[label]:<7.1f}" for label in labels))
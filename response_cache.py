@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from metrics import METRICS
+
+DEFAULT_CACHE_DIR = '.sleeper_cache'
+DEFAULT_TTL_SECONDS = 15 * 60
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+class ResponseCache:
+    """On-disk cache of Sleeper API responses keyed by endpoint URL.
+
+    Entries marked immutable (closed seasons, completed weeks) are served
+    forever. Everything else is served until its TTL expires and is then
+    revalidated with the stored ETag. Total size is capped; the least
+    recently used files are evicted first.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl_seconds=DEFAULT_TTL_SECONDS,
+                 max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = self._scan()[1]
+
+    @classmethod
+    def from_config(cls, settings):
+        """Build a cache from the 'cache' block of league_data.json settings"""
+        cache_settings = settings.get('cache', {})
+        if not cache_settings.get('enabled', True):
+            return None
+        return cls(
+            cache_dir=cache_settings.get('dir', DEFAULT_CACHE_DIR),
+            ttl_seconds=cache_settings.get('ttl_seconds', DEFAULT_TTL_SECONDS),
+            max_bytes=int(cache_settings.get('max_mb', DEFAULT_MAX_BYTES / (1024 * 1024)) * 1024 * 1024),
+        )
+
+    def _path(self, url):
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def get_entry(self, url):
+        """Return the stored entry for url (or None) without checking freshness"""
+        path = self._path(url)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Touch the file so eviction sees it as recently used
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry
+
+    def is_fresh(self, entry, immutable=True):
+        """Whether an entry can be served without revalidation.
+
+        A pinned (immutable) entry only stays fresh while the caller still
+        considers the endpoint final, so a week pinned under an older rule
+        falls back to the TTL.
+        """
+        if entry.get('immutable') and immutable:
+            return True
+        return time.time() - entry.get('fetched_at', 0) < self.ttl_seconds
+
+    def count(self, hit):
+        """Record a hit or a miss; fetch threads share the counters"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, url):
+        """Return cached data for url if it can be served without revalidation"""
+        entry = self.get_entry(url)
+        if entry is not None and self.is_fresh(entry):
+            self.count(hit=True)
+            return entry['data']
+        self.count(hit=False)
+        return None
+
+    def put(self, url, data, etag=None, immutable=False):
+        entry = {
+            'url': url,
+            'fetched_at': time.time(),
+            'etag': etag,
+            'immutable': immutable,
+            'data': data,
+        }
+        path = self._path(url)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        new_size = os.path.getsize(tmp_path)
+        old_size = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._total_bytes += new_size - old_size
+            over_cap = self._total_bytes > self.max_bytes
+        if over_cap:
+            self._evict()
+
+    def touch(self, url, immutable=False):
+        """Mark an entry as freshly revalidated (e.g. after a 304)"""
+        entry = self.get_entry(url)
+        if entry is not None:
+            self.put(url, entry['data'], entry.get('etag'), immutable or entry.get('immutable', False))
+
+    def _scan(self):
+        """Return ([(mtime, size, path), ...], total_bytes) for every cached file"""
+        files = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        return files, total
+
+    def _evict(self):
+        """Delete least recently used files until the cache fits in max_bytes"""
+        with self._lock:
+            files, total = self._scan()
+            files.sort()
+            for _, size, path in files:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+            self._total_bytes = total
+
+    def clear(self):
+        for _, _, path in self._scan()[0]:
+            os.remove(path)
+        with self._lock:
+            self._total_bytes = 0
+
+def cached_get_json(session, url, cache=None, immutable=False):
+    """GET url through the cache, revalidating stale entries with If-None-Match.
+
+    Raises requests exceptions like a plain session.get would; the caller
+    decides how to report them.
+    """
+    if cache is None:
+        response = session.get(url)
+        response.raise_for_status()
+        return response.json()
+
+    entry = cache.get_entry(url)
+    if entry is not None and cache.is_fresh(entry, immutable):
+        cache.count(hit=True)
+        METRICS.incr('cache_hits')
+        return entry['data']
+    cache.count(hit=False)
+    METRICS.incr('cache_misses')
+
+    headers = {}
+    if entry is not None and entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+
+    response = session.get(url, headers=headers)
+    if response.status_code == 304 and entry is not None:
+        METRICS.incr('cache_revalidated')
+        cache.touch(url, immutable)
+        return entry['data']
+
+    response.raise_for_status()
+    data = response.json()
+    # Don't pin empty payloads forever; a week with no data may still be filled in
+    cache.put(url, data, response.headers.get('ETag'), immutable and bool(data))
+    return data
@@ -0,0 +1,125 @@
+import numpy as np
+
+DEFAULT_WINDOWS = (3, 5)
+DEFAULT_EWMA_ALPHA = 0.3
+
+def _score_matrix(weekly_scores):
+    """Lay one season's weekly_scores out as a teams x weeks matrix (NaN = did not play)"""
+    if hasattr(weekly_scores, 'score_matrix'):
+        # ScoreStore season views already hold the scores as columns
+        return weekly_scores.score_matrix()
+
+    weeks = sorted(weekly_scores.keys())
+    roster_ids = sorted({roster_id for week_data in weekly_scores.values() for roster_id in week_data})
+    row_of = {roster_id: i for i, roster_id in enumerate(roster_ids)}
+
+    points = np.full((len(roster_ids), len(weeks)), np.nan)
+    team_info = {}
+    for col, week in enumerate(weeks):
+        for roster_id, team_data in weekly_scores[week].items():
+            points[row_of[roster_id], col] = team_data['points']
+            # Keep the latest team info seen, like calculate_rolling_averages did
+            team_info[roster_id] = (team_data['team_name'], team_data['owner_name'])
+
+    return weeks, roster_ids, points, team_info
+
+def _trailing(prefix, window):
+    """Sum over the last `window` columns of a prefix-sum matrix (with a leading zero column)"""
+    return prefix[:, 1:] - prefix[:, :-1][:, np.maximum(np.arange(prefix.shape[1] - 1) - window + 1, 0)]
+
+def _std(sums, sq_sums, counts):
+    """Population std from sums of (centered) values and their squares; exactly 0 for a single game"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = sums / counts
+        variance = np.maximum(sq_sums / counts - mean * mean, 0.0)
+    return np.where(counts == 1, 0.0, np.sqrt(variance))
+
+def compute_rolling_stats(weekly_scores, windows=DEFAULT_WINDOWS, ewma_alpha=DEFAULT_EWMA_ALPHA):
+    """Compute every team's rolling statistics for one season in a single pass.
+
+    Builds prefix sums of points, squared points and games played across the
+    season's weeks, so each cumulative or trailing-window average and standard
+    deviation is a constant-time difference. Returns the same structure as
+    calculate_rolling_averages, with each week's entry extended by
+    'trailing_<N>' averages, 'std', 'std_<N>' and 'ewma'.
+    """
+    weeks, roster_ids, points, team_info = _score_matrix(weekly_scores)
+    if not roster_ids:
+        return {}
+
+    played = ~np.isnan(points)
+    values = np.where(played, points, 0.0)
+    # Spreads come from scores centered on each team's season mean, so the
+    # sum-of-squares difference doesn't cancel away most of its precision
+    with np.errstate(invalid='ignore'):
+        centered = np.where(played, points - np.nanmean(points, axis=1, keepdims=True), 0.0)
+
+    zero_col = np.zeros((len(roster_ids), 1))
+    sum_prefix = np.hstack([zero_col, np.cumsum(values, axis=1)])
+    centered_prefix = np.hstack([zero_col, np.cumsum(centered, axis=1)])
+    sq_prefix = np.hstack([zero_col, np.cumsum(centered * centered, axis=1)])
+    count_prefix = np.hstack([zero_col, np.cumsum(played, axis=1)])
+
+    cum_sums = sum_prefix[:, 1:]
+    cum_counts = count_prefix[:, 1:]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cum_avgs = cum_sums / cum_counts
+    cum_std = _std(centered_prefix[:, 1:], sq_prefix[:, 1:], cum_counts)
+
+    trailing = {}
+    for window in windows:
+        window_sums = _trailing(sum_prefix, window)
+        window_counts = _trailing(count_prefix, window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            window_avgs = window_sums / window_counts
+        window_std = _std(_trailing(centered_prefix, window), _trailing(sq_prefix, window), window_counts)
+        trailing[window] = (window_avgs, window_std)
+
+    # EWMA only advances on weeks a team played; one vectorized step per week
+    ewma = np.full(points.shape, np.nan)
+    current = np.full(len(roster_ids), np.nan)
+    for col in range(len(weeks)):
+        week_points = points[:, col]
+        has_score = played[:, col]
+        first = has_score & np.isnan(current)
+        current = np.where(first, week_points, current)
+        update = has_score & ~first
+        current = np.where(update, ewma_alpha * week_points + (1 - ewma_alpha) * current, current)
+        ewma[:, col] = current
+
+    rolling_data = {}
+    for row, roster_id in enumerate(roster_ids):
+        team_name, owner_name = team_info[roster_id]
+        weekly_totals = {}
+        rolling_averages = {}
+        for col, week in enumerate(weeks):
+            if not played[row, col]:
+                continue
+            weekly_totals[week] = float(points[row, col])
+            entry = {
+                'average': float(cum_avgs[row, col]),
+                'weeks_included': int(cum_counts[row, col]),
+                'total_points': float(cum_sums[row, col]),
+                'std': float(cum_std[row, col]),
+                'ewma': float(ewma[row, col]),
+            }
+            for window, (window_avgs, window_std) in trailing.items():
+                entry[f'trailing_{window}'] = float(window_avgs[row, col])
+                entry[f'std_{window}'] = float(window_std[row, col])
+            rolling_averages[week] = entry
+
+        rolling_data[roster_id] = {
+            'team_name': team_name,
+            'owner_name': owner_name,
+            'weekly_totals': weekly_totals,
+            'rolling_averages': rolling_averages
+        }
+
+    return rolling_data
+
+def compute_season_rolling_stats(all_season_data, windows=DEFAULT_WINDOWS, ewma_alpha=DEFAULT_EWMA_ALPHA):
+    """Compute rolling stats once per season: {year: rolling_data}"""
+    return {
+        season_data['year']: compute_rolling_stats(season_data['weekly_scores'], windows, ewma_alpha)
+        for season_data in all_season_data
+    }
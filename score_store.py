@@ -0,0 +1,301 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+NO_MATCHUP = -1
+EMPTY_PLAYER_ID = '0'  # Sleeper fills empty starter slots with "0"
+
+class StringTable:
+    """Interns repeated strings (team and owner names) as integer codes"""
+
+    def __init__(self):
+        self.strings = []
+        self._codes = {}
+
+    def intern(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.strings)
+            self._codes[value] = code
+            self.strings.append(value)
+        return code
+
+    def __getitem__(self, code):
+        return self.strings[code]
+
+    def code(self, value):
+        """Code of an already interned value, or None"""
+        return self._codes.get(value)
+
+class GrowableArray:
+    """Typed append-only array with amortized growth; values is a view of the filled part"""
+
+    def __init__(self, dtype):
+        self._data = np.empty(0, dtype=dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self._data.dtype)
+        needed = self._size + len(values)
+        if needed > len(self._data):
+            # Doubling keeps appending N rows over many seasons O(N) instead of re-copying every time
+            grown = np.empty(max(needed, 2 * len(self._data), 1024), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size:needed] = values
+        self._size = needed
+
+    @property
+    def values(self):
+        return self._data[:self._size]
+
+class ScoreStore:
+    """Columnar store of team-week scores across seasons.
+
+    Each team-week is one row in parallel typed arrays (season, week,
+    roster_id, matchup_id, points, team). Team and owner names are stored
+    once in interned lookup tables and referenced by the 'team' code.
+    Lineups live in flat arrays too: each row's starters then bench
+    players are a run of interned player codes in lineup_player, with
+    their starters_points/players_points in lineup_points (NaN where
+    Sleeper sent none), located by lineup_start, lineup_length and
+    starter_count. Points for players outside the roster's players list
+    are not kept. Columns grow with amortized capacity, so appending
+    seasons one by one never re-copies what is already stored.
+    season_view() exposes one season through the same
+    {week: {roster_id: team_data}} shape organize_weekly_scores returns.
+    """
+
+    COLUMNS = {'season': np.int16, 'week': np.int8, 'roster_id': np.int16, 'matchup_id': np.int16,
+               'points': np.float64, 'team': np.int32,
+               'lineup_start': np.int64, 'lineup_length': np.int16, 'starter_count': np.int16}
+    LINEUP_COLUMNS = {'lineup_player': np.int32, 'lineup_points': np.float64}
+
+    def __init__(self):
+        self.names = StringTable()
+        self.player_ids = StringTable()
+        self.teams = []  # team code -> (team_name code, owner_name code, username code)
+        self._team_codes = {}
+        self._columns = {name: GrowableArray(dtype) for name, dtype in {**self.COLUMNS, **self.LINEUP_COLUMNS}.items()}
+        self._publish()
+
+    def __len__(self):
+        return len(self.points)
+
+    def _publish(self):
+        # Expose the filled part of each column as a plain array attribute (store.week, store.points, ...)
+        for name, column in self._columns.items():
+            setattr(self, name, column.values)
+
+    def _team_code(self, team_info):
+        key = (team_info['team_name'], team_info['owner_name'], team_info.get('username', 'unknown'))
+        code = self._team_codes.get(key)
+        if code is None:
+            code = len(self.teams)
+            self._team_codes[key] = code
+            self.teams.append(tuple(self.names.intern(value) for value in key))
+        return code
+
+    def add_season(self, year, matchups_data, team_mapping):
+        """Append one season's raw /matchups payloads ({week: [matchup, ...]})"""
+        weeks, roster_ids, matchup_ids, points, teams = [], [], [], [], []
+        lineup_lengths, starter_counts, lineup_players, lineup_points = [], [], [], []
+
+        for week, matchups in sorted(matchups_data.items()):
+            for matchup in matchups:
+                roster_id = matchup['roster_id']
+                team_info = team_mapping.get(roster_id, {
+                    'team_name': f'Team {roster_id}',
+                    'owner_name': 'Unknown',
+                    'username': 'unknown'
+                })
+                matchup_id = matchup.get('matchup_id')
+
+                weeks.append(week)
+                roster_ids.append(roster_id)
+                matchup_ids.append(NO_MATCHUP if matchup_id is None else matchup_id)
+                points.append(matchup.get('points', 0) or 0)
+                teams.append(self._team_code(team_info))
+
+                starters = matchup.get('starters') or []
+                starters_points = matchup.get('starters_points') or []
+                players_points = matchup.get('players_points') or {}
+                starter_ids = set(starters)
+                bench = [player_id for player_id in matchup.get('players') or [] if player_id not in starter_ids]
+                lineup_lengths.append(len(starters) + len(bench))
+                starter_counts.append(len(starters))
+                lineup_players.extend(self.player_ids.intern(player_id) for player_id in starters + bench)
+                for slot, player_id in enumerate(starters):
+                    starter_points = starters_points[slot] if slot < len(starters_points) else None
+                    if starter_points is None:
+                        starter_points = players_points.get(player_id)
+                    lineup_points.append(np.nan if starter_points is None else starter_points)
+                lineup_points.extend(np.nan if players_points.get(player_id) is None else players_points[player_id]
+                                     for player_id in bench)
+
+        lineup_lengths = np.asarray(lineup_lengths, dtype=np.int64)
+        starts = len(self._columns['lineup_player']) + np.cumsum(lineup_lengths) - lineup_lengths
+        for name, values in (('season', np.full(len(weeks), year)), ('week', weeks), ('roster_id', roster_ids),
+                             ('matchup_id', matchup_ids), ('points', points), ('team', teams),
+                             ('lineup_start', starts), ('lineup_length', lineup_lengths),
+                             ('starter_count', starter_counts), ('lineup_player', lineup_players),
+                             ('lineup_points', lineup_points)):
+            self._columns[name].extend(values)
+        self._publish()
+
+    def seasons(self):
+        return [int(year) for year in np.unique(self.season)]
+
+    def season_view(self, year):
+        return SeasonView(self, np.flatnonzero(self.season == year), year)
+
+    def team_name(self, team_code):
+        return self.names[self.teams[team_code][0]]
+
+    def owner_name(self, team_code):
+        return self.names[self.teams[team_code][1]]
+
+    def team_columns(self, rows):
+        """Resolve team and owner name columns for the given rows in one lookup each"""
+        team_names = np.array([self.names[t[0]] for t in self.teams], dtype=object)
+        owner_names = np.array([self.names[t[1]] for t in self.teams], dtype=object)
+        codes = self.team[rows]
+        return team_names[codes], owner_names[codes]
+
+    def lineup(self, row):
+        """(starters, players, starters_points, players_points) for one row, shaped like the raw matchup"""
+        start = int(self.lineup_start[row])
+        end = start + int(self.lineup_length[row])
+        split = int(self.starter_count[row])
+        player_ids = [self.player_ids[code] for code in self.lineup_player[start:end]]
+        points = self.lineup_points[start:end]
+
+        starters_points = [] if np.isnan(points[:split]).all() else np.nan_to_num(points[:split]).tolist()
+        players_points = {player_id: float(player_points) for player_id, player_points in zip(player_ids, points)
+                          if player_id != EMPTY_PLAYER_ID and not np.isnan(player_points)}
+        # Sleeper's players list includes the starters but not empty slots
+        players = [player_id for player_id in player_ids if player_id != EMPTY_PLAYER_ID]
+        return player_ids[:split], players, starters_points, players_points
+
+    def record(self, row):
+        team_code = self.team[row]
+        matchup_id = int(self.matchup_id[row])
+        starters, players, starters_points, players_points = self.lineup(row)
+        return {
+            'team_name': self.team_name(team_code),
+            'owner_name': self.owner_name(team_code),
+            'points': float(self.points[row]),
+            'matchup_id': None if matchup_id == NO_MATCHUP else matchup_id,
+            'starters': starters,
+            'players': players,
+            'starters_points': starters_points,
+            'players_points': players_points
+        }
+
+class SeasonView(Mapping):
+    """Read-only {week: {roster_id: team_data}} view of one season in a ScoreStore"""
+
+    def __init__(self, store, rows, year=None):
+        self.store = store
+        self.rows = rows
+        self.year = year
+        self._weeks = None
+
+    def _week_rows(self):
+        if self._weeks is None:
+            weeks = self.store.week[self.rows]
+            self._weeks = {int(week): self.rows[weeks == week] for week in np.unique(weeks)}
+        return self._weeks
+
+    def __getitem__(self, week):
+        return WeekView(self.store, self._week_rows()[week])
+
+    def __iter__(self):
+        return iter(self._week_rows())
+
+    def __len__(self):
+        return len(self._week_rows())
+
+    def season_summary(self):
+        """Vectorized equivalent of calculate_season_summary"""
+        store = self.store
+        rows = self.rows[np.lexsort((store.week[self.rows], store.roster_id[self.rows]))]
+        roster_ids = store.roster_id[rows]
+        unique_ids, starts, counts = np.unique(roster_ids, return_index=True, return_counts=True)
+        totals = np.add.reduceat(store.points[rows], starts) if len(rows) else np.empty(0)
+
+        team_stats = {}
+        for roster_id, start, count, total in zip(unique_ids, starts, counts, totals):
+            team_rows = rows[start:start + count]
+            team_code = store.team[team_rows[0]]
+            weekly = [{'week': int(week), 'points': float(points)}
+                      for week, points in zip(store.week[team_rows], store.points[team_rows])]
+            team_stats[int(roster_id)] = {
+                'team_name': store.team_name(team_code),
+                'owner_name': store.owner_name(team_code),
+                'total_points': float(total),
+                'weeks_played': int(count),
+                'weekly_scores': weekly,
+                'average_points': float(total) / int(count) if count else 0
+            }
+        return team_stats
+
+    def highest_lowest(self):
+        """Vectorized equivalent of find_highest_lowest_weeks"""
+        if not len(self.rows):
+            return None, None
+        points = self.store.points[self.rows]
+        highest_row = self.rows[np.argmax(points)]
+        # The old stable sort put the last of several tied minimums at the end
+        lowest_row = self.rows[len(points) - 1 - np.argmin(points[::-1])]
+        return self._score_entry(highest_row), self._score_entry(lowest_row)
+
+    def _score_entry(self, row):
+        store = self.store
+        return {
+            'week': int(store.week[row]),
+            'team_name': store.team_name(store.team[row]),
+            'owner_name': store.owner_name(store.team[row]),
+            'points': float(store.points[row]),
+            'roster_id': int(store.roster_id[row])
+        }
+
+    def score_matrix(self):
+        """Return (weeks, roster_ids, teams x weeks points matrix with NaN gaps, team_info)"""
+        store = self.store
+        week_values = store.week[self.rows]
+        roster_values = store.roster_id[self.rows]
+        weeks, week_cols = np.unique(week_values, return_inverse=True)
+        roster_ids, roster_rows = np.unique(roster_values, return_inverse=True)
+
+        points = np.full((len(roster_ids), len(weeks)), np.nan)
+        points[roster_rows, week_cols] = store.points[self.rows]
+
+        # Latest team info per roster, like calculate_rolling_averages kept
+        last_rows = self.rows[len(self.rows) - 1 - np.unique(roster_values[::-1], return_index=True)[1]]
+        team_info = {}
+        for roster_id, row in zip(roster_ids, last_rows):
+            team_code = store.team[row]
+            team_info[int(roster_id)] = (store.team_name(team_code), store.owner_name(team_code))
+
+        return [int(week) for week in weeks], [int(r) for r in roster_ids], points, team_info
+
+class WeekView(Mapping):
+    """Read-only {roster_id: team_data} view of one week in a ScoreStore"""
+
+    def __init__(self, store, rows):
+        self.store = store
+        self.rows = rows
+        self._row_of = {int(roster_id): row for roster_id, row in zip(store.roster_id[rows], rows)}
+
+    def __getitem__(self, roster_id):
+        return self.store.record(self._row_of[roster_id])
+
+    def __iter__(self):
+        return iter(self._row_of)
+
+    def __len__(self):
+        return len(self._row_of)
@@ -0,0 +1,295 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import re
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+import main
+from fetcher import DEFAULT_MAX_WORKERS, configure_shared_client
+from response_cache import ResponseCache
+from rolling_stats import DEFAULT_EWMA_ALPHA, DEFAULT_WINDOWS
+from score_store import ScoreStore
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_REFRESH_SECONDS = 300
+MAX_HEADER_LINES = 100
+
+SEASON_PATH = re.compile(r'^/seasons/(\d+)/(summary|rolling|highlow)$')
+REASONS = {200: 'OK', 202: 'Accepted', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+def _week_fingerprint(week_data):
+    """Hash of one week's scores, used to tell whether an ingest changed anything"""
+    scores = sorted((roster_id, team_data['points'], team_data.get('matchup_id'))
+                    for roster_id, team_data in week_data.items())
+    return hashlib.sha1(json.dumps(scores).encode('utf-8')).hexdigest()
+
+def _json_default(value):
+    # numpy scalars from the rolling stats
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+class QueryService:
+    """In-memory season data with lazily computed, cached query results.
+
+    Each season's summary, rolling stats and high/low are computed on first
+    request and kept as encoded JSON with an ETag until ingest() brings in
+    week data that differs from what the season already holds; only that
+    season's results are dropped. Unchanged re-ingests keep the cache.
+    """
+
+    def __init__(self, windows=DEFAULT_WINDOWS, ewma_alpha=DEFAULT_EWMA_ALPHA):
+        self.windows = tuple(windows)
+        self.ewma_alpha = ewma_alpha
+        self.seasons = {}  # year -> {'weekly_scores', 'fingerprints', 'version', 'ingested_at'}
+        self._results = {}  # (year, kind) -> (body, etag)
+        self.hits = 0
+        self.misses = 0
+
+    def ingest(self, year, weekly_scores, missing_weeks=()):
+        """Replace a season's week data; returns the weeks that were new or changed.
+
+        Weeks in missing_weeks failed to fetch, so the copy the season
+        already holds is kept instead of the season losing them.
+        """
+        held = self.seasons.get(year, {}).get('weekly_scores', {})
+        kept = [week for week in missing_weeks if week in held and week not in weekly_scores]
+        if kept:
+            merged = dict(weekly_scores)
+            merged.update((week, held[week]) for week in kept)
+            weekly_scores = dict(sorted(merged.items()))
+        fingerprints = {week: _week_fingerprint(weekly_scores[week]) for week in weekly_scores}
+        previous = self.seasons.get(year, {}).get('fingerprints', {})
+        changed = sorted(week for week, fingerprint in fingerprints.items() if previous.get(week) != fingerprint)
+        if changed or fingerprints.keys() != previous.keys():
+            self.seasons[year] = {
+                'weekly_scores': weekly_scores,
+                'fingerprints': fingerprints,
+                'version': self.seasons.get(year, {}).get('version', 0) + 1,
+                'ingested_at': datetime.now().isoformat(timespec='seconds')
+            }
+            for kind in ('summary', 'rolling', 'highlow'):
+                self._results.pop((year, kind), None)
+        return changed
+
+    def _compute(self, year, kind):
+        weekly_scores = self.seasons[year]['weekly_scores']
+        if kind == 'summary':
+            return main.calculate_season_summary(weekly_scores)
+        if kind == 'rolling':
+            return main.calculate_rolling_averages(weekly_scores, self.windows, self.ewma_alpha)
+        highest, lowest = main.find_highest_lowest_weeks(weekly_scores)
+        return {'highest': highest, 'lowest': lowest}
+
+    def cached(self, year, kind):
+        """(body, etag) if the result is already cached, else None"""
+        cached = self._results.get((year, kind))
+        if cached is not None:
+            self.hits += 1
+        return cached
+
+    def result(self, year, kind):
+        """(body, etag) for one season query, computing it only on a cache miss"""
+        cached = self.cached(year, kind)
+        if cached is not None:
+            return cached
+        self.misses += 1
+        version = self.seasons[year]['version']
+        body = json.dumps(self._compute(year, kind), default=_json_default).encode('utf-8')
+        cached = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+        # Don't cache a result computed from data an ingest replaced meanwhile
+        if self.seasons[year]['version'] == version:
+            self._results[(year, kind)] = cached
+        return cached
+
+    def index(self):
+        return {
+            'seasons': [{'season': year, 'weeks': sorted(season['fingerprints']),
+                         'ingested_at': season['ingested_at']}
+                        for year, season in sorted(self.seasons.items())],
+            'cache': {'entries': len(self._results), 'hits': self.hits, 'misses': self.misses}
+        }
+
+class QueryServer:
+    """Asyncio HTTP/1.1 front end for a QueryService.
+
+    Routes: GET /seasons, GET /seasons/<year>/(summary|rolling|highlow)
+    and POST /ingest[?season=<year>] to refetch a season from Sleeper
+    (default: the current one). Cached bodies are served directly from the
+    event loop; fetching and computing run in the default thread pool, so
+    slow work never blocks other clients. Responses carry ETags and
+    honour If-None-Match.
+    """
+
+    def __init__(self, service, league_ids, base_url, cache=None, refresh_seconds=DEFAULT_REFRESH_SECONDS):
+        self.service = service
+        self.league_ids = {int(year): league_id for year, league_id in league_ids.items()}
+        self.base_url = base_url
+        self.cache = cache
+        self.refresh_seconds = refresh_seconds
+        self._compute_locks = {}  # (year, kind) -> asyncio.Lock
+        self._ingest_lock = asyncio.Lock()
+
+    def load(self, max_workers=DEFAULT_MAX_WORKERS):
+        """Fetch every configured season once"""
+        for season_data in main.fetch_all_season_data({str(year): league_id for year, league_id
+                                                       in self.league_ids.items()},
+                                                      self.base_url, max_workers, self.cache, ScoreStore()):
+            self.service.ingest(season_data['year'], season_data['weekly_scores'], season_data['missing_weeks'])
+
+    async def ingest(self, year):
+        """Refetch one season and feed it to the service; returns the changed weeks"""
+        loop = asyncio.get_running_loop()
+        async with self._ingest_lock:
+            season_data = await loop.run_in_executor(None, main.fetch_season_data, year, self.league_ids[year],
+                                                     self.base_url, self.cache)
+            if season_data is None:
+                return []
+            return self.service.ingest(year, season_data['weekly_scores'], season_data['missing_weeks'])
+
+    async def refresh_forever(self):
+        """Re-ingest the current season every refresh_seconds"""
+        year = max(self.league_ids)
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                changed = await self.ingest(year)
+            except Exception as e:
+                print(f"⚠️  Refresh of {year} failed: {e}")
+                continue
+            if changed:
+                print(f"🔄 {year}: weeks {', '.join(str(week) for week in changed)} changed, cache invalidated")
+
+    async def route(self, method, target):
+        """(status, body, etag) for one request"""
+        url = urlsplit(target)
+        path = url.path.rstrip('/') or '/'
+
+        if path == '/ingest':
+            if method != 'POST':
+                return 405, {'error': 'use POST'}, None
+            season = parse_qs(url.query).get('season', [None])[0]
+            year = int(season) if season and season.isdigit() else max(self.league_ids)
+            if year not in self.league_ids:
+                return 404, {'error': f'unknown season {year}'}, None
+            changed = await self.ingest(year)
+            return 202, {'season': year, 'changed_weeks': changed}, None
+
+        if method != 'GET':
+            return 405, {'error': 'use GET'}, None
+        if path in ('/', '/seasons'):
+            return 200, self.service.index(), None
+
+        match = SEASON_PATH.match(path)
+        if not match or int(match.group(1)) not in self.service.seasons:
+            return 404, {'error': f'no such resource: {path}'}, None
+        year, kind = int(match.group(1)), match.group(2)
+        cached = self.service.cached(year, kind)
+        if cached is None:
+            # One computation per result even if many clients miss at once; other results proceed in parallel
+            async with self._compute_locks.setdefault((year, kind), asyncio.Lock()):
+                cached = await asyncio.get_running_loop().run_in_executor(None, self.service.result, year, kind)
+        return 200, cached[0], cached[1]
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'error': 'bad request line'}, None, False)
+                    break
+
+                headers = {}
+                for _ in range(MAX_HEADER_LINES):
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0) or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version.upper() == 'HTTP/1.1')
+                try:
+                    status, body, etag = await self.route(method.upper(), target)
+                except Exception as e:
+                    status, body, etag = 500, {'error': f'{type(e).__name__}: {e}'}, None
+                if etag and headers.get('if-none-match') == etag:
+                    status, body = 304, b''
+                await self._respond(writer, status, body, etag, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, body, etag, keep_alive):
+        if not isinstance(body, bytes):
+            body = json.dumps(body, default=_json_default).encode('utf-8')
+        headers = [f'HTTP/1.1 {status} {REASONS.get(status, "")}',
+                   'Content-Type: application/json',
+                   f'Content-Length: {len(body)}',
+                   'Cache-Control: no-cache',
+                   f'Connection: {"keep-alive" if keep_alive else "close"}']
+        if etag:
+            headers.append(f'ETag: {etag}')
+        writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+        server = await asyncio.start_server(self.handle, host, port)
+        bound_host, bound_port = server.sockets[0].getsockname()[:2]
+        print(f"🌐 Serving {len(self.service.seasons)} seasons on http://{bound_host}:{bound_port} (Ctrl+C to stop)")
+        if ready is not None:
+            ready(bound_port)
+        refresher = asyncio.ensure_future(self.refresh_forever()) if self.refresh_seconds else None
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if refresher is not None:
+                refresher.cancel()
+
+def main_service(argv=None):
+    parser = argparse.ArgumentParser(description="Serve standings, rolling stats and highs/lows over local HTTP")
+    parser.add_argument('--config', default='league_data.json')
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--refresh', type=float, help="seconds between re-ingests of the current season (0 = off)")
+    args = parser.parse_args(argv)
+
+    league_data = main.load_json(args.config)
+    settings = league_data.get('settings', {})
+    service_settings = settings.get('service', {})
+    rolling_settings = settings.get('rolling', {})
+    base_url = league_data.get('api', {}).get('base_url', main.DEFAULT_BASE_URL)
+    max_workers = settings.get('max_concurrent_requests', DEFAULT_MAX_WORKERS)
+    refresh_seconds = args.refresh if args.refresh is not None else service_settings.get('refresh_seconds',
+                                                                                         DEFAULT_REFRESH_SECONDS)
+
+    configure_shared_client(settings, max_workers)
+    service = QueryService(tuple(rolling_settings.get('windows', DEFAULT_WINDOWS)),
+                           rolling_settings.get('ewma_alpha', DEFAULT_EWMA_ALPHA))
+    server = QueryServer(service, league_data.get('league_ids', {}), base_url,
+                         ResponseCache.from_config(settings), refresh_seconds)
+    server.load(max_workers)
+    try:
+        asyncio.run(server.serve(args.host or service_settings.get('host', DEFAULT_HOST),
+                                 args.port if args.port is not None else service_settings.get('port', DEFAULT_PORT)))
+    except KeyboardInterrupt:
+        print("\n👋 Service stopped")
+
+if __name__ == "__main__":
+    main_service()
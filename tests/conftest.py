@@ -0,0 +1,19 @@
+import pytest
+
+from score_store import ScoreStore
+
+def load_season_store(weekly_scores, year=2024):
+    """Load a {week: {roster_id: team_data}} season into a ScoreStore through its raw-payload path"""
+    matchups = {week: [{'roster_id': roster_id, 'points': team_data['points'],
+                        'matchup_id': team_data.get('matchup_id')} for roster_id, team_data in week_data.items()]
+                for week, week_data in weekly_scores.items()}
+    team_mapping = {roster_id: {'team_name': team_data['team_name'], 'owner_name': team_data['owner_name']}
+                    for week_data in weekly_scores.values() for roster_id, team_data in week_data.items()}
+    store = ScoreStore()
+    store.add_season(year, matchups, team_mapping)
+    return store.season_view(year)
+
+@pytest.fixture
+def season_store():
+    """The same season as a ScoreStore view, so engines can be checked on both input shapes"""
+    return load_season_store
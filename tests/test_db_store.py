@@ -0,0 +1,20 @@
+import db_store
+
+def sync_league(conn, league_id, points):
+    """One two-team league week into the database; roster IDs 1 and 2 in every league"""
+    rosters = [{'roster_id': 1, 'owner_id': f'{league_id}-u1'}, {'roster_id': 2, 'owner_id': f'{league_id}-u2'}]
+    users = [{'user_id': f'{league_id}-u{i}', 'display_name': f'{league_id} owner {i}'} for i in (1, 2)]
+    matchups = {1: [{'roster_id': 1, 'matchup_id': 1, 'points': points[0]},
+                    {'roster_id': 2, 'matchup_id': 1, 'points': points[1]}]}
+    db_store.sync_season(conn, 2024, league_id, rosters, users, matchups)
+
+def test_readers_keep_leagues_of_one_season_apart():
+    conn = db_store.connect(':memory:')
+    sync_league(conn, 'A', (100.0, 90.0))
+    sync_league(conn, 'B', (50.0, 60.0))
+
+    summary = db_store.season_summary(conn, 2024, 'A')
+    assert {roster_id: stats['total_points'] for roster_id, stats in summary.items()} == {1: 100.0, 2: 90.0}
+    assert summary[1]['weekly_scores'] == [{'week': 1, 'points': 100.0}]
+    assert db_store.weekly_scores(conn, 2024, 'B')[1][2]['points'] == 60.0
+    assert [row['points'] for row in db_store.rolling_averages(conn, 2024, league_id='A')] == [100.0, 90.0]
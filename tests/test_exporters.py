@@ -0,0 +1,76 @@
+import copy
+
+import numpy as np
+import pytest
+
+from exporters import IncrementalExport, _shift_rows, export_column_names, export_seasons, season_export_columns
+from rolling_stats import compute_rolling_stats
+
+openpyxl = pytest.importorskip('openpyxl')
+
+WINDOWS = (3, 5)
+YEARS = (2022, 2023, 2024)
+
+def random_league(rng, teams=4, weeks=5):
+    """{year: weekly_scores} of paired matchups; team names need XML escaping"""
+    league = {}
+    for year in YEARS:
+        weekly_scores = {}
+        for week in range(1, weeks + 1):
+            order = [int(r) for r in rng.permutation(np.arange(1, teams + 1))]
+            weekly_scores[week] = {roster_id: {'team_name': f'Team <{roster_id}> & co', 'owner_name': f'o{roster_id}',
+                                               'points': round(float(rng.uniform(60, 160)), 2),
+                                               'matchup_id': i // 2 + 1}
+                                   for i, roster_id in enumerate(order)}
+        league[year] = weekly_scores
+    return league
+
+def season_tables(league):
+    return {year: season_export_columns(year, weekly_scores, compute_rolling_stats(weekly_scores, WINDOWS), WINDOWS)
+            for year, weekly_scores in league.items()}
+
+def incremental_export(tmp_path, league, formats):
+    column_names = export_column_names(WINDOWS)
+    with IncrementalExport(column_names, formats, str(tmp_path / 'incremental'),
+                           str(tmp_path / 'cache'), inputs=[list(WINDOWS)]) as export:
+        tables = season_tables(league)
+        for year, weekly_scores in league.items():
+            if not export.reuse_season(year, weekly_scores):
+                export.write_season(year, tables[year])
+    return export
+
+def workbook_values(path):
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    return {sheet.title: [list(row) for row in sheet.iter_rows(values_only=True)] for sheet in workbook.worksheets}
+
+def assert_matches_full_export(tmp_path, league, written):
+    full = export_seasons(season_tables(league), export_column_names(WINDOWS), ('csv', 'xlsx'),
+                          str(tmp_path / 'full'))
+    with open(written['csv'], 'rb') as incremental_csv, open(full['csv'], 'rb') as full_csv:
+        assert incremental_csv.read() == full_csv.read()
+    assert workbook_values(written['xlsx']) == workbook_values(full['xlsx'])
+
+def test_spliced_export_matches_full_export(tmp_path):
+    league = random_league(np.random.default_rng(0))
+    export = incremental_export(tmp_path, league, ('csv', 'xlsx'))
+    assert export.rewritten == [str(year) for year in YEARS]
+    assert_matches_full_export(tmp_path, league, export.written)
+
+def test_only_changed_seasons_are_rewritten(tmp_path):
+    league = random_league(np.random.default_rng(1))
+    incremental_export(tmp_path, league, ('csv', 'xlsx'))
+
+    # A stat correction in the middle season; its rows change but not its length
+    changed = copy.deepcopy(league)
+    changed[2023][5][1]['points'] += 10.0
+    export = incremental_export(tmp_path, changed, ('csv', 'xlsx'))
+    assert (export.reused, export.rewritten) == (['2022', '2024'], ['2023'])
+    assert_matches_full_export(tmp_path, changed, export.written)
+
+def test_shift_rows_renumbers_rows_and_cells_only():
+    rows = (b'<row r="2"><c r="A2" t="inlineStr"><is><t>r="B9"</t></is></c><c r="AB2"><v>12</v></c></row>'
+            b'<row r="3"><c r="A3"><v>3</v></c></row>')
+    assert _shift_rows(rows, 20) == (
+        b'<row r="22"><c r="A22" t="inlineStr"><is><t>r="B9"</t></is></c><c r="AB22"><v>12</v></c></row>'
+        b'<row r="23"><c r="A23"><v>3</v></c></row>')
+    assert _shift_rows(rows, 0) is rows
@@ -0,0 +1,25 @@
+from live import LiveStandings
+
+TEAMS = {1: {'team_name': 'A', 'owner_name': 'a'}, 2: {'team_name': 'B', 'owner_name': 'b'}}
+
+def team_week(roster_id, points):
+    return {'team_name': TEAMS[roster_id]['team_name'], 'owner_name': TEAMS[roster_id]['owner_name'],
+            'points': points, 'matchup_id': 1}
+
+def live_week():
+    history = {1: {1: team_week(1, 100.0), 2: team_week(2, 80.0)},
+               2: {1: team_week(1, 120.0), 2: team_week(2, 90.0)}}
+    return LiveStandings(2024, history, 3, TEAMS)
+
+def test_live_week_can_set_the_high_but_not_the_low():
+    live = live_week()
+    live.apply([{'roster_id': 1, 'points': 12.4}, {'roster_id': 2, 'points': 130.0}])
+    highest, lowest = live.highs_lows()
+    assert (highest['week'], highest['points']) == (3, 130.0)
+    assert (lowest['week'], lowest['points']) == (1, 80.0)
+    assert live.provisional_low() == {'week': 3, 'roster_id': 1, 'points': 12.4, 'team_name': 'A'}
+
+def test_no_provisional_low_before_a_poll():
+    live = live_week()
+    assert live.provisional_low() is None
+    assert live.highs_lows()[0]['points'] == 120.0
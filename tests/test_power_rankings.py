@@ -0,0 +1,126 @@
+import copy
+
+import numpy as np
+import pytest
+
+from owners import OwnerIndex
+from power_rankings import INITIAL_RATING, PowerRatings, _game_deltas, season_games
+
+PARAMS = {'k': 20.0, 'margin_scale': 20.0, 'regression': 1 / 3, 'trend_weeks': 3}
+
+def random_league(rng, seasons=3, teams=8, weeks=10, shared_owner=False):
+    """{year: weekly_scores} plus an OwnerIndex; rosters change hands and some weeks tie.
+
+    With shared_owner, one user owns two rosters every season.
+    """
+    owners = OwnerIndex()
+    league = {}
+    user_pool = [f'u{i}' for i in range(teams + 3)]
+    for year in range(2021, 2021 + seasons):
+        users = [str(user) for user in rng.choice(user_pool, size=teams, replace=False)]
+        if shared_owner:
+            users[1] = users[0]
+        owners.add_season(year, {roster_id: {'user_id': user_id, 'team_name': f'Team {user_id}',
+                                             'owner_name': user_id, 'username': user_id}
+                                 for roster_id, user_id in enumerate(users, 1)})
+        weekly_scores = {}
+        for week in range(1, weeks + 1):
+            order = [int(r) for r in rng.permutation(np.arange(1, teams + 1))]
+            weekly_scores[week] = {roster_id: {'team_name': '', 'owner_name': '', 'matchup_id': i // 2 + 1,
+                                               'points': float(rng.integers(80, 131))}
+                                   for i, roster_id in enumerate(order)}
+        league[year] = weekly_scores
+    return league, owners
+
+def all_games(league, owners):
+    return [season_games(year, weekly_scores, owners) for year, weekly_scores in sorted(league.items())]
+
+def reference_ratings(league, owners):
+    """Plain Elo loop: one game at a time off each week's starting ratings, regressing between seasons"""
+    ratings, played = {}, {}
+    for index, year in enumerate(sorted(league)):
+        if index:
+            ratings = {user_id: INITIAL_RATING + (rating - INITIAL_RATING) * (1 - PARAMS['regression'])
+                       for user_id, rating in ratings.items()}
+        for week in sorted(league[year]):
+            week_data = league[year][week]
+            by_matchup = {}
+            for roster_id, team_data in week_data.items():
+                by_matchup.setdefault(team_data['matchup_id'], []).append(roster_id)
+            start = dict(ratings)
+            for roster_a, roster_b in by_matchup.values():
+                user_a, user_b = owners.owner_of(year, roster_a), owners.owner_of(year, roster_b)
+                delta = float(_game_deltas(start.get(user_a, INITIAL_RATING), start.get(user_b, INITIAL_RATING),
+                                           week_data[roster_a]['points'], week_data[roster_b]['points'],
+                                           PARAMS['k'], PARAMS['margin_scale']))
+                ratings[user_a] = ratings.get(user_a, INITIAL_RATING) + delta
+                ratings[user_b] = ratings.get(user_b, INITIAL_RATING) - delta
+                played[user_a] = played.get(user_a, 0) + 1
+                played[user_b] = played.get(user_b, 0) + 1
+    return ratings, played
+
+def assert_same_ratings(actual, expected):
+    assert sorted(actual.ratings) == sorted(expected.ratings)
+    for user_id, rating in expected.ratings.items():
+        assert actual.ratings[user_id] == pytest.approx(rating, abs=1e-9), user_id
+        assert actual.games[user_id] == expected.games[user_id]
+        assert actual.recent[user_id] == pytest.approx(expected.recent[user_id], abs=1e-9)
+    assert actual.applied == expected.applied
+
+def incremental(seasons_games):
+    ratings = PowerRatings(**PARAMS)
+    for games in seasons_games:
+        ratings.add_games(games)
+    return ratings
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('shared_owner', [False, True])
+def test_rebuild_matches_week_by_week(seed, shared_owner):
+    league, owners = random_league(np.random.default_rng(seed), shared_owner=shared_owner)
+    seasons_games = all_games(league, owners)
+    rebuilt = PowerRatings.rebuild(seasons_games, **PARAMS)
+    assert_same_ratings(rebuilt, incremental(seasons_games))
+
+    expected, played = reference_ratings(league, owners)
+    assert rebuilt.ratings == pytest.approx(expected, abs=1e-9)
+    assert rebuilt.games == played
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('start', ['incremental', 'rebuild'])
+@pytest.mark.parametrize('shared_owner', [False, True])
+def test_rescored_latest_week_replaces_its_contribution(seed, start, shared_owner):
+    rng = np.random.default_rng(seed)
+    league, owners = random_league(rng, shared_owner=shared_owner)
+    seasons_games = all_games(league, owners)
+    ratings = incremental(seasons_games) if start == 'incremental' else PowerRatings.rebuild(seasons_games, **PARAMS)
+
+    # Stat corrections land on the latest week
+    rescored = copy.deepcopy(league)
+    latest_year = max(rescored)
+    for team_data in rescored[latest_year][max(rescored[latest_year])].values():
+        team_data['points'] += float(rng.integers(-8, 9))
+    latest_games = season_games(latest_year, rescored[latest_year], owners)
+    assert ratings.add_games(latest_games) == [max(rescored[latest_year])]
+
+    assert_same_ratings(ratings, PowerRatings.rebuild(all_games(rescored, owners), **PARAMS))
+    # Applying the same week again is a no-op
+    assert ratings.add_games(latest_games) == []
+
+def test_changed_past_week_needs_rebuild():
+    league, owners = random_league(np.random.default_rng(0))
+    ratings = incremental(all_games(league, owners))
+    changed = copy.deepcopy(league)
+    latest_year = max(changed)
+    for team_data in changed[latest_year][1].values():
+        team_data['points'] += 1.0
+    with pytest.raises(ValueError):
+        ratings.add_games(season_games(latest_year, changed[latest_year], owners))
+
+def test_save_and_load_round_trip(tmp_path):
+    league, owners = random_league(np.random.default_rng(1))
+    ratings = PowerRatings.rebuild(all_games(league, owners), **PARAMS)
+    path = str(tmp_path / 'power.json')
+    ratings.save(path)
+    assert_same_ratings(PowerRatings.load(path, **PARAMS), ratings)
+    # Different parameters start fresh rather than mixing rating scales
+    assert PowerRatings.load(path, **dict(PARAMS, k=32.0)).ratings == {}
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from records import compute_records
+
+def random_season(rng, teams=10, weeks=14):
+    """{week: {roster_id: team_data}} with ties, odd men out (None matchup_id) and coarse scores"""
+    weekly_scores = {}
+    for week in range(1, weeks + 1):
+        roster_ids = [int(r) for r in rng.permutation(np.arange(1, teams + 1))]
+        # Some weeks leave a team or two unpaired, like a bye or a median-only week
+        unpaired = int(rng.integers(0, 3))
+        week_data = {}
+        for i, roster_id in enumerate(roster_ids):
+            # Pairs go two by two, so an odd number of paired teams leaves a one-sided last matchup
+            matchup_id = None if i < unpaired else (i - unpaired) // 2 + 1
+            # Whole points in a narrow range make head-to-head and all-play ties common
+            week_data[roster_id] = {'team_name': f'Team {roster_id}', 'owner_name': f'Owner {roster_id}',
+                                    'points': float(rng.integers(95, 106)), 'matchup_id': matchup_id}
+        weekly_scores[week] = week_data
+    return weekly_scores
+
+def reference_records(weekly_scores):
+    """Brute force: compare every team with its opponent and with every other team, week by week"""
+    expected = {}
+    for week in sorted(weekly_scores):
+        week_data = weekly_scores[week]
+        by_matchup = {}
+        for roster_id, team_data in week_data.items():
+            if team_data['matchup_id'] is not None:
+                by_matchup.setdefault(team_data['matchup_id'], []).append(roster_id)
+        for roster_id, team_data in week_data.items():
+            record = expected.setdefault(roster_id, {key: 0 for key in (
+                'wins', 'losses', 'ties', 'all_play_wins', 'all_play_losses', 'all_play_ties')})
+            record.setdefault('points_for', 0.0)
+            record.setdefault('points_against', 0.0)
+            points = team_data['points']
+            record['points_for'] += points
+
+            rosters = by_matchup.get(team_data['matchup_id'], [])
+            if len(rosters) == 2:
+                opponent = week_data[rosters[0] if rosters[1] == roster_id else rosters[1]]['points']
+                record['points_against'] += opponent
+                record['wins' if points > opponent else 'losses' if points < opponent else 'ties'] += 1
+
+            for other_id, other in week_data.items():
+                if other_id == roster_id:
+                    continue
+                key = ('all_play_wins' if points > other['points'] else
+                       'all_play_losses' if points < other['points'] else 'all_play_ties')
+                record[key] += 1
+    return expected
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('as_store', [False, True])
+def test_records_match_brute_force(seed, as_store, season_store):
+    weekly_scores = random_season(np.random.default_rng(seed), teams=9 if seed % 2 else 10)
+    expected = reference_records(weekly_scores)
+    records = compute_records(season_store(weekly_scores) if as_store else weekly_scores)
+
+    assert sorted(records) == sorted(expected)
+    for roster_id, record in expected.items():
+        for key, value in record.items():
+            assert records[roster_id][key] == pytest.approx(value), (roster_id, key)
+
+def test_ties_and_unpaired_weeks_are_covered():
+    # Guard the generator: the comparison above is only meaningful if it produces both
+    weekly_scores = random_season(np.random.default_rng(0))
+    expected = reference_records(weekly_scores)
+    assert sum(record['ties'] for record in expected.values()) > 0
+    assert any(team_data['matchup_id'] is None for week_data in weekly_scores.values()
+               for team_data in week_data.values())
+
+def test_running_record_reaches_season_totals():
+    weekly_scores = random_season(np.random.default_rng(7))
+    for record in compute_records(weekly_scores).values():
+        last = record['weekly'][max(record['weekly'])]
+        assert (last['wins'], last['losses'], last['ties']) == (record['wins'], record['losses'], record['ties'])
+        unpaired = [entry for entry in record['weekly'].values() if entry['opponent_points'] is None]
+        assert all(entry['result'] == '' for entry in unpaired)
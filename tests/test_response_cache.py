@@ -0,0 +1,106 @@
+import os
+
+import pytest
+
+from fetcher import is_immutable
+from response_cache import ResponseCache, cached_get_json
+
+URL = 'https://api.example/league/1/matchups/1'
+
+class FakeResponse:
+    def __init__(self, status_code, data=None, etag=None):
+        self.status_code = status_code
+        self._data = data
+        self.headers = {'ETag': etag} if etag else {}
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+class FakeSession:
+    """Serves queued responses and records the headers of every request"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / 'cache'), ttl_seconds=60)
+
+def test_fresh_entry_is_a_hit(cache):
+    session = FakeSession(FakeResponse(200, [{'points': 1}], etag='"a"'))
+    assert cached_get_json(session, URL, cache) == [{'points': 1}]
+    assert cached_get_json(session, URL, cache) == [{'points': 1}]
+    assert len(session.requests) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_expired_entry_is_fetched_again(cache):
+    cache.ttl_seconds = 0
+    session = FakeSession(FakeResponse(200, [1]), FakeResponse(200, [2]))
+    assert cached_get_json(session, URL, cache) == [1]
+    assert cached_get_json(session, URL, cache) == [2]
+    assert len(session.requests) == 2
+
+def test_stale_entry_revalidates_with_its_etag(cache):
+    cache.ttl_seconds = 0
+    session = FakeSession(FakeResponse(200, [1], etag='"v1"'), FakeResponse(304))
+    cached_get_json(session, URL, cache)
+    first_fetch = cache.get_entry(URL)['fetched_at']
+
+    assert cached_get_json(session, URL, cache) == [1]
+    assert session.requests[1] == {'If-None-Match': '"v1"'}
+    assert cache.get_entry(URL)['fetched_at'] >= first_fetch
+
+def test_closed_endpoint_is_pinned_past_its_ttl(cache):
+    cache.ttl_seconds = 0
+    session = FakeSession(FakeResponse(200, [1]))
+    cached_get_json(session, URL, cache, immutable=True)
+    assert cached_get_json(session, URL, cache, immutable=True) == [1]
+    assert len(session.requests) == 1
+    # A caller that no longer treats the endpoint as final goes back through the TTL
+    session.responses.append(FakeResponse(200, [2]))
+    assert cached_get_json(session, URL, cache, immutable=False) == [2]
+
+def test_empty_payload_is_not_pinned(cache):
+    cache.ttl_seconds = 0
+    session = FakeSession(FakeResponse(200, []), FakeResponse(200, [1]))
+    cached_get_json(session, URL, cache, immutable=True)
+    assert cache.get_entry(URL)['immutable'] is False
+    assert cached_get_json(session, URL, cache, immutable=True) == [1]
+
+def test_eviction_removes_least_recently_used_first(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache'))
+    urls = [f'{URL}?n={i}' for i in range(4)]
+    for age, url in zip((300, 200, 100), urls):
+        cache.put(url, {'payload': 'x' * 100})
+        os.utime(cache._path(url), (os.path.getmtime(cache._path(url)) - age,) * 2)
+    # Reading the oldest entry makes it the most recently used
+    cache.get_entry(urls[0])
+    entry_size = os.path.getsize(cache._path(urls[0]))
+
+    cache.max_bytes = 3 * entry_size
+    cache.put(urls[3], {'payload': 'x' * 100})
+    assert [os.path.exists(cache._path(url)) for url in urls] == [True, False, True, True]
+
+@pytest.mark.parametrize('year, kind, week, expected', [
+    (2023, 'matchups', 1, True),      # closed season
+    (2023, 'rosters', None, True),
+    (2024, 'matchups', 7, True),      # two weeks before the current one
+    (2024, 'matchups', 8, False),     # just played: stat corrections still land
+    (2024, 'matchups', 9, False),     # in progress
+    (2024, 'rosters', None, False),
+    (2025, 'matchups', 1, False),
+])
+def test_is_immutable(year, kind, week, expected):
+    assert is_immutable(year, kind, week, {'season': '2024', 'week': 9}) is expected
+
+def test_nothing_is_immutable_without_nfl_state():
+    assert is_immutable(2020, 'matchups', 1, None) is False
@@ -0,0 +1,67 @@
+import math
+
+import numpy as np
+import pytest
+
+from rolling_stats import compute_rolling_stats
+
+WINDOWS = (3, 5)
+ALPHA = 0.3
+
+def random_season(rng, teams=8, weeks=12, skip_rate=0.15):
+    """{week: {roster_id: team_data}} with some team-weeks missing (byes, late joins)"""
+    weekly_scores = {}
+    for week in range(1, weeks + 1):
+        weekly_scores[week] = {
+            roster_id: {'team_name': f'Team {roster_id}', 'owner_name': f'Owner {roster_id}',
+                        'points': round(float(rng.uniform(60, 160)), 2), 'matchup_id': None}
+            for roster_id in range(1, teams + 1) if rng.random() >= skip_rate
+        }
+    return weekly_scores
+
+def reference_rolling(weekly_scores, windows, alpha):
+    """Week-by-week loop over each team's scores"""
+    weeks = sorted(weekly_scores)
+    roster_ids = sorted({roster_id for week in weeks for roster_id in weekly_scores[week]})
+    expected = {}
+    for roster_id in roster_ids:
+        history = []  # (column, points) of the weeks this team played
+        ewma = None
+        entries = {}
+        for col, week in enumerate(weeks):
+            team_data = weekly_scores[week].get(roster_id)
+            if team_data is None:
+                continue
+            points = team_data['points']
+            history.append((col, points))
+            ewma = points if ewma is None else alpha * points + (1 - alpha) * ewma
+            values = [p for _, p in history]
+            entry = {'average': sum(values) / len(values), 'weeks_included': len(values),
+                     'total_points': sum(values), 'std': float(np.std(values)), 'ewma': ewma}
+            for window in windows:
+                recent = [p for c, p in history if c > col - window]
+                entry[f'trailing_{window}'] = sum(recent) / len(recent)
+                entry[f'std_{window}'] = float(np.std(recent))
+            entries[week] = entry
+        expected[roster_id] = entries
+    return expected
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('as_store', [False, True])
+def test_vectorized_matches_loop(seed, as_store, season_store):
+    weekly_scores = random_season(np.random.default_rng(seed))
+    expected = reference_rolling(weekly_scores, WINDOWS, ALPHA)
+    rolling = compute_rolling_stats(season_store(weekly_scores) if as_store else weekly_scores, WINDOWS, ALPHA)
+
+    assert sorted(rolling) == sorted(expected)
+    for roster_id, entries in expected.items():
+        averages = rolling[roster_id]['rolling_averages']
+        assert sorted(averages) == sorted(entries)
+        for week, entry in entries.items():
+            for key, value in entry.items():
+                assert math.isclose(averages[week][key], value, rel_tol=1e-9, abs_tol=1e-6), (roster_id, week, key)
+        assert rolling[roster_id]['weekly_totals'] == {week: weekly_scores[week][roster_id]['points']
+                                                       for week in entries}
+
+def test_empty_season():
+    assert compute_rolling_stats({}) == {}
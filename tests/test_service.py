@@ -0,0 +1,54 @@
+import asyncio
+import copy
+
+from service import QueryServer, QueryService
+
+def season(points):
+    """One week of two teams in a single matchup"""
+    return {1: {roster_id: {'team_name': f'Team {roster_id}', 'owner_name': f'o{roster_id}', 'points': score,
+                            'matchup_id': 1}
+                for roster_id, score in enumerate(points, 1)}}
+
+def test_etag_changes_only_with_the_data():
+    service = QueryService()
+    service.ingest(2024, season((100.0, 90.0)))
+    body, etag = service.result(2024, 'summary')
+
+    assert service.ingest(2024, copy.deepcopy(season((100.0, 90.0)))) == []
+    assert service.result(2024, 'summary') == (body, etag)
+    assert (service.hits, service.misses) == (1, 1)
+
+    assert service.ingest(2024, season((100.0, 95.5))) == [1]
+    new_body, new_etag = service.result(2024, 'summary')
+    assert new_etag != etag and new_body != body
+    # Each kind has its own tag
+    assert service.result(2024, 'highlow')[1] != new_etag
+
+async def get(port, path, etag=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    headers = f'If-None-Match: {etag}\r\n' if etag else ''
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n{headers}\r\n'.encode('latin-1'))
+    head, _, body = (await reader.read()).partition(b'\r\n\r\n')
+    writer.close()
+    lines = head.decode('latin-1').split('\r\n')
+    response_headers = dict(line.split(': ', 1) for line in lines[1:])
+    return int(lines[0].split()[1]), response_headers.get('ETag'), body
+
+def test_if_none_match_gets_304():
+    service = QueryService()
+    service.ingest(2024, season((100.0, 90.0)))
+    query_server = QueryServer(service, {2024: 'league'}, 'http://unused', refresh_seconds=0)
+
+    async def exchange():
+        server = await asyncio.start_server(query_server.handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            body, etag = service.result(2024, 'summary')
+            assert await get(port, '/seasons/2024/summary') == (200, etag, body)
+            assert await get(port, '/seasons/2024/summary', etag) == (304, etag, b'')
+
+            service.ingest(2024, season((100.0, 95.5)))
+            status, new_etag, _ = await get(port, '/seasons/2024/summary', etag)
+            assert status == 200 and new_etag != etag
+
+    asyncio.run(exchange())
@@ -0,0 +1,201 @@
+import argparse
+import statistics
+import time
+
+from db_store import DEFAULT_DB_PATH, _week_hash, connect, season_league_id
+
+def open_weeks(conn, league_id, max_week):
+    """Weeks 1..max_week of a league whose transactions aren't synced and closed yet"""
+    closed = {row['week'] for row in conn.execute(
+        "SELECT week FROM transaction_sync WHERE league_id = ? AND closed = 1", (league_id,))}
+    return [week for week in range(1, max_week + 1) if week not in closed]
+
+def fetch_transactions(jobs, base_url, max_workers=None, session=None, cache=None, nfl_state=None):
+    """Fetch /league/{id}/transactions/{week} for every (year, league_id, week) job concurrently.
+
+    Returns {(league_id, week): transactions}; weeks whose request failed
+    after retries are left out so their cursor stays open.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from fetcher import DEFAULT_MAX_WORKERS, fetch_json, get_shared_client, is_immutable
+    from metrics import METRICS
+
+    max_workers = max_workers or DEFAULT_MAX_WORKERS
+    session = session or get_shared_client(max_workers)
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            (league_id, week): executor.submit(METRICS.profiled('transactions', fetch_json),
+                                               f"{base_url}/league/{league_id}/transactions/{week}",
+                                               session, cache, is_immutable(year, 'transactions', week, nfl_state))
+            for year, league_id, week in jobs
+        }
+        for key, future in futures.items():
+            data = future.result()
+            if data is not None:
+                results[key] = data
+    return results
+
+def _move_rows(league_id, year, week, transaction, owners):
+    """One (…, roster_id, owner_id, player_id, action, waiver_bid) row per player added or dropped"""
+    waiver_bid = (transaction.get('settings') or {}).get('waiver_bid')
+    rows = []
+    for action, moves in (('add', transaction.get('adds')), ('drop', transaction.get('drops'))):
+        for player_id, roster_id in (moves or {}).items():
+            rows.append((league_id, str(transaction['transaction_id']), year, week, roster_id,
+                         owners.get(roster_id), str(player_id), action,
+                         waiver_bid if action == 'add' else None))
+    return rows
+
+def sync_transactions(conn, year, league_id, transactions_by_week, closed_weeks=()):
+    """Store fetched weeks of transactions, rewriting only weeks whose payload changed.
+
+    Moves are joined to the roster's owner (user_id) from the rosters
+    table, so sync the season's rosters first. Weeks in closed_weeks get a
+    closed cursor and are never fetched again. Returns
+    {'inserted': n, 'updated': n, 'unchanged': n} week counts.
+    """
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+    now = time.time()
+    known_hashes = {row['week']: row['content_hash'] for row in conn.execute(
+        "SELECT week, content_hash FROM transaction_sync WHERE league_id = ?", (league_id,))}
+    owners = {row['roster_id']: row['owner_id'] for row in conn.execute(
+        "SELECT roster_id, owner_id FROM rosters WHERE league_id = ?", (league_id,))}
+    closed_weeks = set(closed_weeks)
+
+    with conn:
+        for week, transactions in sorted(transactions_by_week.items()):
+            content_hash = _week_hash(transactions)
+            previous = known_hashes.get(week)
+            if previous == content_hash:
+                counts['unchanged'] += 1
+            else:
+                counts['updated' if previous else 'inserted'] += 1
+                conn.execute("DELETE FROM transactions WHERE league_id = ? AND season = ? AND week = ?",
+                             (league_id, year, week))
+                conn.execute("DELETE FROM transaction_moves WHERE league_id = ? AND season = ? AND week = ?",
+                             (league_id, year, week))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO transactions (league_id, transaction_id, season, week, type, status, created) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(league_id, str(transaction['transaction_id']), year, week, transaction.get('type', 'unknown'),
+                      transaction.get('status'), (transaction.get('created') or 0) / 1000 or None)
+                     for transaction in transactions]
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO transaction_moves (league_id, transaction_id, season, week, roster_id, "
+                    "owner_id, player_id, action, waiver_bid) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [row for transaction in transactions
+                     for row in _move_rows(league_id, year, week, transaction, owners)]
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO transaction_sync (league_id, week, content_hash, closed, synced_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (league_id, week, content_hash, int(week in closed_weeks), now)
+            )
+    return counts
+
+def sync_league_transactions(conn, seasons, base_url, max_workers=None, cache=None, nfl_state=None):
+    """Bring every season's transactions up to date: [(year, league_id, max_weeks)] -> {year: counts}
+
+    Only weeks without a closed cursor are requested, all seasons through
+    one thread pool. A week is closed once it is final (is_immutable), so
+    past seasons are fetched once and the open season only re-pulls the
+    week just played (for corrections), its current week and any new ones.
+    """
+    from fetcher import is_immutable
+
+    jobs = [(year, league_id, week) for year, league_id, max_weeks in seasons
+            for week in open_weeks(conn, league_id, max_weeks)]
+    fetched = fetch_transactions(jobs, base_url, max_workers, cache=cache, nfl_state=nfl_state)
+
+    results = {}
+    for year, league_id, max_weeks in seasons:
+        weeks = {week: fetched[(league_id, week)] for job_year, job_league, week in jobs
+                 if job_league == league_id and (league_id, week) in fetched}
+        closed = [week for week in weeks if is_immutable(year, 'transactions', week, nfl_state)]
+        results[year] = sync_transactions(conn, year, league_id, weeks, closed)
+        results[year]['requested'] = sum(1 for _, job_league, _ in jobs if job_league == league_id)
+    return results
+
+def team_activity(conn, season, league_id=None):
+    """Completed roster moves per team: {roster_id: {owner_id, adds, drops, trades, waiver_claims, faab_spent}}.
+
+    Roster IDs only mean something within one league, so the moves are
+    those of league_id (default: the season's most recently synced league).
+    """
+    league_id = league_id or season_league_id(conn, season)
+    activity = {}
+    for row in conn.execute("""
+        SELECT m.roster_id, MAX(m.owner_id) AS owner_id,
+               SUM(m.action = 'add') AS adds,
+               SUM(m.action = 'drop') AS drops,
+               COUNT(DISTINCT CASE WHEN t.type = 'trade' THEN t.transaction_id END) AS trades,
+               SUM(m.action = 'add' AND t.type = 'waiver') AS waiver_claims,
+               COALESCE(SUM(CASE WHEN m.action = 'add' THEN m.waiver_bid END), 0) AS faab_spent
+        FROM transaction_moves m
+        JOIN transactions t ON t.league_id = m.league_id AND t.transaction_id = m.transaction_id
+        WHERE m.season = ? AND m.league_id = ? AND t.status = 'complete'
+        GROUP BY m.roster_id
+    """, (season, league_id)):
+        activity[row['roster_id']] = {key: row[key] for key in row.keys() if key != 'roster_id'}
+    return activity
+
+def activity_by_team_week(conn, season, league_id=None):
+    """Every team-week's points in one league next to its completed adds and drops that week"""
+    league_id = league_id or season_league_id(conn, season)
+    return [dict(row) for row in conn.execute("""
+        WITH moves AS (
+            SELECT m.league_id, m.week, m.roster_id,
+                   SUM(m.action = 'add') AS adds, SUM(m.action = 'drop') AS drops
+            FROM transaction_moves m
+            JOIN transactions t ON t.league_id = m.league_id AND t.transaction_id = m.transaction_id
+            WHERE m.season = ? AND m.league_id = ? AND t.status = 'complete'
+            GROUP BY m.league_id, m.week, m.roster_id
+        )
+        SELECT w.week, w.roster_id, w.owner_id, w.team_name, w.points,
+               COALESCE(moves.adds, 0) AS adds, COALESCE(moves.drops, 0) AS drops,
+               w.points - LAG(w.points) OVER (PARTITION BY w.roster_id ORDER BY w.week) AS points_change
+        FROM team_weeks w
+        LEFT JOIN moves ON moves.league_id = w.league_id AND moves.week = w.week AND moves.roster_id = w.roster_id
+        WHERE w.season = ? AND w.league_id = ?
+        ORDER BY w.week, w.roster_id
+    """, (season, league_id, season, league_id))]
+
+def activity_score_correlation(conn, season, league_id=None):
+    """Pearson correlation between a team's adds in a week and its change in points from the week before.
+
+    None when there are too few team-weeks or no variation to correlate.
+    """
+    rows = [row for row in activity_by_team_week(conn, season, league_id) if row['points_change'] is not None]
+    if len(rows) < 3:
+        return None
+    try:
+        return statistics.correlation([row['adds'] for row in rows], [row['points_change'] for row in rows])
+    except statistics.StatisticsError:
+        return None
+
+def display_activity(conn, season, league_id=None):
+    league_id = league_id or season_league_id(conn, season)
+    activity = team_activity(conn, season, league_id)
+    names = {row['roster_id']: row['team_name'] for row in conn.execute(
+        "SELECT roster_id, MAX(team_name) AS team_name FROM team_weeks WHERE season = ? AND league_id = ? "
+        "GROUP BY roster_id", (season, league_id))}
+    print(f"{'Team':<25} {'Adds':<5} {'Drops':<6} {'Trades':<7} {'Waivers':<8} {'FAAB':<5}")
+    print("-" * 60)
+    for roster_id, team in sorted(activity.items(), key=lambda item: item[1]['adds'], reverse=True):
+        name = names.get(roster_id, f'Team {roster_id}')
+        print(f"{name[:24]:<25} {team['adds']:<5} {team['drops']:<6} {team['trades']:<7} "
+              f"{team['waiver_claims']:<8} {team['faab_spent']:<5}")
+    correlation = activity_score_correlation(conn, season, league_id)
+    if correlation is not None:
+        print(f"📉 Adds vs. week-over-week points change: r = {correlation:+.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Roster moves per team from the local database")
+    parser.add_argument('season', type=int)
+    parser.add_argument('--db', default=DEFAULT_DB_PATH)
+    parser.add_argument('--league', help="league ID (default: the season's most recently synced league)")
+    args = parser.parse_args()
+    display_activity(connect(args.db), args.season, args.league)